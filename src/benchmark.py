@@ -0,0 +1,215 @@
+# src/benchmark.py
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery
+
+from src import constants
+from src.database.connection_profile import PROFILES, apply_profile, format_report
+from src.database.re_database import initialize_re_db
+from src.services.query_engine import fetch_value
+from src.services.re_service import REProductService
+from src.services.settings_cache import PRODUCT_FOREIGN_KEYS, settings_cache
+
+
+def seed_products(count, chunk_size=5000):
+    ids_by_field = {
+        fk_field: [record.get("id") for record in settings_cache.records(table_name)]
+        for fk_field, table_name in PRODUCT_FOREIGN_KEYS.items()
+    }
+    for start in range(0, count, chunk_size):
+        payloads = []
+        for index in range(start, min(start + chunk_size, count)):
+            payload = {
+                fk_field: random.choice(ids) for fk_field, ids in ids_by_field.items()
+            }
+            payload.update(
+                {
+                    "pid": f"re.b.{index:08d}",
+                    "street": f"street {index}",
+                    "area": random.uniform(20, 300),
+                    "structure": random.randint(1, 6),
+                    "function": "",
+                    "description": "benchmark product " * 4,
+                    "price": random.uniform(1, 50),
+                }
+            )
+            payloads.append(payload)
+        if REProductService.create_many(payloads) is None:
+            raise RuntimeError("Failed to seed benchmark products.")
+
+
+def time_call(label, func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started_at)
+    best = min(timings)
+    average = sum(timings) / len(timings)
+    print(f"  {label:<28} best {best * 1000:9.1f} ms   avg {average * 1000:9.1f} ms")
+    return result
+
+
+def bench_re_read(args):
+    count = fetch_product_count()
+    if count < args.products:
+        print(f"Seeding {args.products - count} products...")
+        seed_products(args.products - count)
+        count = args.products
+    option_id = settings_cache.records(constants.TABLE_RE_SETTINGS_OPTIONS)[0]["id"]
+    record_ids = [random.randint(1, count) for _ in range(200)]
+    print(f"table_re: {count} products, repeat {args.repeat}")
+
+    results = {}
+    for mode in ("join", "cache"):
+        REProductService.READ_MODE = mode
+        settings_cache.invalidate()
+        print(f"[{mode}]")
+        results[mode] = time_call("read_all()", REProductService.read_all, args.repeat)
+        time_call(
+            "read() x200",
+            lambda: [REProductService.read(record_id) for record_id in record_ids],
+            args.repeat,
+        )
+        time_call(
+            "get_random_product() x200",
+            lambda: [
+                REProductService.get_random_product(option_id) for _ in range(200)
+            ],
+            args.repeat,
+        )
+    REProductService.READ_MODE = "cache"
+    if results["join"] != results["cache"]:
+        print("WARNING: read_all() results differ between modes.")
+        return 1
+    print("read_all() results are identical in both modes.")
+    return 0
+
+
+def fetch_product_count():
+    return fetch_value(
+        constants.RE_CONNECTION, f"SELECT COUNT(*) FROM {constants.TABLE_RE}"
+    )
+
+
+def _exec(query, sql):
+    if not query.exec(sql):
+        raise RuntimeError(f"{query.lastError().text()}\n{sql}")
+
+
+def _bench_profile(connection, path, profile, keys, args):
+    db = QSqlDatabase.addDatabase("QSQLITE", connection)
+    db.setDatabaseName(path)
+    if not db.open():
+        print(f"Failed to open database '{path}'")
+        return False
+    apply_profile(db, profile)
+    print(format_report(db))
+    query = QSqlQuery(db)
+    _exec(query, "CREATE TABLE bench (id INTEGER PRIMARY KEY, pid TEXT, value TEXT)")
+    query.prepare("INSERT INTO bench (pid, value) VALUES (?, ?)")
+    read_query = QSqlQuery(db)
+    read_query.setForwardOnly(True)
+    read_query.prepare("SELECT pid, value FROM bench WHERE id = ?")
+
+    def single_commits():
+        for index in range(args.commits):
+            query.addBindValue(f"single.{index}")
+            query.addBindValue("x" * 200)
+            if not query.exec():
+                raise RuntimeError(query.lastError().text())
+
+    def batch_insert():
+        db.transaction()
+        query.addBindValue([f"batch.{index}" for index in range(args.rows)])
+        query.addBindValue(["x" * 200] * args.rows)
+        if not query.execBatch():
+            raise RuntimeError(query.lastError().text())
+        db.commit()
+
+    def point_reads():
+        for key in keys:
+            read_query.addBindValue(key)
+            read_query.exec()
+            read_query.next()
+
+    def full_scan():
+        scan_query = QSqlQuery(db)
+        scan_query.setForwardOnly(True)
+        _exec(scan_query, "SELECT COUNT(*), SUM(LENGTH(value)) FROM bench")
+        scan_query.next()
+
+    time_call(f"{args.commits} autocommit inserts", single_commits, 1)
+    time_call(f"{args.rows} rows in one batch", batch_insert, 1)
+    time_call(f"{len(keys)} point reads", point_reads, args.repeat)
+    time_call("full table scan", full_scan, args.repeat)
+    query.finish()
+    read_query.finish()
+    db.close()
+    return True
+
+
+def bench_db_profile(args):
+    """Time single-row commits, a batch insert and reads under each profile."""
+    work_dir = tempfile.mkdtemp()
+    keys = [random.randrange(1, args.rows + 1) for _ in range(2000)]
+    for name, profile in PROFILES.items():
+        connection = f"benchmark_{name}"
+        path = os.path.join(work_dir, f"{name}.db")
+        is_ok = _bench_profile(connection, path, profile, keys, args)
+        QSqlDatabase.removeDatabase(connection)
+        if not is_ok:
+            return 1
+    return 0
+
+
+def run_benchmark(args):
+    """Run the benchmark args.benchmark selects."""
+    if args.benchmark == "db-profile":
+        return bench_db_profile(args)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "benchmark_re.db")
+    constants.PATH_RE_DB = db_path
+    if not initialize_re_db():
+        print("Failed initialize re db")
+        return 1
+    print(f"Database: {db_path}")
+    return bench_re_read(args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Database read benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    re_read = subparsers.add_parser(
+        "re-read", help="Compare the JOIN and cached-label product read paths."
+    )
+    re_read.add_argument("--products", type=int, default=50000)
+    re_read.add_argument("--repeat", type=int, default=3)
+    re_read.add_argument(
+        "--db",
+        default=None,
+        help="SQLite file to use (default: a temporary file, never the app db).",
+    )
+    db_profile = subparsers.add_parser(
+        "db-profile", help="Compare write/read timings for each connection profile."
+    )
+    db_profile.add_argument("--commits", type=int, default=500)
+    db_profile.add_argument("--rows", type=int, default=100000)
+    db_profile.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # QtSql needs the application object for as long as the work runs
+    app = QCoreApplication(sys.argv[:1])
+    try:
+        return run_benchmark(args)
+    finally:
+        app.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ PATH_RE_DB = os.path.join("src", "repositories", "db", "real_estate.db")
 RE_CONNECTION = "re_connection"
 PATH_USER_DB = os.path.join("src", "repositories", "db", "user.db")
 USER_CONNECTION = "user_connection"
+# PRAGMA profile applied when connections open, see database/connection_profile.py
+DB_CONNECTION_PROFILE = "tuned"
 
 TABLE_RE = "table_re"
 TABLE_USER = "table_user"
@@ -22,8 +24,75 @@ TABLE_RE_SETTINGS_IMG_DIRS = "table_re_settings_image_directories"
 TABLE_RE_SETTINGS_TITLE = "table_re_settings_title"
 TABLE_RE_SETTINGS_DESCRIPTION = "table_re_settings_description"
 
+# FTS5 indexes kept in sync with their source tables by triggers
+TABLE_RE_FTS = "table_re_fts"
+TABLE_RE_SETTINGS_TITLE_FTS = "table_re_settings_title_fts"
+TABLE_RE_SETTINGS_DESCRIPTION_FTS = "table_re_settings_description_fts"
+
 TABLE_USER_SETTINGS_UDD = "table_user_settings_udd"
 TABLE_USER_SETTINGS_PROXY = "table_user_settings_proxy"
+TABLE_USER_SETTINGS_PROXY_HEALTH = "table_user_settings_proxy_health"
+TABLE_USER_ROBOT_JOBS = "table_user_robot_jobs"
+TABLE_USER_POST_HISTORY = "table_user_post_history"
+TABLE_USER_GROUPS = "table_user_groups"
+
+# random product picks avoid the last N products picked for the same option
+RE_RANDOM_PRODUCT_NO_REPEAT = 20
+
+# rotating proxies, see services/proxy_pool.py (seconds)
+PROXY_FETCH_TIMEOUT = 30
+PROXY_CHECK_TIMEOUT = 10
+# fetched through each proxy; must answer httpbin-style {"origin": "<ip>"}
+PROXY_CHECK_URL = "http://httpbin.org/ip"
+# how long a pre-fetched proxy is handed out before it is fetched again
+PROXY_POOL_TTL = 600
+# wait before asking a rotation endpoint again after a failed fetch/check
+PROXY_POOL_RETRY_DELAY = 15
+PROXY_ACQUIRE_TIMEOUT = 60
+
+# RobotService runs at most this many browsers at once, see utils/resource_handler.py
+ROBOT_CPU_PER_BROWSER = 0.5
+ROBOT_RAM_PER_BROWSER_MB = 600
+ROBOT_RAM_RESERVE_MB = 1024
+# actions that run without a browser and so without a proxy
+ROBOT_PROXYLESS_ACTIONS = ("<empty>",)
+# sits between two of a user's actions: the next one waits this long, no worker
+ROBOT_DELAY_ACTION = "<empty>"
+ROBOT_DELAY_SECONDS = 300
+# an account's browser stays open between its actions, see robot/browser_session.py
+ROBOT_SESSION_IDLE_TIMEOUT = 120
+ROBOT_SESSION_MAX_LIFETIME = 30 * 60
+# how long closing a session may take before the browser counts as stuck
+ROBOT_SESSION_CLOSE_TIMEOUT = 10
+# "thread": a QThreadPool worker per browser (robot/browser_worker.py)
+# "async": a few asyncio loops drive every browser (robot/async_engine.py)
+# "process": worker processes run the browsers (robot/process_engine.py)
+ROBOT_ENGINE = "thread"
+ROBOT_ASYNC_LOOPS = 1
+ROBOT_PROCESS_COUNT = 4
+# a worker process still on one task after this many seconds is killed and restarted
+ROBOT_PROCESS_TASK_TIMEOUT = 10 * 60
+# TaskInfo.priority classes, lower starts first (services/task_scheduler.py)
+ROBOT_PRIORITY_HIGH = 0
+ROBOT_PRIORITY_NORMAL = 1
+ROBOT_PRIORITY_LOW = 2
+# a failed task is retried after ROBOT_RETRY_BACKOFF * 2^(retry - 1) seconds, capped
+ROBOT_RETRY_BACKOFF = 10
+ROBOT_RETRY_BACKOFF_MAX = 5 * 60
+# one JSON line per task attempt with its phase timings (None: don't write)
+ROBOT_METRICS_PATH = os.path.join("src", "repositories", "metrics", "robot_runs.jsonl")
+# RobotService keeps its tasks in TABLE_USER_ROBOT_JOBS so a run survives restarts
+ROBOT_DURABLE_JOBS = True
+# the same listing for the same account and action isn't queued again within this
+ROBOT_JOB_DEDUP_HOURS = 24
+# actions that post to the account's groups and keep TABLE_USER_POST_HISTORY
+ROBOT_GROUP_POST_ACTIONS = ("discussion",)
+# a listing isn't posted to the same group again within this (None: never again)
+ROBOT_REPOST_AFTER_DAYS = 30
+# an account leaves a group alone this long after posting to it
+ROBOT_GROUP_COOLDOWN_HOURS = 6
+# an account's group catalog is scraped from the sidebar again after this
+ROBOT_GROUP_CATALOG_MAX_AGE_HOURS = 7 * 24
 
 ICONS = [
     "🌼",
@@ -6,6 +6,7 @@ from src import constants
 from src.controllers.base_controller import BaseController
 
 from src.services import re_service
+from src.services.settings_cache import PRODUCT_FOREIGN_KEYS, settings_cache
 
 
 class REProductController(BaseController):
@@ -84,7 +85,7 @@ class REProductController(BaseController):
             if not self.validate_product(payload=payload):
                 return False
             if self.service.update(record_id, payload):
-                self.load_data()
+                self.model.refresh_row(record_id)
                 QMessageBox.information(
                     None, "Success", "Real estate product updated successfully."
                 )
@@ -99,7 +100,7 @@ class REProductController(BaseController):
     def delete(self, record_id):
         try:
             if self.service.delete(record_id):
-                self.load_data()
+                self.model.remove_record(record_id)
                 QMessageBox.information(
                     None, "Success", "Real estate product deleted successfully."
                 )
@@ -177,51 +178,11 @@ class REProductController(BaseController):
             QMessageBox.critical(None, "Error", "area must be numbers.".capitalize())
             return False
 
-        if not re_service.REStatusService.is_value_existed(
-            {"id": payload.get("status_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid status selected.")
-            return False
-        if not re_service.REProvinceService.is_value_existed(
-            {"id": payload.get("province_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid province selected.")
-            return False
-        if not re_service.REDistrictService.is_value_existed(
-            {"id": payload.get("district_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid district selected.")
-            return False
-        if not re_service.REWardsService.is_value_existed(
-            {"id": payload.get("ward_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid ward selected.")
-            return False
-        if not re_service.REOptionService.is_value_existed(
-            {"id": payload.get("option_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid option selected.")
-            return False
-        if not re_service.RECategoryService.is_value_existed(
-            {"id": payload.get("category_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid category selected.")
-            return False
-        if not re_service.REBuildingLinesService.is_value_existed(
-            {"id": payload.get("building_line_id")},
-        ):
-            QMessageBox.critical(None, "Error", "Invalid building_line selected.")
-            return False
-        if not re_service.REFurnitureService.is_value_existed(
-            {"id": payload.get("furniture_id")},
-        ):
-            QMessageBox.critical(None, "Error", "Invalid furniture selected.")
-            return False
-        if not re_service.RELegalsService.is_value_existed(
-            {"id": payload.get("legal_id")}
-        ):
-            QMessageBox.critical(None, "Error", "Invalid legal selected.")
-            return False
+        for fk_field, table_name in PRODUCT_FOREIGN_KEYS.items():
+            if not settings_cache.exists(table_name, payload.get(fk_field)):
+                field_name = fk_field[: -len("_id")]
+                QMessageBox.critical(None, "Error", f"Invalid {field_name} selected.")
+                return False
 
         return True
 
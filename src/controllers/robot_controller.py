@@ -4,13 +4,18 @@ import sys, traceback
 from typing import Any, Optional, Dict, Union, List
 from PyQt6.QtCore import pyqtSignal, pyqtSlot
 
+from src import constants
 from src.my_types import BrowserInfo, ActionInfo, TaskInfo
 from src.services.re_service import (
     RETemplateTitleService,
     RETemplateDescriptionService,
     REProductService,
 )
-from src.services.user_service import UserService
+from src.services.user_service import (
+    GroupCatalogService,
+    RobotJobService,
+    UserService,
+)
 from src.services.robot_service import RobotService
 
 from src.utils.re_product_handler import (
@@ -58,13 +63,58 @@ class RobotController:
         is_mobile: bool = False,
         headless: bool = False,
         thread_num: int = 1,
+        on_status_updated=None,
     ):
+        tasks = self.build_task_infos(task_data, is_mobile=is_mobile, headless=headless)
+        self.robot_service = RobotService(thread_num=thread_num, max_retries=5)
+        if on_status_updated:
+            self.robot_service.status_updated.connect(on_status_updated)
+        self.robot_service.add_tasks(tasks=tasks)
+        return self.robot_service
+
+    def count_unfinished_jobs(self):
+        return RobotJobService.count_unfinished()
+
+    def resume_tasks(self, thread_num: int = 1, on_status_updated=None):
+        """Run the saved jobs a previous run left pending or running."""
+        self.robot_service = RobotService(thread_num=thread_num, max_retries=5)
+        if on_status_updated:
+            self.robot_service.status_updated.connect(on_status_updated)
+        self.robot_service.resume_tasks()
+        return self.robot_service
+
+    def refresh_groups(self, user_ids: List[int]):
+        """Have the users' next posting task scrape their groups sidebar again."""
+        return GroupCatalogService.invalidate(user_ids)
+
+    def build_task_infos(
+        self,
+        task_data: List,
+        is_mobile: bool = False,
+        headless: bool = False,
+    ) -> List[TaskInfo]:
+        """Interleave the users' actions round by round.
+
+        A user's consecutive actions are separated by a ROBOT_DELAY_ACTION
+        task; users with fewer actions simply drop out of the later rounds.
+        RobotService's scheduler keeps each user's order and runs one task per
+        user at a time; task["priority"] sets the tasks' priority class.
+        """
+        user_actions = []
+        for task in task_data:
+            actions: List[ActionInfo] = []
+            pending = task.get("actions") or []
+            while pending:
+                if actions:
+                    actions.append(ActionInfo(action_name=constants.ROBOT_DELAY_ACTION))
+                actions.append(pending.pop())
+            user_actions.append(actions)
         tasks: List[TaskInfo] = []
-        max_action_num = max(
-            (len(task.get("actions", [])) for task in task_data), default=0
-        )
+        max_action_num = max((len(actions) for actions in user_actions), default=0)
         for action_num in range(max_action_num):
-            for task in task_data:
+            for task, actions in zip(task_data, user_actions):
+                if action_num >= len(actions):
+                    continue
                 user_info = task["user_info"]
                 browser_info: BrowserInfo = BrowserInfo(
                     user_id=user_info.get("id"),
@@ -77,14 +127,15 @@ class RobotController:
                     headless=headless,
                     is_mobile=False,
                 )
-                try:
-                    action_info: ActionInfo = task.get("actions").pop()
-                except:
-                    action_info = ActionInfo(action_name="<empty>")
-                tasks.append(TaskInfo(browser_info=browser_info, action=action_info))
-
-        self.robot_service = RobotService(thread_num=thread_num, max_retries=5)
-        self.robot_service.add_tasks(tasks=tasks)
+                tasks.append(
+                    TaskInfo(
+                        browser_info=browser_info,
+                        action=actions[action_num],
+                        priority=task.get("priority", constants.ROBOT_PRIORITY_NORMAL),
+                        user_group=user_info.get("user_group"),
+                    )
+                )
+        return tasks
 
     def build_task(self, user: Dict, action_data: list[Dict[str, Any]]):
         list_action_info: list[ActionInfo] = []
@@ -147,6 +198,7 @@ class RobotController:
                             images_path=image_paths,
                             title=title,
                             description=description,
+                            pid=product.get("pid"),
                         )
                     )
                 else:
@@ -0,0 +1,157 @@
+# src/database/connection_manager.py
+import itertools
+import logging
+import sys
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QThread, Qt
+from PyQt6.QtSql import QSqlDatabase
+from src.database.connection_profile import applied_profile, apply_profile
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+MAX_IDLE_CONNECTIONS = 8
+
+
+class ConnectionManager:
+    """Hands every thread its own clone of the named connections.
+
+    The GUI thread keeps using the connections opened by initialize_*_db.
+    Other threads get a clone (QSqlDatabase.cloneDatabase) on first use.
+    When a QThread finishes, its clones are detached from the thread and
+    parked in an idle pool so the next worker thread can adopt them instead
+    of opening the file again.
+    """
+
+    def __init__(self, max_idle=MAX_IDLE_CONNECTIONS):
+        self.max_idle = max_idle
+        # keyed by thread ident: PyQt gives each QRunnable.run() a fresh
+        # Python thread state, so threading.local() does not survive between
+        # runs on the same pool thread.
+        self._by_thread = {}
+        self._idle = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._release_callbacks = []
+
+    def add_release_callback(self, callback):
+        """callback(connection_name) runs in the thread before it lets go."""
+        self._release_callbacks.append(callback)
+
+    @staticmethod
+    def is_main_thread():
+        app = QCoreApplication.instance()
+        return app is None or QThread.currentThread() == app.thread()
+
+    def _thread_connections(self) -> dict:
+        thread_id = threading.get_ident()
+        connections = self._by_thread.get(thread_id)
+        if connections is None:
+            connections = {}
+            with self._lock:
+                self._by_thread[thread_id] = connections
+            thread = QThread.currentThread()
+            thread.finished.connect(
+                self.release_thread_connections, Qt.ConnectionType.DirectConnection
+            )
+        return connections
+
+    def database(self, connection) -> QSqlDatabase:
+        if self.is_main_thread():
+            return QSqlDatabase.database(connection)
+        connections = self._thread_connections()
+        db = connections.get(connection)
+        if db is not None:
+            return db
+        db = self._adopt_idle(connection) or self._clone(connection)
+        if db is not None:
+            connections[connection] = db
+        return db if db is not None else QSqlDatabase()
+
+    def _adopt_idle(self, connection):
+        with self._lock:
+            idle = self._idle.get(connection)
+            db = idle.pop() if idle else None
+        if db is None:
+            return None
+        if db.moveToThread(QThread.currentThread()) and db.isOpen():
+            return db
+        name = self._close(db)
+        del db
+        QSqlDatabase.removeDatabase(name)
+        return None
+
+    def _clone(self, connection):
+        name = f"{connection}.thread{next(self._counter)}"
+        db = QSqlDatabase.cloneDatabase(connection, name)
+        if not db.open():
+            logger.error(f"Error opening clone '{name}': {db.lastError().text()}")
+            del db
+            QSqlDatabase.removeDatabase(name)
+            return None
+        profile = applied_profile(connection)
+        if profile is not None:
+            apply_profile(db, profile)
+        return db
+
+    def release_thread_connections(self):
+        """Give the calling thread's clones back to the idle pool."""
+        with self._lock:
+            connections = self._by_thread.pop(threading.get_ident(), None)
+        if not connections:
+            return
+        while connections:
+            connection, db = connections.popitem()
+            for callback in self._release_callbacks:
+                try:
+                    callback(db.connectionName())
+                except Exception as e:
+                    logger.error(f"Release callback failed: {e}")
+            with self._lock:
+                idle = self._idle.setdefault(connection, [])
+                has_room = len(idle) < self.max_idle
+            if has_room and db.moveToThread(None):
+                with self._lock:
+                    idle.append(db)
+            else:
+                name = self._close(db)
+                del db
+                QSqlDatabase.removeDatabase(name)
+
+    @staticmethod
+    def _close(db):
+        # the caller must drop its reference before removeDatabase()
+        name = db.connectionName()
+        if db.isOpen():
+            db.close()
+        return name
+
+    def close_idle(self):
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for dbs in idle.values():
+            while dbs:
+                db = dbs.pop()
+                # parked connections have no thread; pull them here to close them
+                db.moveToThread(QThread.currentThread())
+                name = self._close(db)
+                del db
+                QSqlDatabase.removeDatabase(name)
+
+    def idle_count(self, connection=None):
+        with self._lock:
+            if connection is not None:
+                return len(self._idle.get(connection, []))
+            return sum(len(dbs) for dbs in self._idle.values())
+
+
+connection_manager = ConnectionManager()
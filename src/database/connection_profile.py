@@ -0,0 +1,97 @@
+# src/database/connection_profile.py
+import logging
+import sys
+from dataclasses import dataclass, fields
+
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery
+from src import constants
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """PRAGMA values applied to every connection when it is opened."""
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    # negative values are KiB, positive values are pages
+    cache_size: int = -64 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+    foreign_keys: str = "ON"
+
+
+PROFILES = {
+    # SQLite's own defaults, what the app ran with before profiles existed
+    "default": ConnectionProfile(
+        journal_mode="DELETE",
+        synchronous="FULL",
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store="DEFAULT",
+        busy_timeout=0,
+    ),
+    "tuned": ConnectionProfile(),
+    # no durability guarantees on power loss; for throwaway/bulk databases
+    "fast": ConnectionProfile(synchronous="OFF", temp_store="MEMORY"),
+}
+
+# connection name -> profile applied to it, reused for per-thread clones
+_applied_profiles = {}
+
+
+def get_profile(name=None) -> ConnectionProfile:
+    name = name or constants.DB_CONNECTION_PROFILE
+    if name not in PROFILES:
+        logger.error(f"Unknown connection profile '{name}', using 'default'.")
+        name = "default"
+    return PROFILES[name]
+
+
+def apply_profile(db: QSqlDatabase, profile: ConnectionProfile = None):
+    profile = profile or get_profile()
+    query = QSqlQuery(db)
+    is_ok = True
+    for profile_field in fields(profile):
+        value = getattr(profile, profile_field.name)
+        if not query.exec(f"PRAGMA {profile_field.name} = {value}"):
+            logger.error(
+                f"Error setting PRAGMA {profile_field.name} = {value}: "
+                f"{query.lastError().text()}"
+            )
+            is_ok = False
+    query.finish()
+    _applied_profiles[db.connectionName()] = profile
+    return is_ok
+
+
+def applied_profile(connection_name):
+    return _applied_profiles.get(connection_name)
+
+
+def effective_settings(db: QSqlDatabase):
+    settings = {}
+    query = QSqlQuery(db)
+    for profile_field in fields(ConnectionProfile):
+        if query.exec(f"PRAGMA {profile_field.name}") and query.next():
+            settings[profile_field.name] = query.value(0)
+        else:
+            settings[profile_field.name] = None
+    query.finish()
+    return settings
+
+
+def format_report(db: QSqlDatabase):
+    settings = effective_settings(db)
+    values = ", ".join(f"{key}={value}" for key, value in settings.items())
+    return f"[{db.connectionName()}] {db.databaseName()}: {values}"
@@ -0,0 +1,297 @@
+# src/database/migrations.py
+import logging
+import sys
+from dataclasses import dataclass, field
+
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery
+from src import constants
+from src.services.query_engine import clear_statement_cache
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+TABLE_SCHEMA_VERSION = "schema_version"
+
+
+@dataclass
+class Migration:
+    """One schema step. steps are SQL strings or callables taking the db."""
+
+    version: int
+    description: str
+    steps: list = field(default_factory=list)
+
+
+def _fts_normalized(prefix, column):
+    # unicode61 strips accents but keeps đ as its own letter
+    return f"replace(replace(coalesce({prefix}.{column}, ''), 'đ', 'd'), 'Đ', 'D')"
+
+
+def _fts_steps(fts_table, source_table, columns):
+    """FTS5 index over source_table columns, backfilled and kept in sync."""
+    column_list = ", ".join(columns)
+    new_values = ", ".join(_fts_normalized("new", column) for column in columns)
+    old_values = ", ".join(_fts_normalized("old", column) for column in columns)
+    source_values = ", ".join(_fts_normalized("src", column) for column in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+    {column_list},
+    content='{source_table}',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source_table}
+BEGIN
+    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source_table}
+BEGIN
+    INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+    VALUES ('delete', old.id, {old_values});
+END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {source_table}
+BEGIN
+    INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+    VALUES ('delete', old.id, {old_values});
+    INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+END""",
+        f"INSERT INTO {fts_table} (rowid, {column_list}) "
+        f"SELECT src.id, {source_values} FROM {source_table} src",
+    ]
+
+
+RE_MIGRATIONS = [
+    Migration(
+        1,
+        "secondary indexes for product, template and image dir lookups",
+        [
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_RE}_option_status "
+            f"ON {constants.TABLE_RE} (option_id, status_id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_RE_SETTINGS_TITLE}_option "
+            f"ON {constants.TABLE_RE_SETTINGS_TITLE} (option_id)",
+            f"CREATE INDEX IF NOT EXISTS "
+            f"idx_{constants.TABLE_RE_SETTINGS_DESCRIPTION}_option "
+            f"ON {constants.TABLE_RE_SETTINGS_DESCRIPTION} (option_id)",
+            f"CREATE INDEX IF NOT EXISTS "
+            f"idx_{constants.TABLE_RE_SETTINGS_IMG_DIRS}_selected "
+            f"ON {constants.TABLE_RE_SETTINGS_IMG_DIRS} (is_selected)",
+        ],
+    ),
+    Migration(
+        2,
+        "full-text search over listings and templates",
+        _fts_steps(
+            constants.TABLE_RE_FTS,
+            constants.TABLE_RE,
+            ["pid", "street", "function", "description"],
+        )
+        + _fts_steps(
+            constants.TABLE_RE_SETTINGS_TITLE_FTS,
+            constants.TABLE_RE_SETTINGS_TITLE,
+            ["value"],
+        )
+        + _fts_steps(
+            constants.TABLE_RE_SETTINGS_DESCRIPTION_FTS,
+            constants.TABLE_RE_SETTINGS_DESCRIPTION,
+            ["value"],
+        ),
+    ),
+]
+
+USER_MIGRATIONS = [
+    Migration(
+        1,
+        "secondary indexes for user filters and the selected udd",
+        [
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_group_type "
+            f"ON {constants.TABLE_USER} (user_group, type)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_type "
+            f"ON {constants.TABLE_USER} (type)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_uid "
+            f"ON {constants.TABLE_USER} (uid)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER_SETTINGS_UDD}_selected "
+            f"ON {constants.TABLE_USER_SETTINGS_UDD} (is_selected)",
+        ],
+    ),
+    Migration(
+        2,
+        "case-insensitive indexes for prefix (LIKE 'x%') user filters",
+        [
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_uid_nocase "
+            f"ON {constants.TABLE_USER} (uid COLLATE NOCASE)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_type_nocase "
+            f"ON {constants.TABLE_USER} (type COLLATE NOCASE)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER}_group_nocase "
+            f"ON {constants.TABLE_USER} (user_group COLLATE NOCASE)",
+        ],
+    ),
+    Migration(
+        3,
+        "per-proxy health checks (latency, success rate, exit ip)",
+        [
+            f"""CREATE TABLE IF NOT EXISTS {constants.TABLE_USER_SETTINGS_PROXY_HEALTH} (
+proxy_id INTEGER PRIMARY KEY
+    REFERENCES {constants.TABLE_USER_SETTINGS_PROXY} (id) ON DELETE CASCADE,
+checks_total INTEGER NOT NULL DEFAULT 0,
+checks_ok INTEGER NOT NULL DEFAULT 0,
+last_ok INTEGER NOT NULL DEFAULT 0,
+last_latency_ms REAL,
+avg_latency_ms REAL,
+last_ip TEXT,
+last_error TEXT,
+last_checked_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now'))
+)""",
+        ],
+    ),
+    Migration(
+        4,
+        "concurrent browser sessions allowed per proxy endpoint",
+        [
+            f"ALTER TABLE {constants.TABLE_USER_SETTINGS_PROXY} "
+            f"ADD COLUMN max_sessions INTEGER NOT NULL DEFAULT 1",
+        ],
+    ),
+    Migration(
+        5,
+        "durable robot job queue with idempotency keys",
+        [
+            f"""CREATE TABLE IF NOT EXISTS {constants.TABLE_USER_ROBOT_JOBS} (
+id INTEGER PRIMARY KEY AUTOINCREMENT,
+user_id INTEGER REFERENCES {constants.TABLE_USER} (id) ON DELETE CASCADE,
+idempotency_key TEXT,
+payload TEXT NOT NULL,
+priority INTEGER NOT NULL DEFAULT 1,
+state TEXT NOT NULL DEFAULT 'pending',
+attempts INTEGER NOT NULL DEFAULT 0,
+last_error TEXT,
+created_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+updated_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+finished_at TEXT
+)""",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER_ROBOT_JOBS}_state "
+            f"ON {constants.TABLE_USER_ROBOT_JOBS} (state)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER_ROBOT_JOBS}_key "
+            f"ON {constants.TABLE_USER_ROBOT_JOBS} (idempotency_key, state)",
+        ],
+    ),
+    Migration(
+        6,
+        "post history per account, group and listing",
+        [
+            f"""CREATE TABLE IF NOT EXISTS {constants.TABLE_USER_POST_HISTORY} (
+id INTEGER PRIMARY KEY AUTOINCREMENT,
+user_id INTEGER NOT NULL REFERENCES {constants.TABLE_USER} (id) ON DELETE CASCADE,
+group_url TEXT NOT NULL,
+pid TEXT,
+posted_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now'))
+)""",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER_POST_HISTORY}_post "
+            f"ON {constants.TABLE_USER_POST_HISTORY} (user_id, group_url, pid, posted_at)",
+            f"CREATE INDEX IF NOT EXISTS idx_{constants.TABLE_USER_POST_HISTORY}_recent "
+            f"ON {constants.TABLE_USER_POST_HISTORY} (user_id, posted_at)",
+        ],
+    ),
+    Migration(
+        7,
+        "group catalog per account",
+        [
+            f"""CREATE TABLE IF NOT EXISTS {constants.TABLE_USER_GROUPS} (
+id INTEGER PRIMARY KEY AUTOINCREMENT,
+user_id INTEGER NOT NULL REFERENCES {constants.TABLE_USER} (id) ON DELETE CASCADE,
+group_url TEXT NOT NULL,
+is_buy_sell INTEGER,
+last_success_at TEXT,
+refreshed_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+UNIQUE (user_id, group_url)
+)""",
+        ],
+    ),
+]
+
+
+def get_schema_version(db: QSqlDatabase):
+    query = QSqlQuery(db)
+    if not query.exec(f"SELECT MAX(version) FROM {TABLE_SCHEMA_VERSION}"):
+        logger.error(f"Error reading schema version: {query.lastError().text()}")
+        return None
+    version = query.value(0) if query.next() else None
+    return version or 0
+
+
+def _ensure_version_table(db: QSqlDatabase):
+    query = QSqlQuery(db)
+    sql = f"""
+CREATE TABLE IF NOT EXISTS {TABLE_SCHEMA_VERSION} (
+    version INTEGER PRIMARY KEY,
+    description TEXT,
+    applied_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now'))
+)
+"""
+    if not query.exec(sql):
+        logger.error(
+            f"Error creating table '{TABLE_SCHEMA_VERSION}': {query.lastError().text()}"
+        )
+        return False
+    return True
+
+
+def _apply_migration(db: QSqlDatabase, migration: Migration):
+    if not db.transaction():
+        logger.error(f"Could not start transaction for migration {migration.version}.")
+        return False
+    try:
+        for step in migration.steps:
+            if callable(step):
+                if not step(db):
+                    raise RuntimeError("migration step returned False")
+                continue
+            query = QSqlQuery(db)
+            if not query.exec(step):
+                raise RuntimeError(f"{query.lastError().text()}\n{step}")
+        query = QSqlQuery(db)
+        query.prepare(
+            f"INSERT INTO {TABLE_SCHEMA_VERSION} (version, description) VALUES (?, ?)"
+        )
+        query.addBindValue(migration.version)
+        query.addBindValue(migration.description)
+        if not query.exec():
+            raise RuntimeError(query.lastError().text())
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            f"Migration {migration.version} ({migration.description}) failed: {e}"
+        )
+        return False
+    if not db.commit():
+        logger.error(f"Commit failed for migration {migration.version}.")
+        db.rollback()
+        return False
+    return True
+
+
+def run_migrations(db: QSqlDatabase, migrations: list):
+    """Apply every migration newer than the recorded schema version, in order."""
+    if not _ensure_version_table(db):
+        return False
+    current_version = get_schema_version(db)
+    if current_version is None:
+        return False
+    pending = sorted(
+        (m for m in migrations if m.version > current_version),
+        key=lambda m: m.version,
+    )
+    for migration in pending:
+        if not _apply_migration(db, migration):
+            return False
+        logger.info(f"Applied migration {migration.version}: {migration.description}")
+    if pending:
+        # prepared statements may hold plans from the old schema
+        clear_statement_cache(db.connectionName())
+    return True
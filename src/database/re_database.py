@@ -4,6 +4,8 @@ import sys
 
 from PyQt6.QtSql import QSqlDatabase, QSqlQuery
 from src import constants
+from src.database.connection_profile import apply_profile
+from src.database.migrations import RE_MIGRATIONS, run_migrations
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
@@ -42,13 +44,14 @@ def initialize_re_db():
     if not db.open():
         logger.error(f"Error opening database: {db.lastError().text()}")
         return False
-    query = QSqlQuery(db)
-    query.exec("PRAGMA foreign_keys = ON;")
+    apply_profile(db)
     try:
         if not _create_tables(db):
             return False
         if not _seed_initial_data(db):
             return False
+        if not run_migrations(db, RE_MIGRATIONS):
+            return False
         return True
     except Exception as e:
         if db.isOpen():
@@ -186,19 +189,17 @@ def _seed_data(db: QSqlDatabase, table_name: str, payload: list):
     placeholders = ", ".join(["?"] * len(columns))
     columns_str = ", ".join(columns)
     sql = f"INSERT OR IGNORE INTO {table_name} ({columns_str}) VALUES ({placeholders})"
-    query.prepare(sql)
+    if not query.prepare(sql):
+        logger.error(
+            f"Error preparing seed query for '{table_name}': {query.lastError().text()}"
+        )
+        db.rollback()
+        return False
+    column_values = [[] for _ in columns]
     for row_data in payload:
         if isinstance(row_data, dict):
             # Đảm bảo thứ tự giá trị tương ứng với thứ tự cột
             values = [row_data.get(col) for col in columns]
-            for value in values:
-                query.addBindValue(value)
-            if not query.exec():
-                logger.error(
-                    f"Error seeding data into '{table_name}': {query.lastError().text()} - Data: {row_data}"
-                )
-                db.rollback()
-                return False
         elif isinstance(row_data, (list, tuple)):
             if len(row_data) != len(columns):
                 logger.error(
@@ -206,20 +207,24 @@ def _seed_data(db: QSqlDatabase, table_name: str, payload: list):
                 )
                 db.rollback()
                 return False
-            for value in row_data:
-                query.addBindValue(value)
-            if not query.exec():
-                logger.error(
-                    f"Error seeding data into '{table_name}': {query.lastError().text()} - Data: {row_data}"
-                )
-                db.rollback()
-                return False
+            values = list(row_data)
         else:
             logger.error(f"Invalid data format for seeding '{table_name}': {row_data}")
             db.rollback()
             return False
-    # query.clear()
-    # Chuyển commit ra khỏi vòng lặp dữ liệu
+        for index, value in enumerate(values):
+            column_values[index].append(value)
+    # Gửi toàn bộ dữ liệu trong một lần execBatch thay vì exec từng dòng
+    if payload:
+        for values in column_values:
+            query.addBindValue(values)
+        if not query.execBatch():
+            logger.error(
+                f"Error seeding data into '{table_name}': {query.lastError().text()}"
+            )
+            db.rollback()
+            return False
+    query.clear()
     if not db.commit():
         logger.error(f"Failed to commit transaction for seeding table '{table_name}'.")
         return False
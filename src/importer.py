@@ -0,0 +1,71 @@
+# src/importer.py
+import argparse
+import sys
+from PyQt6.QtCore import QCoreApplication
+
+from src.database.user_database import initialize_user_db
+from src.database.re_database import initialize_re_db
+from src.utils import import_handler
+
+
+def print_progress(report):
+    print(
+        f"[chunk {report.chunks}] read {report.rows_read} - "
+        f"inserted {report.rows_inserted} - skipped {report.rows_skipped} - "
+        f"{report.rows_per_second:.0f} rows/s"
+    )
+
+
+def run_import(args):
+    """Open the databases and import args.path into args.target."""
+    if not initialize_re_db():
+        print("Failed initialize re db")
+        return 1
+    if not initialize_user_db():
+        print("Failed initialize user db")
+        return 1
+
+    importer = (
+        import_handler.import_users
+        if args.target == "users"
+        else import_handler.import_products
+    )
+    report = importer(
+        args.path,
+        chunk_size=args.chunk_size,
+        file_format=args.format,
+        on_progress=None if args.quiet else print_progress,
+    )
+    print(
+        f"Imported {report.rows_inserted}/{report.rows_read} {args.target} "
+        f"in {report.elapsed:.2f}s ({report.rows_per_second:.0f} rows/s), "
+        f"skipped {report.rows_skipped}."
+    )
+    for error in report.errors:
+        print(f"  {error}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk import users or real estate products from CSV/JSONL."
+    )
+    parser.add_argument("target", choices=["users", "products"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument(
+        "--chunk-size", type=int, default=import_handler.DEFAULT_CHUNK_SIZE
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    # QtSql needs the application object for as long as the work runs
+    app = QCoreApplication(sys.argv[:1])
+    try:
+        return run_import(args)
+    finally:
+        app.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
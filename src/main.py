@@ -1,9 +1,16 @@
 import sys
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtSql import QSqlDatabase
 
 from .app import MainWindow
 from src.database.user_database import initialize_user_db
 from src.database.re_database import initialize_re_db
+from src.database.connection_profile import format_report
+from src.database.connection_manager import connection_manager
+from src.robot.browser_session import browser_sessions
+from src.robot.async_engine import async_engine
+from src.robot.process_engine import process_engine
+from src import constants
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -13,6 +20,12 @@ if __name__ == "__main__":
     if not initialize_user_db():
         print("Failed initialize user db")
         exit()
+    for connection in (constants.RE_CONNECTION, constants.USER_CONNECTION):
+        print(format_report(QSqlDatabase.database(connection)))
+    app.aboutToQuit.connect(connection_manager.close_idle)
+    app.aboutToQuit.connect(browser_sessions.close_all)
+    app.aboutToQuit.connect(async_engine.stop)
+    app.aboutToQuit.connect(process_engine.stop)
     main_window = MainWindow()
     main_window.show()
     sys.exit(app.exec())
@@ -1,85 +1,100 @@
 # src/models/re_model.py
-from PyQt6.QtSql import (
-    QSqlRelationalTableModel,
-    QSqlRelation,
-    QSqlTableModel,
-    QSqlDatabase,
-)
-from PyQt6.QtCore import Qt
+from PyQt6.QtSql import QSqlTableModel, QSqlDatabase, QSqlField, QSqlRecord
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from src import constants
+from src.services.base_service import fts_match_query
+from src.services.query_engine import fetch_all, fetch_one, notify_table_changed
+from src.services.settings_cache import PRODUCT_FOREIGN_KEYS, settings_cache
+
+
+class REProductModel(QAbstractTableModel):
+    """Read-only product table that loads table_re one page at a time.
+
+    Sorting and filtering run in SQL; foreign keys are shown as label_vi
+    through settings_cache instead of joining the settings tables, and are
+    sorted by that label with a subquery.
+    """
+
+    PAGE_SIZE = 200
+    COLUMNS = [
+        "id",
+        "pid",
+        "status_id",
+        "option_id",
+        "ward_id",
+        "street",
+        "category_id",
+        "area",
+        "price",
+        "legal_id",
+        "province_id",
+        "district_id",
+        "structure",
+        "function",
+        "building_line_id",
+        "furniture_id",
+        "description",
+        "created_at",
+        "updated_at",
+    ]
+    # columns matched with LIKE '%text%'; the rest are compared with =
+    TEXT_FILTER_COLUMNS = ["pid", "street", "area", "price", "structure", "function"]
 
-
-class REProductModel(QSqlRelationalTableModel):
     def __init__(self, parent=None):
-        super().__init__(parent, QSqlDatabase.database(constants.RE_CONNECTION))
-        self.setTable(constants.TABLE_RE)
-        self.setEditStrategy(QSqlRelationalTableModel.EditStrategy.OnManualSubmit)
+        super().__init__(parent)
+        self._rows = []
+        self._row_by_id = {}
+        self._has_more = False
+        self._sort_column = "id"
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filters = {}
+        self._search = None
         self._column_headers = {
-            self.fieldIndex("pid"): "pid".upper(),
-            self.fieldIndex("ward_id"): "ward".title(),
-            self.fieldIndex("street"): "street".title(),
-            self.fieldIndex("status_id"): "status".title(),
-            self.fieldIndex("province_id"): "province".title(),
-            self.fieldIndex("district_id"): "district".title(),
-            self.fieldIndex("option_id"): "option".title(),
-            self.fieldIndex("category_id"): "category".title(),
-            self.fieldIndex("building_line_id"): "building_line".title(),
-            self.fieldIndex("furniture_id"): "furniture".title(),
-            self.fieldIndex("legal_id"): "legal".title(),
-            self.fieldIndex("area"): "area".title(),
-            self.fieldIndex("structure"): "structure".title(),
-            self.fieldIndex("function"): "function".title(),
-            self.fieldIndex("description"): "description".title(),
-            self.fieldIndex("price"): "price".title(),
-            "relation-status_id": "status".title(),
-            "relation-option_id": "option".title(),
-            "relation-category_id": "category".title(),
-            "relation-province_id": "province".title(),
-            "relation-district_id": "district".title(),
-            "relation-ward_id": "ward".title(),
-            "relation-building_line_id": "building_line".title(),
-            "relation-legal_id": "legal".title(),
-            "relation-furniture_id": "furniture".title(),
+            "pid": "pid".upper(),
+            "ward_id": "ward".title(),
+            "street": "street".title(),
+            "status_id": "status".title(),
+            "province_id": "province".title(),
+            "district_id": "district".title(),
+            "option_id": "option".title(),
+            "category_id": "category".title(),
+            "building_line_id": "building_line".title(),
+            "furniture_id": "furniture".title(),
+            "legal_id": "legal".title(),
+            "area": "area".title(),
+            "structure": "structure".title(),
+            "function": "function".title(),
+            "description": "description".title(),
+            "price": "price".title(),
         }
-        self._set_relations()
 
-    def _set_relations(self):
-        self.setRelation(
-            self.fieldIndex("status_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_STATUSES, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("province_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_PROVINCES, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("district_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_DISTRICTS, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("ward_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_WARDS, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("option_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_OPTIONS, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("category_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_CATEGORIES, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("building_line_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_BUILDING_LINES, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("legal_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_LEGALS, "id", "label_vi"),
-        )
-        self.setRelation(
-            self.fieldIndex("furniture_id"),
-            QSqlRelation(constants.TABLE_RE_SETTINGS_FURNITURES, "id", "label_vi"),
-        )
+    def fieldIndex(self, field_name):
+        try:
+            return self.COLUMNS.index(field_name)
+        except ValueError:
+            return -1
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.EditRole,
+        ):
+            return None
+        column = self.COLUMNS[index.column()]
+        value = self._rows[index.row()].get(column)
+        if role == Qt.ItemDataRole.DisplayRole and column in PRODUCT_FOREIGN_KEYS:
+            return settings_cache.label_vi(PRODUCT_FOREIGN_KEYS[column], value)
+        return value
 
     def flags(self, index):
         return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
@@ -93,43 +108,145 @@ class REProductModel(QSqlRelationalTableModel):
         if (
             orientation == Qt.Orientation.Horizontal
             and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.COLUMNS)
         ):
-            # Tiêu đề cho các cột dữ liệu trực tiếp từ bảng re_products
-            if section in self._column_headers:
-                return self._column_headers[section]
-
-            # Tiêu đề cho các cột quan hệ (hiển thị giá trị từ bảng liên kết)
-            for field_name in [
-                "status_id",
-                "province_id",
-                "district_id",
-                "ward_id",
-                "option_id",
-                "category_id",
-                "building_line_id",
-                "legal_id",
-                "furniture_id",
-            ]:
-                relation_index = self.fieldIndex(field_name)
-                if self.relation(relation_index).isValid():
-                    if (
-                        self.relation(relation_index).displayColumn() == 2
-                        and self.relation(relation_index).indexInRelatedTable()
-                        == section - self.columnCount()
-                    ):
-                        return self._column_headers.get(
-                            f"relation-{field_name}",
-                            field_name.replace("_id", "").title(),
-                        )
-            return super().headerData(section, orientation, role)
+            column = self.COLUMNS[section]
+            return self._column_headers.get(column, column)
         return super().headerData(section, orientation, role)
 
+    def record(self, row):
+        record = QSqlRecord()
+        values = self._rows[row] if 0 <= row < len(self._rows) else {}
+        for column in self.COLUMNS:
+            field = QSqlField(column)
+            field.setValue(values.get(column))
+            record.append(field)
+        return record
+
+    def _where_clause(self):
+        conditions = []
+        bindings = {}
+        for column, value in self._filters.items():
+            if column in self.TEXT_FILTER_COLUMNS:
+                conditions.append(f"{column} LIKE :filter_{column}")
+                bindings[f"filter_{column}"] = f"%{value}%"
+            else:
+                conditions.append(f"{column} = :filter_{column}")
+                bindings[f"filter_{column}"] = value
+        if self._search:
+            conditions.append(
+                f"id IN (SELECT rowid FROM {constants.TABLE_RE_FTS} "
+                f"WHERE {constants.TABLE_RE_FTS} MATCH :search)"
+            )
+            bindings["search"] = self._search
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, bindings
+
+    def _fetch_page(self, offset):
+        where, bindings = self._where_clause()
+        direction = (
+            "DESC" if self._sort_order == Qt.SortOrder.DescendingOrder else "ASC"
+        )
+        sort_key = self._sort_column
+        if sort_key in PRODUCT_FOREIGN_KEYS:
+            settings_table = PRODUCT_FOREIGN_KEYS[sort_key]
+            sort_key = (
+                f"(SELECT label_vi FROM {settings_table} "
+                f"WHERE {settings_table}.id = {constants.TABLE_RE}.{sort_key})"
+            )
+        sql = (
+            f"SELECT * FROM {constants.TABLE_RE} {where} "
+            f"ORDER BY {sort_key} {direction}, id {direction} "
+            "LIMIT :limit OFFSET :offset"
+        )
+        bindings.update({"limit": self.PAGE_SIZE, "offset": offset})
+        return fetch_all(constants.RE_CONNECTION, sql, bindings)
+
+    def select(self):
+        self.beginResetModel()
+        self._rows = self._fetch_page(0)
+        self._row_by_id = {row.get("id"): i for i, row in enumerate(self._rows)}
+        self._has_more = len(self._rows) == self.PAGE_SIZE
+        self.endResetModel()
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        rows = self._fetch_page(len(self._rows))
+        self._has_more = len(rows) == self.PAGE_SIZE
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for i, row in enumerate(rows, start=first):
+            self._row_by_id[row.get("id")] = i
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.COLUMNS):
+            return
+        self._sort_column = self.COLUMNS[column]
+        self._sort_order = order
+        self.select()
+
+    def set_filter(self, column, value):
+        """Filter on a table_re column; None or "" removes that filter."""
+        if column not in self.COLUMNS:
+            raise ValueError(f"Unknown product column '{column}'.")
+        if value is None or value == "":
+            if self._filters.pop(column, None) is None:
+                return
+        elif self._filters.get(column) == value:
+            return
+        else:
+            self._filters[column] = value
+        self.select()
+
+    def set_search(self, text):
+        """Restrict rows to full-text matches on pid/street/function/description."""
+        match_query = fts_match_query(text)
+        if match_query == self._search:
+            return
+        self._search = match_query
+        self.select()
+
+    def refresh_row(self, record_id):
+        row = self._row_by_id.get(record_id)
+        if row is None:
+            return False
+        values = fetch_one(
+            constants.RE_CONNECTION,
+            f"SELECT * FROM {constants.TABLE_RE} WHERE id = :id",
+            {"id": record_id},
+        )
+        if values is None:
+            return self.remove_record(record_id)
+        self._rows[row] = values
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.COLUMNS) - 1)
+        )
+        return True
+
+    def remove_record(self, record_id):
+        row = self._row_by_id.get(record_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._row_by_id = {r.get("id"): i for i, r in enumerate(self._rows)}
+        self.endRemoveRows()
+        return True
+
     def get_record_ids(self, rows):
         ids = []
         for row in rows:
             if 0 <= row < self.rowCount():
-                index = self.index(row, self.fieldIndex("id"))
-                ids.append(self.data(index))
+                ids.append(self._rows[row].get("id"))
         return ids
 
 
@@ -142,6 +259,21 @@ class BaseSettingModel(QSqlTableModel):
             error_msg = f"Error selecting data from table '{table_name}': {self.lastError().text()}"
             print(error_msg)
 
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        is_set = super().setData(index, value, role)
+        if is_set:
+            notify_table_changed(self.tableName())
+        return is_set
+
+    def removeRows(self, row, count, parent=None):
+        if parent is None:
+            is_removed = super().removeRows(row, count)
+        else:
+            is_removed = super().removeRows(row, count, parent)
+        if is_removed:
+            notify_table_changed(self.tableName())
+        return is_removed
+
     def flags(self, index):
         return (
             Qt.ItemFlag.ItemIsSelectable
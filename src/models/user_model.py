@@ -1,6 +1,17 @@
 from PyQt6.QtSql import QSqlTableModel, QSqlDatabase
 from PyQt6.QtCore import Qt
 from src import constants
+from src.utils.filter_handler import CONTAINS, PREFIX
+
+# uid/type/group are codes matched from the start and backed by COLLATE
+# NOCASE indexes; free text columns match anywhere.
+USER_FILTER_OPERATORS = {
+    "uid": PREFIX,
+    "type": PREFIX,
+    "user_group": PREFIX,
+    "username": CONTAINS,
+    "note": CONTAINS,
+}
 
 
 class BaseUserModel(QSqlTableModel):
@@ -1,6 +1,8 @@
 # src/my_types.py
 from dataclasses import dataclass, asdict
-from typing import Optional
+from typing import List, Optional
+
+from src import constants
 
 
 @dataclass
@@ -18,12 +20,31 @@ class ActionInfo:
     images_path: Optional[str] = None
     title: Optional[str] = None
     description: Optional[str] = None
+    # product posted by the action, part of the job's idempotency key
+    pid: Optional[str] = None
+    # groups to pass over, set by RobotService from the post history
+    skip_group_urls: Optional[List[str]] = None
+    # the account's cached group catalog; None: scrape the groups sidebar
+    group_urls: Optional[List[str]] = None
+
+
+@dataclass
+class ProxyCheckResult:
+    is_ok: bool
+    latency_ms: Optional[float] = None
+    ip: Optional[str] = None
+    error: Optional[str] = None
 
 
 @dataclass
 class TaskInfo:
     browser_info: BrowserInfo
     action: ActionInfo
+    # lower starts first, see services/task_scheduler.py
+    priority: int = constants.ROBOT_PRIORITY_NORMAL
+    user_group: Optional[str] = None
+    # row in TABLE_USER_ROBOT_JOBS, when RobotService persists its tasks
+    job_id: Optional[int] = None
 
 
 # @dataclass
@@ -0,0 +1,445 @@
+import asyncio, random, traceback, sys
+from pathlib import Path
+from playwright.async_api import (
+    BrowserContext,
+    Page,
+    TimeoutError as PlaywrightTimeoutError,
+)
+from undetected_playwright import tarnished
+from src.robot import selectors
+from src.robot.browser_actions import MIN, WorkerSignals
+from src.robot.robot_utils import PhaseTimer, group_url_key
+from src.my_types import BrowserInfo, ActionInfo
+
+# async twins of browser_actions.py; keep the two in step when editing
+
+
+_stealth_scripts = []
+
+
+async def apply_stealth(context: BrowserContext):
+    """Tarnished.apply_stealth() for async contexts."""
+    if not _stealth_scripts:
+        evasions_dir = Path(tarnished.__file__).parent.joinpath(
+            "puppeteer-extra-plugin-stealth", "evasions"
+        )
+        for evasion in tarnished.enabled_evasions:
+            _stealth_scripts.append(
+                evasions_dir.joinpath(evasion, "index.js").read_text(encoding="utf8")
+            )
+    for script in _stealth_scripts:
+        await context.add_init_script(script)
+    return context
+
+
+async def random_sleep(min_delay: float = 0.1, max_delay: float = 0.5):
+    delay = random.uniform(min_delay, max_delay) * 1
+    await asyncio.sleep(delay)
+
+
+async def do_launch(
+    page: Page,
+    browser_info: BrowserInfo,
+    action_info: ActionInfo,
+    signals: WorkerSignals,
+):
+    try:
+        signals.log_message.emit(f"[{browser_info.user_id}] Wait for closing ...")
+        await page.wait_for_event("close", timeout=0)
+        signals.log_message.emit(f"[{browser_info.user_id}] Closed!")
+        return True
+    except Exception:
+        exc_type, value, tb = sys.exc_info()
+        formatted_lines = traceback.format_exception(exc_type, value, tb)
+        print(f"ERROR in 'do_launch' {''.join(formatted_lines)}")
+
+
+async def do_discussion(
+    page: Page,
+    browser_info: BrowserInfo,
+    action_info: ActionInfo,
+    signals: WorkerSignals,
+):
+    phases = PhaseTimer(signals)
+    try:
+        signals.log_message.emit(
+            f"[{browser_info.user_id}] Performing <{action_info.action_name}> action ..."
+        )
+        group_num = 9
+
+        # Section 1: Get groups, from the catalog or else the sidebar
+        group_urls = action_info.group_urls
+        if group_urls is None:
+            phases.start("navigation")
+            await page.goto("https://www.facebook.com/groups/feed/", timeout=60000)
+            page_language = await page.locator("html").get_attribute("lang")
+            if page_language != "en":
+                signals.log_message.emit("Switch to English.")
+                return
+            sidebar_locator = page.locator(
+                f"{selectors.S_NAVIGATION}:not({selectors.S_BANNER} {selectors.S_NAVIGATION})"
+            )
+            while await sidebar_locator.first.locator(selectors.S_LOADING).count():
+                _ = sidebar_locator.first.locator(selectors.S_LOADING)
+                if await _.count():
+                    try:
+                        await random_sleep(1, 3)
+                        await _.first.scroll_into_view_if_needed(timeout=100)
+                    except:
+                        break
+            group_locators = sidebar_locator.first.locator(
+                "a[href^='https://www.facebook.com/groups/']"
+            )
+            group_urls = [
+                await group_locator.get_attribute("href")
+                for group_locator in await group_locators.all()
+            ]
+            group_urls = list(dict.fromkeys(map(group_url_key, group_urls)))
+            if group_urls:
+                signals.groups_found.emit(group_urls)
+        if not len(group_urls):
+            signals.log_message.emit("Could not retrieve any group URLs")
+            return
+        # skip groups in their cooldown or that already have this listing
+        skip_group_urls = set(action_info.skip_group_urls or [])
+        group_urls = [
+            group_url for group_url in group_urls if group_url not in skip_group_urls
+        ]
+        if skip_group_urls:
+            signals.log_message.emit(
+                f"[{browser_info.user_id}] {len(group_urls)} groups left after "
+                f"the post history."
+            )
+            if not group_urls:
+                # already posted everywhere it may go: nothing left to do
+                return True
+        # Section 2: Published post to group
+        current_group = 0
+        for group_url in group_urls:
+            phases.start("navigation")
+            await page.goto(group_url, timeout=MIN)
+            if action_info.group_urls is not None:
+                # the groups feed, where this is checked otherwise, was skipped
+                page_language = await page.locator("html").get_attribute("lang")
+                if page_language != "en":
+                    signals.log_message.emit("Switch to English.")
+                    return
+            main_locator = page.locator(selectors.S_MAIN)
+            tablist_locator = main_locator.first.locator(selectors.S_TABLIST)
+            try:
+                await tablist_locator.first.wait_for(state="attached", timeout=5_000)
+            except:
+                continue
+            tab_locators = tablist_locator.first.locator(selectors.S_TABLIST_TAB)
+            is_discussion = False
+            is_buy_sell = False
+            for tab_locator in await tab_locators.all():
+                is_discussion = True
+                tab_url = await tab_locator.get_attribute("href", timeout=5_000)
+                if not tab_url:
+                    continue
+                tab_url = tab_url[:-1] if tab_url.endswith("/") else tab_url
+                if tab_url.endswith("buy_sell_discussion"):
+                    is_discussion = False
+                    is_buy_sell = True
+                    break
+            signals.group_checked.emit(group_url, is_buy_sell)
+            if is_discussion:
+                profile_locator = main_locator.first.locator(selectors.S_PROFILE)
+                try:
+                    await profile_locator.first.wait_for(state="attached", timeout=MIN)
+                except Exception as e:
+                    print(e)
+                    print(
+                        'profile_locator.first.wait_for(state="attached", timeout=MIN)'
+                    )
+                    continue
+                await random_sleep(1, 3)
+                await profile_locator.first.scroll_into_view_if_needed()
+                discussion_btn_locator = profile_locator
+                while True:
+                    if (
+                        await discussion_btn_locator.first.locator("..")
+                        .locator(selectors.S_BUTTON)
+                        .count()
+                    ):
+                        discussion_btn_locator = discussion_btn_locator.first.locator(
+                            ".."
+                        ).locator(selectors.S_BUTTON)
+                        break
+                    else:
+                        discussion_btn_locator = discussion_btn_locator.first.locator(
+                            ".."
+                        )
+                await random_sleep(1, 3)
+                await discussion_btn_locator.first.scroll_into_view_if_needed()
+                try:
+                    await discussion_btn_locator.first.click()
+                except Exception as e:
+                    print(e)
+                    print("discussion_btn_locator.first.click()")
+                    continue
+
+                await page.locator(selectors.S_DIALOG_CREATE_POST).first.locator(
+                    selectors.S_LOADING
+                ).first.wait_for(state="detached", timeout=30_000)
+                dialog_locator = page.locator(selectors.S_DIALOG_CREATE_POST)
+                dialog_container_locator = dialog_locator.first.locator(
+                    "xpath=ancestor::*[contains(@role, 'dialog')][1]"
+                )
+                if len(action_info.images_path):
+                    phases.start("upload")
+                    try:
+                        await dialog_container_locator.locator(
+                            selectors.S_IMG_INPUT
+                        ).wait_for(state="attached", timeout=10_000)
+                    except PlaywrightTimeoutError:
+                        image_btn_locator = dialog_container_locator.first.locator(
+                            selectors.S_IMAGE_BUTTON
+                        )
+                        await random_sleep(1, 3)
+                        await image_btn_locator.click()
+                    finally:
+                        image_input_locator = dialog_container_locator.locator(
+                            selectors.S_IMG_INPUT
+                        )
+                        await random_sleep(1, 3)
+                        await image_input_locator.set_input_files(
+                            action_info.images_path, timeout=10000
+                        )
+                phases.start("form_fill")
+                textbox_locator = dialog_container_locator.first.locator(
+                    selectors.S_TEXTBOX
+                )
+                await random_sleep(1, 3)
+                await textbox_locator.fill(action_info.description)
+                post_btn_locators = dialog_container_locator.first.locator(
+                    selectors.S_POST_BUTTON
+                )
+
+                phases.start("publish")
+                await dialog_container_locator.locator(
+                    f"{selectors.S_POST_BUTTON}[aria-disabled]"
+                ).wait_for(state="detached", timeout=30_000)
+
+                await post_btn_locators.first.click()
+                await dialog_container_locator.wait_for(state="detached", timeout=MIN)
+                phases.stop()
+                await random_sleep(1, 3)
+                signals.log_message.emit(f"Published in {group_url}.")
+                signals.published.emit(group_url)
+            else:
+                continue
+            if current_group >= group_num:
+                break
+            current_group += 1
+        phases.stop()
+        await asyncio.sleep(30)
+        return True
+
+    except Exception as e:
+        phases.stop()
+        print("ERROR: ", e)
+        pass
+
+
+async def do_marketplace(
+    page: Page,
+    browser_info: BrowserInfo,
+    action_info: ActionInfo,
+    signals: WorkerSignals,
+):
+    phases = PhaseTimer(signals)
+    try:
+        signals.log_message.emit(
+            f"[{browser_info.user_id}] Performing <{action_info.action_name}> action ..."
+        )
+
+        phases.start("navigation")
+        await page.goto(
+            "https://www.facebook.com/marketplace/create/item", timeout=60000
+        )
+        page_language = await page.locator("html").get_attribute("lang")
+        if page_language != "en":
+            signals.log_message.emit("Switch to English.")
+            return
+        marketplace_forms = page.locator(selectors.S_MARKETPLACE_FORM)
+        marketplace_form = None
+        for marketplace_form in await marketplace_forms.all():
+            if (
+                await marketplace_form.is_visible()
+                and await marketplace_form.is_enabled()
+            ):
+                break
+        if not marketplace_form:
+            error_msg = (
+                f"{selectors.S_MARKETPLACE_FORM} is not found or is not interaction."
+            )
+            print(error_msg)
+            signals.log_message.emit(error_msg)
+            return False
+
+        phases.start("form_fill")
+        await close_dialog(page)
+        expand_btn_locators = marketplace_form.locator(selectors.S_EXPAND_BUTTON)
+        await random_sleep(0.2, 1.5)
+        await expand_btn_locators.first.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await expand_btn_locators.first.click(timeout=MIN)
+
+        description_locators = marketplace_form.locator(selectors.S_TEXTAREA)
+        await random_sleep(0.2, 1.5)
+        await description_locators.first.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await description_locators.first.fill(
+            value=action_info.description, timeout=MIN
+        )
+
+        input_text_locators = marketplace_form.locator(selectors.S_INPUT_TEXT)
+        title_locator = input_text_locators.nth(0)
+        price_locator = input_text_locators.nth(1)
+        location_locator = input_text_locators.nth(3)
+
+        await random_sleep(0.2, 1.5)
+        await title_locator.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await title_locator.fill(value=action_info.title, timeout=MIN)
+        await random_sleep(0.2, 1.5)
+        await price_locator.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await price_locator.fill(value="0", timeout=MIN)
+        await random_sleep(0.2, 1.5)
+
+        await location_locator.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await location_locator.fill("Đà Lạt")
+        await location_locator.press(" ")
+        location_listbox_locators = page.locator(selectors.S_UL_LISTBOX)
+        await random_sleep(0.2, 1.5)
+        await location_listbox_locators.first.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await location_listbox_locators.first.wait_for(state="attached", timeout=MIN)
+        location_option_locators = location_listbox_locators.first.locator(
+            selectors.S_LI_OPTION
+        )
+        await random_sleep(0.2, 1.5)
+        await location_option_locators.first.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await location_option_locators.first.click(timeout=MIN)
+
+        combobox_locators = page.locator(selectors.S_LABEL_COMBOBOX_LISTBOX)
+        category_locator = combobox_locators.nth(0)
+        condition_locator = combobox_locators.nth(1)
+
+        await random_sleep(0.2, 1.5)
+        await category_locator.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await category_locator.click(timeout=MIN)
+
+        dialog_locators = page.locator(selectors.S_DIALOG_DROPDOWN)
+        await dialog_locators.first.wait_for(state="attached", timeout=MIN)
+        dialog_button_locators = dialog_locators.first.locator(selectors.S_BUTTON)
+        dialog_misc_button_locator = dialog_button_locators.nth(
+            await dialog_button_locators.count() - 2
+        )
+        await random_sleep(0.2, 1.5)
+        await dialog_misc_button_locator.scroll_into_view_if_needed()
+        await dialog_misc_button_locator.click(timeout=MIN)
+        await dialog_locators.wait_for(state="detached")
+
+        await random_sleep(0.2, 1.5)
+        await condition_locator.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await condition_locator.click(timeout=MIN)
+        listbox_locators = page.locator(selectors.S_DIV_LISTBOX)
+        await listbox_locators.first.wait_for(state="attached", timeout=MIN)
+        listbox_option_locators = listbox_locators.first.locator(selectors.S_DIV_OPTION)
+
+        await random_sleep(0.2, 1.5)
+        await listbox_option_locators.first.scroll_into_view_if_needed()
+        await random_sleep(0.2, 1.5)
+        await listbox_option_locators.first.click(timeout=MIN)
+        await dialog_locators.wait_for(state="detached")
+
+        phases.start("upload")
+        image_input_locators = marketplace_form.locator(selectors.S_IMG_INPUT)
+        await random_sleep(0.2, 1.5)
+        await image_input_locators.first.set_input_files(action_info.images_path)
+
+        phases.start("publish")
+        is_closed_dialog = False
+        await page.locator(selectors.S_NEXT_BUTTON).wait_for(
+            state="attached", timeout=MIN
+        )
+        next_btn_locators = page.locator(selectors.S_NEXT_BUTTON)
+        try:
+            await random_sleep(0.2, 1.5)
+            await next_btn_locators.first.click(timeout=MIN)
+            is_closed_dialog = True
+        except PlaywrightTimeoutError:
+            is_closed_dialog = await close_dialog(page)
+        if not is_closed_dialog:
+            raise Exception("Cannot close anonymous dialog!")
+        await random_sleep(0.2, 1.5)
+
+        checkbox_locators = marketplace_form.locator(selectors.S_CHECK_BOX)
+        for checkbox_locator in await checkbox_locators.all():
+            if (
+                await checkbox_locator.is_visible()
+                and await checkbox_locator.is_enabled()
+            ):
+                await random_sleep(0.2, 0.8)
+                await checkbox_locator.scroll_into_view_if_needed()
+                await random_sleep(0.2, 0.8)
+                await checkbox_locator.click()
+
+        await page.locator(selectors.S_PUBLISH_BUTTON).wait_for(
+            state="attached", timeout=MIN
+        )
+        publish_btn_locators = page.locator(selectors.S_PUBLISH_BUTTON)
+        try:
+            await random_sleep(0.2, 1.5)
+            await publish_btn_locators.first.click(timeout=MIN)
+            is_closed_dialog = True
+        except PlaywrightTimeoutError:
+            is_closed_dialog = await close_dialog(page)
+        if not is_closed_dialog:
+            raise Exception("Cannot close anonymous dialog!")
+        await random_sleep(0.2, 1.5)
+        publish_btn_locators = page.locator(selectors.S_PUBLISH_BUTTON)
+        for publish_btn_locator in await publish_btn_locators.all():
+            if (
+                await publish_btn_locator.is_enabled()
+                and await publish_btn_locator.is_visible()
+            ):
+                await random_sleep(0.2, 0.8)
+                await publish_btn_locator.click()
+                break
+        phases.stop()
+        await asyncio.sleep(30)
+        return True
+    except Exception as e:
+        phases.stop()
+        print("ERROR: ", e)
+        return
+
+
+async def close_dialog(page: Page):
+    try:
+        dialog_locators = page.locator(selectors.S_DIALOG)
+        for dialog_locator in await dialog_locators.all():
+            if await dialog_locator.is_visible() and await dialog_locator.is_enabled():
+                close_button_locators = dialog_locator.locator(selectors.S_CLOSE_BUTTON)
+                await random_sleep(0.2, 1.5)
+                await close_button_locators.last.click(timeout=MIN)
+                await dialog_locator.wait_for(state="detached", timeout=MIN)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+ASYNC_ACTION_MAP = {
+    "launch": do_launch,
+    "discussion": do_discussion,
+    "marketplace": do_marketplace,
+}
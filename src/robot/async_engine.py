@@ -0,0 +1,418 @@
+# src/robot/async_engine.py
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+from playwright.async_api import async_playwright
+
+from src import constants
+from src.my_types import BrowserInfo, TaskInfo
+from src.robot.async_browser_actions import ASYNC_ACTION_MAP, apply_stealth
+from src.robot.browser_session import context_kwargs, launch_signature
+from src.robot.browser_worker import WorkerSignals
+from src.robot.robot_utils import PhaseTimer
+from src.services.proxy_pool import proxy_pool
+from src.utils.resource_handler import browser_budget
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+# how often idle/expired contexts are looked for, in seconds
+EVICT_INTERVAL = 5
+
+
+class AsyncBrowserJob:
+    """BrowserWorker's counterpart for AsyncRobotEngine.
+
+    Same constructor and WorkerSignals, so RobotService wires both alike.
+    Signals are emitted from the event loop thread and reach Qt slots as
+    queued calls, exactly like signals emitted from a QThreadPool worker.
+    """
+
+    def __init__(self, task_info: TaskInfo, retry_count: int, proxy_raw: str):
+        self.task_info = task_info
+        self.browser_info = task_info.browser_info
+        self.action_info = task_info.action
+        self.proxy_raw = proxy_raw
+        self.retry_count = retry_count
+        self.signals = WorkerSignals()
+
+    def _finished(self):
+        self.signals.finished.emit(self.task_info, self.retry_count, self.proxy_raw)
+
+    async def run(self, engine_loop: "_EngineLoop"):
+        if self.action_info.action_name == "<empty>":
+            self.signals.log_message.emit(
+                f"[{self.browser_info.user_id}] - action is empty: skipped."
+            )
+            self._finished()
+            return
+
+        proxy = None
+        self.signals.log_message.emit(f"[{self.browser_info.user_id}] Preparing ...")
+        if self.proxy_raw:
+            # ProxyPool blocks on a condition; keep that off the event loop
+            phases = PhaseTimer(self.signals)
+            phases.start("proxy_fetch")
+            proxy = await asyncio.to_thread(proxy_pool.acquire, self.proxy_raw)
+            phases.stop()
+            if not proxy:
+                logger.error(f"[{self.browser_info.user_id}] No proxy available")
+                self.signals.error.emit(
+                    self.task_info, self.retry_count, "No proxy available"
+                )
+                self._finished()
+                return
+            self.signals.log_message.emit(
+                f"[{self.browser_info.user_id}] Fetched proxy: {proxy}"
+            )
+
+        try:
+            action_name = self.action_info.action_name
+            if not action_name:
+                raise ValueError("Invalid action info")
+            action_function = ASYNC_ACTION_MAP.get(action_name)
+            if not action_function:
+                raise ValueError(f"Invalid action '{action_name}'")
+            completed = await engine_loop.run_action(
+                action_function,
+                browser_info=self.browser_info,
+                action_info=self.action_info,
+                signals=self.signals,
+                proxy_raw=self.proxy_raw,
+                proxy=proxy,
+            )
+            if not completed:
+                raise ValueError(f"Action '{action_name}' did not complete")
+        except Exception as e:
+            self.signals.error.emit(self.task_info, self.retry_count, str(e))
+        finally:
+            if proxy:
+                proxy_pool.release(self.proxy_raw)
+            self._finished()
+
+
+class _AsyncSession:
+    __slots__ = (
+        "context",
+        "signature",
+        "proxy_raw",
+        "has_lease",
+        "started_at",
+        "last_used",
+        "lock",
+        "closed",
+        "launch_phases",
+    )
+
+    def __init__(self, context, signature, proxy_raw, has_lease):
+        self.context = context
+        self.signature = signature
+        self.proxy_raw = proxy_raw
+        self.has_lease = has_lease
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+        # one action at a time per account
+        self.lock = asyncio.Lock()
+        self.closed = False
+        # (phase, seconds) of the launch, reported by the first action
+        self.launch_phases = []
+
+
+class _EngineLoop:
+    """One event loop thread driving many accounts' persistent contexts."""
+
+    def __init__(self, name, engine, idle_timeout, max_lifetime):
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.active_jobs = 0
+        self._jobs_lock = threading.Lock()
+        self._playwright = None
+        self._sessions = {}
+        # launches reserved by AsyncRobotEngine.make_room() and not done yet
+        self.launching = 0
+        self._launch_locks = {}
+        self._evict_task = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._evict_task = self._loop.create_task(self._evict_loop())
+        self._loop.run_forever()
+        self._loop.close()
+
+    def submit(self, job: AsyncBrowserJob):
+        with self._jobs_lock:
+            self.active_jobs += 1
+        future = asyncio.run_coroutine_threadsafe(job.run(self), self._loop)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        with self._jobs_lock:
+            self.active_jobs -= 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Async browser job failed: {future.exception()}")
+
+    async def _get_playwright(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _launch(self, browser_info: BrowserInfo, proxy_raw, proxy):
+        # (phase, seconds), reported by the session's first action
+        launch_phases = []
+        if self._playwright is None:
+            started_at = time.perf_counter()
+            await self._get_playwright()
+            launch_phases.append(("driver_start", time.perf_counter() - started_at))
+        playwright = await self._get_playwright()
+        has_lease = False
+        if proxy_raw:
+            # the context keeps its own lease so the endpoint isn't rotated
+            has_lease = (
+                await asyncio.to_thread(proxy_pool.acquire, proxy_raw, 0)
+            ) is not None
+        started_at = time.perf_counter()
+        try:
+            context = await playwright.chromium.launch_persistent_context(
+                **context_kwargs(browser_info, proxy)
+            )
+        except Exception:
+            if has_lease:
+                proxy_pool.release(proxy_raw)
+            raise
+        launch_phases.append(("context_launch", time.perf_counter() - started_at))
+        session = _AsyncSession(
+            context, launch_signature(browser_info, proxy), proxy_raw, has_lease
+        )
+        session.launch_phases = launch_phases
+        context.on("close", lambda _: setattr(session, "closed", True))
+        await apply_stealth(context)
+        info_page = context.pages[0] if context.pages else await context.new_page()
+        await info_page.set_content(f"""
+<html>
+    <head><title>{browser_info.user_id}</title></head>
+    <body>
+        <h2>user agent: {browser_info.user_agent}</h2>
+    </body>
+</html>
+""")
+        return session
+
+    async def _close_session(self, user_id, session: _AsyncSession):
+        if self._sessions.get(user_id) is session:
+            del self._sessions[user_id]
+        try:
+            if not session.closed:
+                session.closed = True
+                await session.context.close()
+        except Exception as e:
+            logger.error(f"[{user_id}] Error closing browser: {e}")
+        finally:
+            if session.has_lease:
+                session.has_lease = False
+                proxy_pool.release(session.proxy_raw)
+
+    async def _session(self, browser_info: BrowserInfo, proxy_raw, proxy):
+        user_id = browser_info.user_id
+        launch_lock = self._launch_locks.setdefault(user_id, asyncio.Lock())
+        async with launch_lock:
+            session = self._sessions.get(user_id)
+            if session is not None and not session.closed:
+                if session.signature == launch_signature(browser_info, proxy):
+                    return session
+                # the user data dir can only be open once
+                async with session.lock:
+                    await self._close_session(user_id, session)
+            await self.engine.make_room(self)
+            try:
+                session = await self._launch(browser_info, proxy_raw, proxy)
+                self._sessions[user_id] = session
+            finally:
+                self.engine.launch_done(self)
+            return session
+
+    async def run_action(
+        self, action_function, browser_info, action_info, signals, proxy_raw, proxy
+    ):
+        session = await self._session(browser_info, proxy_raw, proxy)
+        async with session.lock:
+            for phase, seconds in session.launch_phases:
+                signals.phase.emit(phase, seconds)
+            session.launch_phases = []
+            page = await session.context.new_page()
+            try:
+                await page.wait_for_load_state("domcontentloaded")
+                return await action_function(
+                    page=page,
+                    browser_info=browser_info,
+                    action_info=action_info,
+                    signals=signals,
+                )
+            finally:
+                session.last_used = time.monotonic()
+                if not session.closed and not page.is_closed():
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+
+    def idle_sessions(self):
+        """[(last_used, user_id, session)] of the contexts no action is using."""
+        return [
+            (session.last_used, user_id, session)
+            for user_id, session in list(self._sessions.items())
+            if not session.closed and not session.lock.locked()
+        ]
+
+    async def evict(self, user_id, session: _AsyncSession):
+        """Close an idle context for AsyncRobotEngine.make_room(); False if in use."""
+        if self._sessions.get(user_id) is not session or session.lock.locked():
+            return False
+        await self._close_session(user_id, session)
+        return True
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(EVICT_INTERVAL)
+            now = time.monotonic()
+            for user_id, session in list(self._sessions.items()):
+                if session.lock.locked():
+                    continue
+                if (
+                    session.closed
+                    or now - session.last_used > self.idle_timeout
+                    or now - session.started_at > self.max_lifetime
+                ):
+                    await self._close_session(user_id, session)
+
+    async def _shutdown(self):
+        self._evict_task.cancel()
+        for user_id, session in list(self._sessions.items()):
+            await self._close_session(user_id, session)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def session_count(self):
+        return len(self._sessions)
+
+    def stop(self, timeout=10):
+        if not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(
+                timeout
+            )
+        except Exception as e:
+            logger.error(f"Error stopping browser loop: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+
+class AsyncRobotEngine:
+    """Runs AsyncBrowserJobs on a few asyncio loops instead of a thread each.
+
+    Every loop owns one async Playwright driver and keeps each account's
+    persistent context open between its actions, like BrowserSessionManager.
+    """
+
+    def __init__(
+        self,
+        loop_count=constants.ROBOT_ASYNC_LOOPS,
+        idle_timeout=constants.ROBOT_SESSION_IDLE_TIMEOUT,
+        max_lifetime=constants.ROBOT_SESSION_MAX_LIFETIME,
+        max_sessions=None,
+    ):
+        self.loop_count = max(loop_count, 1)
+        # open contexts across all loops, like BrowserSessionManager.max_sessions
+        self.max_sessions = max_sessions or browser_budget()
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self._loops = []
+        self._user_loops = {}
+        self._lock = threading.Lock()
+
+    def _loop_for(self, user_id):
+        with self._lock:
+            if not self._loops:
+                self._loops = [
+                    _EngineLoop(
+                        f"AsyncRobotEngine-{index}",
+                        self,
+                        self.idle_timeout,
+                        self.max_lifetime,
+                    )
+                    for index in range(self.loop_count)
+                ]
+            # an account stays on one loop so its open context can be reused
+            engine_loop = self._user_loops.get(user_id)
+            if engine_loop is None:
+                engine_loop = min(self._loops, key=lambda loop: loop.active_jobs)
+                self._user_loops[user_id] = engine_loop
+            return engine_loop
+
+    async def make_room(self, engine_loop: _EngineLoop):
+        """Reserve a launch on engine_loop, first closing least recently used
+        idle contexts (on any loop) while max_sessions are open or launching.
+        Pair with launch_done()."""
+        for _ in range(self.max_sessions + 1):
+            with self._lock:
+                open_count = sum(
+                    len(owner._sessions) + owner.launching for owner in self._loops
+                )
+                if open_count < self.max_sessions:
+                    break
+                idle_sessions = [
+                    (last_used, user_id, session, owner)
+                    for owner in self._loops
+                    for last_used, user_id, session in owner.idle_sessions()
+                ]
+            if not idle_sessions:
+                # every open context is busy; RobotService keeps this from growing
+                break
+            _, user_id, session, owner = min(idle_sessions, key=lambda row: row[0])
+            if owner is engine_loop:
+                await owner.evict(user_id, session)
+            else:
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(
+                        owner.evict(user_id, session), owner._loop
+                    )
+                )
+        with self._lock:
+            engine_loop.launching += 1
+
+    def launch_done(self, engine_loop: _EngineLoop):
+        with self._lock:
+            engine_loop.launching -= 1
+
+    def start(self, job: AsyncBrowserJob):
+        return self._loop_for(job.browser_info.user_id).submit(job)
+
+    def session_count(self):
+        return sum(loop.session_count() for loop in list(self._loops))
+
+    def stop(self):
+        with self._lock:
+            loops = self._loops
+            self._loops = []
+            self._user_loops.clear()
+        for engine_loop in loops:
+            engine_loop.stop()
+
+
+async_engine = AsyncRobotEngine()
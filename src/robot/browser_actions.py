@@ -4,6 +4,7 @@ from PyQt6.QtCore import QObject, pyqtSignal
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from typing import Tuple
 from src.robot import selectors
+from src.robot.robot_utils import PhaseTimer, group_url_key
 from src.my_types import BrowserInfo, ActionInfo, TaskInfo
 
 MIN = 60_000
@@ -14,6 +15,10 @@ class WorkerSignals(QObject):
     error = pyqtSignal((TaskInfo, int, str))
     finished = pyqtSignal((TaskInfo, int))
     progress = pyqtSignal(int)
+    phase = pyqtSignal(str, float)
+    published = pyqtSignal(str)
+    groups_found = pyqtSignal(list)
+    group_checked = pyqtSignal(str, bool)
 
 
 def random_sleep(min_delay: float = 0.1, max_delay: float = 0.5):
@@ -50,43 +55,70 @@ def do_discussion(
     action_info: ActionInfo,
     signals: WorkerSignals,
 ):
+    phases = PhaseTimer(signals)
     try:
         signals.log_message.emit(
             f"[{browser_info.user_id}] Performing <{action_info.action_name}> action ..."
         )
         group_num = 9
 
-        # Section 1: Get groups
-        page.goto("https://www.facebook.com/groups/feed/", timeout=60000)
-        page_language = page.locator("html").get_attribute("lang")
-        if page_language != "en":
-            signals.log_message.emit("Switch to English.")
-            return
-        sidebar_locator = page.locator(
-            f"{selectors.S_NAVIGATION}:not({selectors.S_BANNER} {selectors.S_NAVIGATION})"
-        )
-        while sidebar_locator.first.locator(selectors.S_LOADING).count():
-            _ = sidebar_locator.first.locator(selectors.S_LOADING)
-            if _.count():
-                try:
-                    random_sleep(1, 3)
-                    _.first.scroll_into_view_if_needed(timeout=100)
-                except:
-                    break
-        group_locators = sidebar_locator.first.locator(
-            "a[href^='https://www.facebook.com/groups/']"
-        )
-        group_urls = [
-            group_locator.get_attribute("href")
-            for group_locator in group_locators.all()
-        ]
+        # Section 1: Get groups, from the catalog or else the sidebar
+        group_urls = action_info.group_urls
+        if group_urls is None:
+            phases.start("navigation")
+            page.goto("https://www.facebook.com/groups/feed/", timeout=60000)
+            page_language = page.locator("html").get_attribute("lang")
+            if page_language != "en":
+                signals.log_message.emit("Switch to English.")
+                return
+            sidebar_locator = page.locator(
+                f"{selectors.S_NAVIGATION}:not({selectors.S_BANNER} {selectors.S_NAVIGATION})"
+            )
+            while sidebar_locator.first.locator(selectors.S_LOADING).count():
+                _ = sidebar_locator.first.locator(selectors.S_LOADING)
+                if _.count():
+                    try:
+                        random_sleep(1, 3)
+                        _.first.scroll_into_view_if_needed(timeout=100)
+                    except:
+                        break
+            group_locators = sidebar_locator.first.locator(
+                "a[href^='https://www.facebook.com/groups/']"
+            )
+            group_urls = [
+                group_locator.get_attribute("href")
+                for group_locator in group_locators.all()
+            ]
+            group_urls = list(dict.fromkeys(map(group_url_key, group_urls)))
+            if group_urls:
+                signals.groups_found.emit(group_urls)
         if not len(group_urls):
             signals.log_message.emit("Could not retrieve any group URLs")
             return
+        # skip groups in their cooldown or that already have this listing
+        skip_group_urls = set(action_info.skip_group_urls or [])
+        group_urls = [
+            group_url for group_url in group_urls if group_url not in skip_group_urls
+        ]
+        if skip_group_urls:
+            signals.log_message.emit(
+                f"[{browser_info.user_id}] {len(group_urls)} groups left after "
+                f"the post history."
+            )
+            if not group_urls:
+                # already posted everywhere it may go: nothing left to do
+                return True
         # Section 2: Published post to group
         current_group = 0
         for group_url in group_urls:
+            phases.start("navigation")
             page.goto(group_url, timeout=MIN)
+            if action_info.group_urls is not None:
+                # the groups feed, where this is checked otherwise, was skipped
+                page_language = page.locator("html").get_attribute("lang")
+                if page_language != "en":
+                    signals.log_message.emit("Switch to English.")
+                    return
             main_locator = page.locator(selectors.S_MAIN)
             tablist_locator = main_locator.first.locator(selectors.S_TABLIST)
             try:
@@ -97,6 +129,7 @@ def do_discussion(
                 continue
             tab_locators = tablist_locator.first.locator(selectors.S_TABLIST_TAB)
             is_discussion = False
+            is_buy_sell = False
             for tab_locator in tab_locators.all():
                 is_discussion = True
                 tab_url = tab_locator.get_attribute("href", timeout=5_000)
@@ -105,9 +138,11 @@ def do_discussion(
                     # page.wait_for_event("close", timeout=0)
                     continue
                 tab_url = tab_url[:-1] if tab_url.endswith("/") else tab_url
-                if tab_url.endswith == "buy_sell_discussion":
+                if tab_url.endswith("buy_sell_discussion"):
                     is_discussion = False
+                    is_buy_sell = True
                     break
+            signals.group_checked.emit(group_url, is_buy_sell)
             if is_discussion:
                 profile_locator = main_locator.first.locator(selectors.S_PROFILE)
                 try:
@@ -154,6 +189,7 @@ def do_discussion(
                     "xpath=ancestor::*[contains(@role, 'dialog')][1]"
                 )
                 if len(action_info.images_path):
+                    phases.start("upload")
                     try:
                         dialog_container_locator.locator(
                             selectors.S_IMG_INPUT
@@ -172,6 +208,7 @@ def do_discussion(
                         image_input_locator.set_input_files(
                             action_info.images_path, timeout=10000
                         )
+                phases.start("form_fill")
                 textbox_locator = dialog_container_locator.first.locator(
                     selectors.S_TEXTBOX
                 )
@@ -181,6 +218,7 @@ def do_discussion(
                     selectors.S_POST_BUTTON
                 )
 
+                phases.start("publish")
                 # ?not true?
                 dialog_container_locator.locator(
                     f"{selectors.S_POST_BUTTON}[aria-disabled]"
@@ -189,16 +227,21 @@ def do_discussion(
                 # :not([aria-disabled])
                 post_btn_locators.first.click()
                 dialog_container_locator.wait_for(state="detached", timeout=MIN)
+                phases.stop()
                 random_sleep(1, 3)
                 signals.log_message.emit(f"Published in {group_url}.")
+                signals.published.emit(group_url)
             else:
                 continue
             if current_group >= group_num:
                 break
             current_group += 1
+        phases.stop()
         sleep(30)
+        return True
 
     except Exception as e:
+        phases.stop()
         print("ERROR: ", e)
         pass
 
@@ -209,11 +252,13 @@ def do_marketplace(
     action_info: ActionInfo,
     signals: WorkerSignals,
 ):
+    phases = PhaseTimer(signals)
     try:
         signals.log_message.emit(
             f"[{browser_info.user_id}] Performing <{action_info.action_name}> action ..."
         )
 
+        phases.start("navigation")
         page.goto("https://www.facebook.com/marketplace/create/item", timeout=60000)
         page_language = page.locator("html").get_attribute("lang")
         if page_language != "en":
@@ -232,6 +277,7 @@ def do_marketplace(
             signals.log_message.emit(error_msg)
             return False
 
+        phases.start("form_fill")
         close_dialog(page)
         expand_btn_locators = marketplace_form.locator(selectors.S_EXPAND_BUTTON)
         sleep(random.uniform(0.2, 1.5))
@@ -311,10 +357,12 @@ def do_marketplace(
         listbox_option_locators.first.click(timeout=MIN)
         dialog_locators.wait_for(state="detached")
 
+        phases.start("upload")
         image_input_locators = marketplace_form.locator(selectors.S_IMG_INPUT)
         sleep(random.uniform(0.2, 1.5))
         image_input_locators.first.set_input_files(action_info.images_path)
 
+        phases.start("publish")
         is_closed_dialog = False
         page.locator(selectors.S_NEXT_BUTTON).wait_for(state="attached", timeout=MIN)
         next_btn_locators = page.locator(selectors.S_NEXT_BUTTON)
@@ -353,9 +401,11 @@ def do_marketplace(
                 sleep(random.uniform(0.2, 0.8))
                 publish_btn_locator.click()
                 break
+        phases.stop()
         sleep(30)
         return True
     except Exception as e:
+        phases.stop()
         print("ERROR: ", e)
         # page.wait_for_event("close", timeout=0)
 
@@ -0,0 +1,354 @@
+# src/robot/browser_session.py
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from playwright.sync_api import sync_playwright
+from undetected_playwright import Tarnished
+
+from src import constants
+from src.my_types import ActionInfo, BrowserInfo
+from src.services.proxy_pool import proxy_pool
+from src.utils.resource_handler import browser_budget
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+
+def launch_signature(browser_info: BrowserInfo, proxy):
+    """Everything launch_persistent_context() is given; a change needs a relaunch."""
+    return (
+        browser_info.user_data_dir,
+        browser_info.user_agent,
+        bool(browser_info.headless),
+        bool(browser_info.is_mobile),
+        proxy.get("server") if proxy else None,
+        proxy.get("username") if proxy else None,
+    )
+
+
+def context_kwargs(browser_info: BrowserInfo, proxy):
+    kwargs = dict(
+        user_data_dir=browser_info.user_data_dir,
+        user_agent=browser_info.user_agent,
+        headless=browser_info.headless,
+        args=[
+            "--disable-blink-features=AutomationControlled",
+            f'--app-name=Chromium - {browser_info.user_id or "Unknown User"}',
+        ],
+        ignore_default_args=["--enable-automation"],
+        proxy=proxy,
+    )
+    if browser_info.is_mobile:
+        kwargs["viewport"] = {"width": 390, "height": 844}
+        kwargs["screen"] = {"width": 390, "height": 844}
+        kwargs["is_mobile"] = True
+        kwargs["device_scale_factor"] = 3
+        kwargs["has_touch"] = True
+    return kwargs
+
+
+class _Job:
+    __slots__ = ("action_function", "browser_info", "action_info", "signals", "future")
+
+    def __init__(self, action_function, browser_info, action_info, signals):
+        self.action_function = action_function
+        self.browser_info = browser_info
+        self.action_info = action_info
+        self.signals = signals
+        self.future = Future()
+
+
+class BrowserSession:
+    """One account's persistent context, owned by its own thread.
+
+    Playwright's sync objects only work on the thread that created them, so
+    actions are queued to this thread and run one at a time. The thread
+    closes the context after idle_timeout without work, once max_lifetime
+    has passed, or when the browser is closed by hand.
+    """
+
+    def __init__(
+        self,
+        browser_info: BrowserInfo,
+        proxy_raw,
+        proxy,
+        idle_timeout,
+        max_lifetime,
+        on_closed=None,
+    ):
+        self.user_id = browser_info.user_id
+        self.browser_info = browser_info
+        self.proxy_raw = proxy_raw
+        self.proxy = proxy
+        self.signature = launch_signature(browser_info, proxy)
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.on_closed = on_closed
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+        # submitted actions not finished yet
+        self._busy = 0
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._context_closed = threading.Event()
+        # the session keeps its own lease so the endpoint isn't rotated under it
+        self._has_lease = bool(proxy_raw) and (
+            proxy_pool.acquire(proxy_raw, timeout=0) is not None
+        )
+        self._thread = threading.Thread(
+            target=self._run, name=f"BrowserSession-{self.user_id}", daemon=True
+        )
+        self._thread.start()
+
+    def is_alive(self):
+        return self._accepting and not self._context_closed.is_set()
+
+    def is_idle(self):
+        return self._busy == 0
+
+    def submit(self, action_function, action_info: ActionInfo, signals):
+        """Queue an action; returns a Future, or None if the session is closing."""
+        job = _Job(action_function, self.browser_info, action_info, signals)
+        with self._lock:
+            if not self.is_alive():
+                return None
+            self._busy += 1
+            self._jobs.put(job)
+        job.future.add_done_callback(self._job_done)
+        return job.future
+
+    def _job_done(self, future):
+        with self._lock:
+            self._busy -= 1
+            self.last_used = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._accepting = False
+            self._jobs.put(None)
+
+    def join(self, timeout=None):
+        """Wait for the session's thread; True once it has ended."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _expired(self):
+        return time.monotonic() - self.started_at > self.max_lifetime
+
+    def _next_job(self):
+        while True:
+            try:
+                return self._jobs.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._jobs.empty():
+                        self._accepting = False
+                        return None
+
+    def _run(self):
+        playwright = None
+        context = None
+        # (phase, seconds) of the launch, reported by the first job
+        launch_phases = []
+        try:
+            started_at = time.perf_counter()
+            playwright = sync_playwright().start()
+            launch_phases.append(("driver_start", time.perf_counter() - started_at))
+            started_at = time.perf_counter()
+            context = playwright.chromium.launch_persistent_context(
+                **context_kwargs(self.browser_info, self.proxy)
+            )
+            launch_phases.append(("context_launch", time.perf_counter() - started_at))
+            context.on("close", lambda _: self._context_closed.set())
+            Tarnished.apply_stealth(context)
+            info_page = context.pages[0] if context.pages else context.new_page()
+            info_page.set_content(f"""
+<html>
+    <head><title>{self.user_id}</title></head>
+    <body>
+        <h2>user agent: {self.browser_info.user_agent}</h2>
+    </body>
+</html>
+""")
+            while True:
+                job = self._next_job()
+                if job is None:
+                    break
+                for phase, seconds in launch_phases:
+                    job.signals.phase.emit(phase, seconds)
+                launch_phases = []
+                self._run_job(context, job)
+                if self._context_closed.is_set() or self._expired():
+                    break
+        except Exception as e:
+            logger.error(f"[{self.user_id}] Browser session failed: {e}")
+            self._fail_pending(e)
+        finally:
+            with self._lock:
+                self._accepting = False
+            self._fail_pending(RuntimeError("Browser session closed"))
+            try:
+                if context is not None and not self._context_closed.is_set():
+                    context.close()
+                if playwright is not None:
+                    playwright.stop()
+            except Exception as e:
+                logger.error(f"[{self.user_id}] Error closing browser: {e}")
+            if self._has_lease:
+                proxy_pool.release(self.proxy_raw)
+            if self.on_closed:
+                self.on_closed(self)
+
+    def _run_job(self, context, job: _Job):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        page = None
+        try:
+            page = context.new_page()
+            # a fresh tab is usable once its initial document is parsed
+            page.wait_for_load_state("domcontentloaded")
+            result = job.action_function(
+                page=page,
+                browser_info=job.browser_info,
+                action_info=job.action_info,
+                signals=job.signals,
+            )
+            job.future.set_result(result)
+        except Exception as e:
+            job.future.set_exception(e)
+        finally:
+            if page is not None and not self._context_closed.is_set():
+                try:
+                    if not page.is_closed():
+                        page.close()
+                except Exception:
+                    pass
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None and job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+
+
+class BrowserSessionManager:
+    """Keeps a BrowserSession per account alive across consecutive actions.
+
+    At most max_sessions browsers are open: launching another one first
+    closes the least recently used idle session.
+    """
+
+    def __init__(
+        self,
+        idle_timeout=constants.ROBOT_SESSION_IDLE_TIMEOUT,
+        max_lifetime=constants.ROBOT_SESSION_MAX_LIFETIME,
+        max_sessions=None,
+        close_timeout=constants.ROBOT_SESSION_CLOSE_TIMEOUT,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.close_timeout = close_timeout
+        self.max_sessions = max_sessions or browser_budget()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _forget(self, session: BrowserSession):
+        with self._lock:
+            if self._sessions.get(session.user_id) is session:
+                del self._sessions[session.user_id]
+
+    def _session(self, browser_info: BrowserInfo, proxy_raw, proxy):
+        """(session, None) ready to use, or (None, stale) to be shut down first."""
+        signature = launch_signature(browser_info, proxy)
+        with self._lock:
+            session = self._sessions.get(browser_info.user_id)
+            if session is not None:
+                if session.is_alive() and session.signature == signature:
+                    return session, None
+                del self._sessions[browser_info.user_id]
+                return None, session
+            if len(self._sessions) >= self.max_sessions:
+                idle_sessions = [
+                    session for session in self._sessions.values() if session.is_idle()
+                ]
+                if idle_sessions:
+                    lru = min(idle_sessions, key=lambda session: session.last_used)
+                    del self._sessions[lru.user_id]
+                    return None, lru
+                # every open browser is busy; RobotService keeps this from growing
+            session = BrowserSession(
+                browser_info,
+                proxy_raw,
+                proxy,
+                self.idle_timeout,
+                self.max_lifetime,
+                on_closed=self._forget,
+            )
+            self._sessions[browser_info.user_id] = session
+            return session, None
+
+    def run(
+        self,
+        action_function,
+        browser_info: BrowserInfo,
+        action_info: ActionInfo,
+        signals,
+        proxy_raw="",
+        proxy=None,
+    ):
+        """Run an action in the account's session, launching it if needed."""
+        attempts = 0
+        while attempts < 3:
+            session, stale = self._session(browser_info, proxy_raw, proxy)
+            if stale is not None:
+                # the user data dir can only be open once, and an evicted
+                # browser must be gone before the next one starts
+                stale.close()
+                if not stale.join(self.close_timeout):
+                    raise RuntimeError(
+                        f"[{stale.user_id}] Browser session did not close "
+                        f"within {self.close_timeout}s"
+                    )
+                continue
+            future = session.submit(action_function, action_info, signals)
+            if future is not None:
+                return future.result()
+            attempts += 1
+        raise RuntimeError(f"[{browser_info.user_id}] Could not start browser session")
+
+    def close(self, user_id):
+        with self._lock:
+            session = self._sessions.pop(user_id, None)
+        if session is not None:
+            session.close()
+
+    def close_all(self, timeout=constants.ROBOT_SESSION_CLOSE_TIMEOUT):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        for session in sessions:
+            session.join(timeout)
+
+    def session_count(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+browser_sessions = BrowserSessionManager()
@@ -0,0 +1,349 @@
+# src/robot/process_engine.py
+import itertools
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from multiprocessing.connection import wait
+
+from src import constants
+from src.my_types import TaskInfo
+from src.robot.browser_worker import WorkerSignals
+from src.robot.robot_utils import PhaseTimer
+from src.services.proxy_pool import proxy_pool
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+# fork is unsafe once Qt and the proxy pool have started threads
+_mp = multiprocessing.get_context("spawn")
+
+
+class _PipeSignal:
+    def __init__(self, signals, name):
+        self._signals = signals
+        self._name = name
+
+    def emit(self, *args):
+        self._signals.send(self._name, args)
+
+
+class _PipeSignals:
+    """WorkerSignals stand-in inside a worker process; events go to the parent."""
+
+    def __init__(self, conn, job_id):
+        self._conn = conn
+        self._job_id = job_id
+        # browser sessions emit from their own threads
+        self._lock = threading.Lock()
+        self.log_message = _PipeSignal(self, "log_message")
+        self.progress = _PipeSignal(self, "progress")
+        self.error = _PipeSignal(self, "error")
+        self.phase = _PipeSignal(self, "phase")
+        self.published = _PipeSignal(self, "published")
+        self.groups_found = _PipeSignal(self, "groups_found")
+        self.group_checked = _PipeSignal(self, "group_checked")
+
+    def send(self, name, args):
+        if name == "error":
+            # the parent owns the TaskInfo/retry; only the message travels
+            args = (str(args[-1]),)
+        with self._lock:
+            self._conn.send((self._job_id, name, args))
+
+
+def _worker_main(inbox, conn):
+    """Worker process loop: run (job_id, task_info, proxy) jobs one at a time."""
+    from src.robot.browser_actions import ACTION_MAP
+    from src.robot.browser_session import browser_sessions
+
+    # one browser per worker process, so process_count bounds the open ones
+    browser_sessions.max_sessions = 1
+    try:
+        while True:
+            job = inbox.get()
+            if job is None:
+                break
+            job_id, task_info, proxy = job
+            signals = _PipeSignals(conn, job_id)
+            try:
+                action_name = task_info.action.action_name
+                action_function = ACTION_MAP.get(action_name)
+                if not action_function:
+                    raise ValueError(f"Invalid action '{action_name}'")
+                # the parent holds the proxy pool lease, so no proxy_raw here
+                completed = browser_sessions.run(
+                    action_function,
+                    browser_info=task_info.browser_info,
+                    action_info=task_info.action,
+                    signals=signals,
+                    proxy=proxy,
+                )
+                if not completed:
+                    raise ValueError(f"Action '{action_name}' did not complete")
+            except Exception as e:
+                signals.error.emit(str(e))
+            finally:
+                signals.send("done", ())
+    finally:
+        browser_sessions.close_all()
+
+
+class ProcessBrowserJob:
+    """BrowserWorker's counterpart for ProcessRobotEngine (same signals)."""
+
+    def __init__(self, task_info: TaskInfo, retry_count: int, proxy_raw: str):
+        self.task_info = task_info
+        self.browser_info = task_info.browser_info
+        self.action_info = task_info.action
+        self.proxy_raw = proxy_raw
+        self.retry_count = retry_count
+        self.signals = WorkerSignals()
+        self.proxy = None
+
+
+class _WorkerProcess:
+    def __init__(self, index):
+        self.index = index
+        self.job = None
+        self.job_id = None
+        self.started_at = 0.0
+        self.spawn()
+
+    def spawn(self):
+        self.inbox = _mp.Queue()
+        self.conn, child_conn = _mp.Pipe(duplex=False)
+        self.process = _mp.Process(
+            target=_worker_main,
+            args=(self.inbox, child_conn),
+            name=f"RobotWorker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+        self.inbox.close()
+        self.inbox.cancel_join_thread()
+
+
+class ProcessRobotEngine:
+    """Runs browser jobs in worker processes, one job per process at a time.
+
+    Each process has its own job queue and event pipe. Events (log, error,
+    progress, done) are read by a parent thread and re-emitted on the job's
+    WorkerSignals. A process whose job exceeds task_timeout, or that dies, is
+    killed and respawned; the others keep running. An account sticks to one
+    process so its open browser session can be reused there.
+    """
+
+    def __init__(
+        self,
+        process_count=constants.ROBOT_PROCESS_COUNT,
+        task_timeout=constants.ROBOT_PROCESS_TASK_TIMEOUT,
+    ):
+        self.process_count = max(process_count, 1)
+        self.task_timeout = task_timeout
+        self._workers = []
+        self._pending = []
+        self._user_workers = {}
+        self._job_ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+
+    def _ensure_started(self):
+        # callers hold self._cond
+        if self._workers:
+            return
+        self._stopped = False
+        self._workers = [_WorkerProcess(index) for index in range(self.process_count)]
+        self._threads = [
+            threading.Thread(target=target, name=name, daemon=True)
+            for target, name in (
+                (self._dispatch_loop, "ProcessRobotEngine-dispatch"),
+                (self._event_loop, "ProcessRobotEngine-events"),
+            )
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def start(self, job: ProcessBrowserJob):
+        user_id = job.browser_info.user_id
+        if job.action_info.action_name == "<empty>":
+            job.signals.log_message.emit(f"[{user_id}] - action is empty: skipped.")
+            job.signals.finished.emit(job.task_info, job.retry_count, job.proxy_raw)
+            return
+        with self._cond:
+            self._ensure_started()
+        job.signals.log_message.emit(f"[{user_id}] Preparing ...")
+        if not job.proxy_raw:
+            self._queue(job)
+            return
+        # ProxyPool.acquire() blocks; don't hold up other jobs while it waits
+        threading.Thread(
+            target=self._acquire_proxy, args=(job,), name="ProcessRobotEngine-proxy"
+        ).start()
+
+    def _acquire_proxy(self, job: ProcessBrowserJob):
+        phases = PhaseTimer(job.signals)
+        phases.start("proxy_fetch")
+        job.proxy = proxy_pool.acquire(job.proxy_raw)
+        phases.stop()
+        if not job.proxy:
+            logger.error(f"[{job.browser_info.user_id}] No proxy available")
+            job.signals.error.emit(job.task_info, job.retry_count, "No proxy available")
+            job.signals.finished.emit(job.task_info, job.retry_count, job.proxy_raw)
+            return
+        job.signals.log_message.emit(
+            f"[{job.browser_info.user_id}] Fetched proxy: {job.proxy}"
+        )
+        self._queue(job)
+
+    def _queue(self, job: ProcessBrowserJob):
+        with self._cond:
+            self._pending.append(job)
+            self._cond.notify_all()
+
+    def _worker_for(self, job: ProcessBrowserJob):
+        user_id = job.browser_info.user_id
+        worker = self._user_workers.get(user_id)
+        if worker is not None:
+            return worker if worker.job is None else None
+        idle = [worker for worker in self._workers if worker.job is None]
+        if not idle:
+            return None
+        # spread accounts over processes
+        assigned = {}
+        for assigned_worker in self._user_workers.values():
+            assigned[assigned_worker.index] = assigned.get(assigned_worker.index, 0) + 1
+        worker = min(idle, key=lambda idle_worker: assigned.get(idle_worker.index, 0))
+        self._user_workers[user_id] = worker
+        return worker
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    for job in self._pending:
+                        worker = self._worker_for(job)
+                        if worker is not None:
+                            break
+                    else:
+                        self._cond.wait()
+                        continue
+                    break
+                if self._stopped:
+                    return
+                self._pending.remove(job)
+                worker.job = job
+                worker.job_id = next(self._job_ids)
+                worker.started_at = time.monotonic()
+                worker.inbox.put((worker.job_id, job.task_info, job.proxy))
+
+    def _event_loop(self):
+        while not self._stopped:
+            with self._cond:
+                conns = {worker.conn: worker for worker in self._workers}
+            try:
+                ready = wait(list(conns), timeout=1)
+            except OSError:
+                ready = []
+            for conn in ready:
+                worker = conns[conn]
+                try:
+                    job_id, name, args = conn.recv()
+                except (EOFError, OSError):
+                    # died; the watchdog below restarts it
+                    continue
+                self._handle_event(worker, job_id, name, args)
+            self._watchdog()
+
+    def _handle_event(self, worker: _WorkerProcess, job_id, name, args):
+        job = worker.job
+        if job is None or job_id != worker.job_id:
+            return
+        if name == "log_message":
+            job.signals.log_message.emit(*args)
+        elif name == "progress":
+            job.signals.progress.emit(*args)
+        elif name == "phase":
+            job.signals.phase.emit(*args)
+        elif name == "published":
+            job.signals.published.emit(*args)
+        elif name == "groups_found":
+            job.signals.groups_found.emit(*args)
+        elif name == "group_checked":
+            job.signals.group_checked.emit(*args)
+        elif name == "error":
+            job.signals.error.emit(job.task_info, job.retry_count, args[0])
+        elif name == "done":
+            self._complete(worker)
+
+    def _complete(self, worker: _WorkerProcess):
+        job = worker.job
+        with self._cond:
+            worker.job = None
+            worker.job_id = None
+            self._cond.notify_all()
+        if job.proxy:
+            proxy_pool.release(job.proxy_raw)
+        job.signals.finished.emit(job.task_info, job.retry_count, job.proxy_raw)
+
+    def _watchdog(self):
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.job is not None and now - worker.started_at > self.task_timeout:
+                self.restart_worker(worker.index, "Worker process timed out")
+            elif not worker.process.is_alive() and not self._stopped:
+                self.restart_worker(worker.index, "Worker process crashed")
+
+    def restart_worker(self, index, reason="Worker process restarted"):
+        """Kill one worker process (and its browsers) and start a fresh one."""
+        with self._cond:
+            if self._stopped or index >= len(self._workers):
+                return
+            worker = self._workers[index]
+            # its accounts' sessions are gone; let them go to any process
+            for user_id, user_worker in list(self._user_workers.items()):
+                if user_worker is worker:
+                    del self._user_workers[user_id]
+            # under the lock, so nothing is dispatched to the dead inbox
+            worker.kill()
+            worker.spawn()
+        job = worker.job
+        if job is not None:
+            job.signals.error.emit(job.task_info, job.retry_count, reason)
+            self._complete(worker)
+
+    def stop(self, timeout=10):
+        with self._cond:
+            if not self._workers:
+                return
+            self._stopped = True
+            workers = self._workers
+            self._workers = []
+            self._user_workers.clear()
+            self._cond.notify_all()
+        for worker in workers:
+            worker.inbox.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            worker.kill()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+process_engine = ProcessRobotEngine()
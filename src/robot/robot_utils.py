@@ -1,7 +1,7 @@
 import random
+import time
 from playwright.sync_api import Locator
 
-
 # def handle_type(
 #     locator: Locator, text: str, min_delay: float = 0.1, max_delay: float = 0.5
 # ):
@@ -14,3 +14,27 @@ def handle_type(
 ):
     for char in text:
         locator.type(char, delay=random.uniform(min_delay, max_delay) * 500)
+
+
+def group_url_key(url: str) -> str:
+    """A sidebar group href as kept in the post history: no query, no trailing /."""
+    return url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+
+
+class PhaseTimer:
+    """Times an action's consecutive phases; each one ends on signals.phase."""
+
+    def __init__(self, signals):
+        self.signals = signals
+        self.phase = None
+        self.started_at = 0.0
+
+    def start(self, phase: str):
+        self.stop()
+        self.phase = phase
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        if self.phase is not None:
+            self.signals.phase.emit(self.phase, time.perf_counter() - self.started_at)
+            self.phase = None
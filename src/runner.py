@@ -0,0 +1,208 @@
+# src/runner.py
+import argparse
+import json
+import os
+import sys
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from src.database.user_database import initialize_user_db
+from src.database.re_database import initialize_re_db
+from src.controllers.robot_controller import RobotController
+from src.services.user_service import UserService
+from src.services.robot_service import RobotService
+from src.robot.browser_session import browser_sessions
+from src.robot.async_engine import async_engine
+from src.robot.process_engine import process_engine
+
+try:
+    import yaml
+except ImportError:  # YAML plans are optional; JSON always works
+    yaml = None
+
+PLAN_HELP = """\
+plan file (JSON, or YAML when PyYAML is installed):
+
+{
+    "engine": "thread",            # optional, see constants.ROBOT_ENGINE
+    "thread_num": 4,
+    "max_retries": 5,
+    "headless": true,
+    "is_mobile": false,
+    "users": [1, 2, 3],            # user ids, or "all"
+    "actions": [                   # same fields as the PageRobot action tabs
+        {"action_name": "discussion", "mode": "random", "content": {}},
+        {"action_name": "marketplace", "mode": "pid", "content": "re.s.123"},
+        {"action_name": "discussion", "mode": "manual",
+         "content": {"title": "...", "description": "...", "image_paths": []}}
+    ],
+    "tasks": [                     # optional per-user action lists
+        {"user_id": 4, "priority": 0, "actions": [...]}
+    ]                              # priority: 0 high, 1 normal (default), 2 low
+}
+"""
+
+
+def load_plan(path):
+    with open(path, encoding="utf-8") as plan_file:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("YAML plans need PyYAML (pip install pyyaml).")
+            return yaml.safe_load(plan_file) or {}
+        return json.load(plan_file)
+
+
+def _normalize_actions(actions):
+    normalized = []
+    for action in actions or []:
+        action = dict(action)
+        content = action.get("content")
+        # the action tabs give image_paths as one comma separated string
+        if isinstance(content, dict) and isinstance(content.get("image_paths"), list):
+            content = dict(content)
+            content["image_paths"] = ",".join(content["image_paths"])
+            action["content"] = content
+        normalized.append(action)
+    return normalized
+
+
+def resolve_task_data(controller: RobotController, plan):
+    """Build RobotController.build_task() entries for every user in the plan."""
+    user_actions = {}
+    user_priorities = {}
+    users = plan.get("users") or []
+    if users == "all":
+        users = [user.get("id") for user in UserService.read_all()]
+    for user_id in users:
+        user_actions[user_id] = _normalize_actions(plan.get("actions"))
+    for task in plan.get("tasks") or []:
+        user_actions[task.get("user_id")] = _normalize_actions(task.get("actions"))
+        if task.get("priority") is not None:
+            user_priorities[task.get("user_id")] = int(task["priority"])
+
+    task_data = []
+    for user_id, actions in user_actions.items():
+        user = UserService.read(user_id)
+        if not user:
+            print(f"[{user_id}] User not found: skipped.")
+            continue
+        user_task = controller.build_task(user, actions)
+        if user_id in user_priorities:
+            user_task["priority"] = user_priorities[user_id]
+        task_data.append(user_task)
+    return task_data
+
+
+def print_summary(summary):
+    print(
+        f"Ran {summary['total']} tasks in {summary['elapsed']:.1f}s "
+        f"({summary['tasks_per_minute']:.1f} tasks/min): "
+        f"succeeded {summary['succeeded']} - failed {summary['failed']} - "
+        f"retries {summary['retries']}."
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a robot task plan without the GUI.",
+        epilog=PLAN_HELP,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("plan", nargs="?")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--engine", choices=["thread", "async", "process"])
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only print the resolved tasks"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the summary as one JSON line"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="first run the saved jobs a previous run left unfinished",
+    )
+    parser.add_argument(
+        "--refresh-groups",
+        action="store_true",
+        help="scrape the plan users' groups again instead of using the catalog",
+    )
+    args = parser.parse_args(argv)
+    if not args.plan and not args.resume:
+        parser.error("a plan file is required unless --resume is given")
+
+    plan = {}
+    if args.plan:
+        try:
+            plan = load_plan(args.plan)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load plan: {e}")
+            return 1
+
+    app = QCoreApplication(sys.argv[:1])
+    if not initialize_re_db():
+        print("Failed initialize re db")
+        return 1
+    if not initialize_user_db():
+        print("Failed initialize user db")
+        return 1
+
+    controller = RobotController()
+    tasks = controller.build_task_infos(
+        resolve_task_data(controller, plan),
+        is_mobile=bool(plan.get("is_mobile", False)),
+        headless=(
+            args.headless
+            if args.headless is not None
+            else bool(plan.get("headless", True))
+        ),
+    )
+    if args.dry_run or not (tasks or args.resume):
+        for task in tasks:
+            print(f"[{task.browser_info.user_id}] {task.action.action_name}")
+        print(f"{len(tasks)} tasks.")
+        return 0
+
+    if args.refresh_groups:
+        controller.refresh_groups(sorted({task.browser_info.user_id for task in tasks}))
+
+    robot_service = RobotService(
+        thread_num=args.threads or int(plan.get("thread_num", 1)),
+        max_retries=int(plan.get("max_retries", 5)),
+        engine=args.engine or plan.get("engine"),
+    )
+    summary = {}
+
+    def on_done(result):
+        summary.update(result)
+        app.quit()
+
+    robot_service.done.connect(on_done)
+    app.aboutToQuit.connect(browser_sessions.close_all)
+    app.aboutToQuit.connect(async_engine.stop)
+    app.aboutToQuit.connect(process_engine.stop)
+
+    def start():
+        if args.resume:
+            robot_service.resume_tasks()
+        robot_service.add_tasks(tasks=tasks)
+
+    # start once the event loop runs, so an instant finish can still quit it
+    QTimer.singleShot(0, start)
+    app.exec()
+
+    summary = summary or robot_service.summary()
+    if args.json:
+        summary["phases"] = {
+            phase: {"count": count, "avg": average, "total": total}
+            for phase, count, average, total in robot_service.metrics.phase_rows()
+        }
+        print(json.dumps(summary))
+    else:
+        print_summary(summary)
+        print(robot_service.metrics.format_phase_table())
+    return 1 if summary.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,18 @@
 # src/services/base_service.py
 import logging
+import re
 import sys
-from contextlib import contextmanager
-from PyQt6.QtSql import QSqlQuery, QSqlDatabase
+from src.services.query_engine import (
+    database,
+    db_transaction,
+    execute,
+    execute_many,
+    fetch_all,
+    fetch_one,
+    fetch_value,
+    notify_table_changed,
+)
+from src.services.settings_cache import settings_cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
@@ -15,71 +25,21 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 
 
-def record_to_dict(query: QSqlQuery) -> dict:
-    rec = query.record()
-    return {rec.fieldName(i): query.value(i) for i in range(rec.count())}
-
-
-def exec_query(db, query):
-    sql = query.lastQuery()
-    if not query.exec():
-        logger.info("Query bound values: %s", query.boundValues())
-        logger.error(
-            "Error executing SQL query: %s\nERROR message: %s",
-            sql,
-            query.lastError().text(),
-        )
-        db.rollback()
-        return False
-    return True
-
-
-def fetch_single_result(db, sql, bindings):
-    query = QSqlQuery(db)
-    if not query.prepare(sql):
-        logger.error(query.lastError().text())
+def fts_match_query(text):
+    """Turn free text into an FTS5 query: every word as a prefix, all required."""
+    if not text:
         return None
-    for key, value in bindings.items():
-        query.bindValue(f":{key}", value)
-    if not exec_query(db, query):
+    text = text.replace("đ", "d").replace("Đ", "D")
+    words = re.findall(r"\w+", text)
+    if not words:
         return None
-    if query.next():
-        return record_to_dict(query)
-    return None
-
-
-def is_affected(query):
-    rows_affected = query.numRowsAffected()
-    if rows_affected > 0:
-        logger.info("Updated %d record(s).", rows_affected)
-        return True
-    else:
-        sql = query.lastQuery()
-        logger.info("No records were updated. Query: %s", sql)
-        return False
-
-
-@contextmanager
-def db_transaction(db):
-    if not db.transaction():
-        logger.error("Failed to start transaction.")
-        yield False
-        return
-    try:
-        yield True
-    except Exception as e:
-        db.rollback()
-        logger.error("Transaction error: %s", e)
-        raise
-    else:
-        if not db.commit():
-            logger.error("Failed to commit transaction.")
-            db.rollback()
+    return " ".join(f'"{word}"*' for word in words)
 
 
 class BaseService:
     TABLE_NAME = None
     CONNECTION = None
+    FTS_TABLE = None
 
     @classmethod
     def get_columns(cls):
@@ -89,52 +49,26 @@ class BaseService:
 
     @classmethod
     def read(cls, record_id):
-        db = QSqlDatabase.database(cls.CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE id = :id"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        query.bindValue(":id", record_id)
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return record_to_dict(query)
-        return None
+        return fetch_one(cls.CONNECTION, sql, {"id": record_id})
 
     @classmethod
     def read_all(cls):
-        db = QSqlDatabase.database(cls.CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT * FROM {cls.TABLE_NAME}"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return []
-        if not exec_query(db, query):
-            return []
-        results = []
-        while query.next():
-            results.append(record_to_dict(query))
-        return results
+        return fetch_all(cls.CONNECTION, sql)
 
     @staticmethod
     def read_all_staticmethod(connection, table_name):
-        db = QSqlDatabase.database(connection)
-        query = QSqlQuery(db)
+        if connection == settings_cache.connection and settings_cache.is_cached_table(
+            table_name
+        ):
+            return settings_cache.records(table_name)
         sql = f"SELECT * FROM {table_name}"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return []
-        if not exec_query(db, query):
-            return []
-        results = []
-        while query.next():
-            results.append(record_to_dict(query))
-        return results
+        return fetch_all(connection, sql)
 
     @classmethod
     def create(cls, payload):
-        db = QSqlDatabase.database(cls.CONNECTION)
+        db = database(cls.CONNECTION)
         valid_columns = [col for col in cls.get_columns() if col in payload]
         if not valid_columns:
             logger.error("No valid columns provided for create.")
@@ -142,22 +76,19 @@ class BaseService:
         columns = ", ".join(valid_columns)
         placeholders = ", ".join([f":{col}" for col in valid_columns])
         sql = f"INSERT INTO {cls.TABLE_NAME} ({columns}) VALUES ({placeholders})"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for col in valid_columns:
-            query.bindValue(f":{col}", payload[col])
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            if not execute(
+                cls.CONNECTION, sql, {col: payload[col] for col in valid_columns}
+            ):
                 return False
+        notify_table_changed(cls.TABLE_NAME)
         return True
 
     @classmethod
     def update(cls, record_id, payload):
-        db = QSqlDatabase.database(cls.CONNECTION)
+        db = database(cls.CONNECTION)
         valid_columns = [
             col for col in cls.get_columns() if col != "id" and col in payload
         ]
@@ -170,34 +101,108 @@ class BaseService:
             "updated_at = (strftime('%Y-%m-%d %H:%M:%S', 'now')) "
             "WHERE id = :id"
         )
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for col in valid_columns:
-            query.bindValue(f":{col}", payload[col])
-        query.bindValue(":id", record_id)
+        bindings = {col: payload[col] for col in valid_columns}
+        bindings["id"] = record_id
+        with db_transaction(db) as ok:
+            if not ok:
+                return False
+            if not execute(cls.CONNECTION, sql, bindings):
+                return False
+        notify_table_changed(cls.TABLE_NAME)
+        return True
+
+    @classmethod
+    def create_many(cls, payloads):
+        """Insert all payloads in one transaction.
+
+        Payloads sharing the same set of columns are sent as one execBatch(),
+        so a column a payload leaves out keeps its DEFAULT.
+        Returns the list of inserted ids (in payload order) or None on failure.
+        """
+        payloads = list(payloads)
+        if not payloads:
+            return []
+        db = database(cls.CONNECTION)
+        groups = {}
+        for index, payload in enumerate(payloads):
+            valid_columns = tuple(
+                col for col in cls.get_columns() if col != "id" and col in payload
+            )
+            if not valid_columns:
+                logger.error("No valid columns provided for create.")
+                return None
+            row = {col: payload[col] for col in valid_columns}
+            groups.setdefault(valid_columns, []).append((index, row))
+        record_ids = [None] * len(payloads)
         with db_transaction(db) as ok:
             if not ok:
+                return None
+            for valid_columns, indexed_rows in groups.items():
+                columns = ", ".join(valid_columns)
+                placeholders = ", ".join([f":{col}" for col in valid_columns])
+                sql = (
+                    f"INSERT INTO {cls.TABLE_NAME} ({columns}) VALUES ({placeholders})"
+                )
+                rows = [row for _, row in indexed_rows]
+                if not execute_many(cls.CONNECTION, sql, rows):
+                    return None
+                # The write lock is held for the whole transaction, so the
+                # rowids handed out by this batch are contiguous.
+                last_id = fetch_value(cls.CONNECTION, "SELECT last_insert_rowid()")
+                if last_id is None:
+                    db.rollback()
+                    return None
+                first_id = last_id - len(rows) + 1
+                for offset, (index, _) in enumerate(indexed_rows):
+                    record_ids[index] = first_id + offset
+        notify_table_changed(cls.TABLE_NAME)
+        return record_ids
+
+    @classmethod
+    def update_many(cls, payloads_by_id):
+        """Apply {record_id: payload} updates in one transaction.
+
+        Payloads sharing the same set of columns are sent as one execBatch().
+        """
+        if not payloads_by_id:
+            return True
+        db = database(cls.CONNECTION)
+        groups = {}
+        for record_id, payload in payloads_by_id.items():
+            valid_columns = tuple(
+                col for col in cls.get_columns() if col != "id" and col in payload
+            )
+            if not valid_columns:
+                logger.error("No valid columns provided for update.")
                 return False
-            if not exec_query(db, query):
+            row = {col: payload[col] for col in valid_columns}
+            row["id"] = record_id
+            groups.setdefault(valid_columns, []).append(row)
+        with db_transaction(db) as ok:
+            if not ok:
                 return False
+            for valid_columns, rows in groups.items():
+                set_clause = ", ".join([f"{col} = :{col}" for col in valid_columns])
+                sql = (
+                    f"UPDATE {cls.TABLE_NAME} SET {set_clause}, "
+                    "updated_at = (strftime('%Y-%m-%d %H:%M:%S', 'now')) "
+                    "WHERE id = :id"
+                )
+                if not execute_many(cls.CONNECTION, sql, rows):
+                    return False
+        notify_table_changed(cls.TABLE_NAME)
         return True
 
     @classmethod
     def delete(cls, record_id):
-        db = QSqlDatabase.database(cls.CONNECTION)
+        db = database(cls.CONNECTION)
         sql = f"DELETE FROM {cls.TABLE_NAME} WHERE id = :id"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":id", record_id)
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            if not execute(cls.CONNECTION, sql, {"id": record_id}):
                 return False
+        notify_table_changed(cls.TABLE_NAME)
         return True
 
     @classmethod
@@ -205,55 +210,46 @@ class BaseService:
         if not record_ids:
             return True
 
-        db = QSqlDatabase.database(cls.CONNECTION)
+        db = database(cls.CONNECTION)
         with db_transaction(db) as ok:
             if not ok:
                 return False
 
             placeholders = ", ".join("?" * len(record_ids))
             sql = f"DELETE FROM {cls.TABLE_NAME} WHERE id IN ({placeholders})"
-            query = QSqlQuery(db)
-
-            if not query.prepare(sql):
-                logger.error(query.lastError().text())
+            if not execute(cls.CONNECTION, sql, list(record_ids)):
                 return False
+        notify_table_changed(cls.TABLE_NAME)
+        return True
 
-            for i, record_id in enumerate(record_ids):
-                query.bindValue(i, record_id)
-
-            if not exec_query(db, query):
-                return False
-            return True
+    @classmethod
+    def search(cls, text, limit=50):
+        """Rows of TABLE_NAME matching text in FTS_TABLE, best match first."""
+        match_query = fts_match_query(text)
+        if cls.FTS_TABLE is None or match_query is None:
+            return []
+        sql = (
+            f"SELECT main.* FROM {cls.FTS_TABLE} "
+            f"JOIN {cls.TABLE_NAME} main ON main.id = {cls.FTS_TABLE}.rowid "
+            f"WHERE {cls.FTS_TABLE} MATCH :query ORDER BY rank LIMIT :limit"
+        )
+        return fetch_all(cls.CONNECTION, sql, {"query": match_query, "limit": limit})
 
     @classmethod
     def is_value_existed(cls, condition):
-        db = QSqlDatabase.database(cls.CONNECTION)
-        query = QSqlQuery(db)
         key, value = next(iter(condition.items()))
         sql = f"SELECT COUNT(*) FROM {cls.TABLE_NAME} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
+        count = fetch_value(cls.CONNECTION, sql, {"value": value})
+        return bool(count) and count > 0
 
     @staticmethod
     def get_label_vi_staticmethod(connection, table_name, record_id):
-        db = QSqlDatabase.database(connection)
-        query = QSqlQuery(db)
-        sql = f"SELECT label_vi FROM {table_name} WHERE id = {record_id}"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return query.value(0)
-        return None
+        if connection == settings_cache.connection and settings_cache.is_cached_table(
+            table_name
+        ):
+            return settings_cache.label_vi(table_name, record_id)
+        sql = f"SELECT label_vi FROM {table_name} WHERE id = :id"
+        return fetch_value(connection, sql, {"id": record_id})
 
 
 # def read_all_staticmethod(connection, table_name):
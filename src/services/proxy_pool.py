@@ -0,0 +1,198 @@
+# src/services/proxy_pool.py
+import logging
+import sys
+import threading
+import time
+
+from src import constants
+from src.my_types import ProxyCheckResult
+from src.services.user_service import UserProxyHealthService
+from src.utils.robot_handler import check_proxies, fetch_proxies, proxy_to_url
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+
+class _Slot:
+    __slots__ = ("proxy", "fetched_at", "retry_at", "users", "fetching")
+
+    def __init__(self):
+        self.proxy = None
+        self.fetched_at = 0.0
+        self.retry_at = 0.0
+        self.users = 0
+        self.fetching = False
+
+
+class ProxyPool:
+    """Keeps one fetched and health-checked proxy ready per rotation endpoint.
+
+    A background thread asks every endpoint that has no fresh proxy at once
+    (CurlMulti), checks the results the same way and records them with
+    UserProxyHealthService. acquire() hands the ready proxy out immediately;
+    while an endpoint has users, later acquire() calls share its proxy and it
+    is never rotated under a running browser. Once the last user releases it,
+    a fresh proxy is fetched for the next one.
+    """
+
+    def __init__(
+        self,
+        ttl=constants.PROXY_POOL_TTL,
+        retry_delay=constants.PROXY_POOL_RETRY_DELAY,
+        health_check=True,
+    ):
+        self.ttl = ttl
+        self.retry_delay = retry_delay
+        self.health_check = health_check
+        self._slots = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def prewarm(self, proxy_raws):
+        with self._cond:
+            for proxy_raw in proxy_raws:
+                self._slots.setdefault(proxy_raw, _Slot())
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def acquire(self, proxy_raw, timeout=constants.PROXY_ACQUIRE_TIMEOUT):
+        """Ready proxy dict for proxy_raw, waiting up to timeout; None if none."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            slot = self._slots.setdefault(proxy_raw, _Slot())
+            self._ensure_thread()
+            self._cond.notify_all()
+            while True:
+                now = time.monotonic()
+                if slot.proxy is not None and (
+                    slot.users or not self._is_expired(slot, now)
+                ):
+                    slot.users += 1
+                    return slot.proxy
+                remaining = deadline - now
+                if remaining <= 0 or self._stopped:
+                    return None
+                self._cond.wait(remaining)
+
+    def release(self, proxy_raw):
+        with self._cond:
+            slot = self._slots.get(proxy_raw)
+            if slot is None or not slot.users:
+                return
+            slot.users -= 1
+            if not slot.users:
+                # used up; the next user gets a freshly rotated proxy
+                slot.proxy = None
+            self._cond.notify_all()
+
+    def ready_count(self):
+        now = time.monotonic()
+        with self._cond:
+            return sum(
+                1
+                for slot in self._slots.values()
+                if slot.proxy is not None
+                and not slot.users
+                and not self._is_expired(slot, now)
+            )
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=constants.PROXY_FETCH_TIMEOUT)
+
+    def _is_expired(self, slot, now):
+        return now - slot.fetched_at > self.ttl
+
+    def _ensure_thread(self):
+        # callers hold self._cond
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="ProxyPool", daemon=True
+        )
+        self._thread.start()
+
+    def _due(self, now):
+        return [
+            proxy_raw
+            for proxy_raw, slot in self._slots.items()
+            if not slot.users
+            and not slot.fetching
+            and now >= slot.retry_at
+            and (slot.proxy is None or self._is_expired(slot, now))
+        ]
+
+    def _next_wakeup(self, now):
+        times = []
+        for slot in self._slots.values():
+            if slot.users or slot.fetching:
+                continue
+            if slot.proxy is not None:
+                times.append(slot.fetched_at + self.ttl)
+            else:
+                times.append(slot.retry_at)
+        return max(min(times) - now, 0.05) if times else None
+
+    def _refresh_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    due = self._due(time.monotonic())
+                    if due:
+                        break
+                    self._cond.wait(self._next_wakeup(time.monotonic()))
+                if self._stopped:
+                    return
+                for proxy_raw in due:
+                    self._slots[proxy_raw].fetching = True
+            results = {}
+            try:
+                proxies = fetch_proxies(due)
+                checks = {}
+                if self.health_check:
+                    checks = check_proxies(
+                        [proxy_to_url(proxy) for proxy in proxies.values() if proxy]
+                    )
+                for proxy_raw in due:
+                    proxy = proxies.get(proxy_raw)
+                    if not proxy:
+                        results[proxy_raw] = ProxyCheckResult(
+                            False, error="No proxy from rotation endpoint"
+                        )
+                    elif self.health_check:
+                        results[proxy_raw] = checks[proxy_to_url(proxy)]
+                    else:
+                        results[proxy_raw] = ProxyCheckResult(True)
+                if self.health_check:
+                    UserProxyHealthService.record_checks(results)
+            except Exception as e:
+                logger.error(f"Error refreshing proxies: {e}")
+            with self._cond:
+                now = time.monotonic()
+                for proxy_raw in due:
+                    slot = self._slots[proxy_raw]
+                    slot.fetching = False
+                    result = results.get(proxy_raw)
+                    if result is not None and result.is_ok:
+                        slot.proxy = proxies[proxy_raw]
+                        slot.fetched_at = now
+                    else:
+                        slot.proxy = None
+                        slot.retry_at = now + self.retry_delay
+                self._cond.notify_all()
+
+
+proxy_pool = ProxyPool()
@@ -0,0 +1,269 @@
+# src/services/query_engine.py
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from PyQt6.QtSql import QSqlQuery, QSqlDatabase
+from src.database.connection_manager import connection_manager
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+MAX_CACHED_STATEMENTS = 256
+
+# QSqlQuery objects belong to the thread that created them, so every thread
+# keeps its own statement cache (keyed by thread ident, see connection_manager).
+_statements_by_thread = {}
+
+# callbacks notified with the table name after a successful write
+_table_listeners = []
+
+
+class _Statement:
+    __slots__ = ("query", "field_names")
+
+    def __init__(self, query: QSqlQuery):
+        self.query = query
+        self.field_names = None
+
+
+def _statements() -> OrderedDict:
+    thread_id = threading.get_ident()
+    statements = _statements_by_thread.get(thread_id)
+    if statements is None:
+        statements = OrderedDict()
+        _statements_by_thread[thread_id] = statements
+    return statements
+
+
+def database(connection) -> QSqlDatabase:
+    # GUI thread: the named connection; worker threads: a per-thread clone
+    return connection_manager.database(connection)
+
+
+def clear_statement_cache(connection=None):
+    statements = _statements()
+    if connection is None:
+        for statement in statements.values():
+            statement.query.finish()
+        statements.clear()
+        return
+    for key in [key for key in statements if key[0] == connection]:
+        statements.pop(key).query.finish()
+
+
+# cached queries must go before their clone leaves the thread
+connection_manager.add_release_callback(clear_statement_cache)
+
+
+def add_table_listener(callback):
+    if callback not in _table_listeners:
+        _table_listeners.append(callback)
+
+
+def remove_table_listener(callback):
+    if callback in _table_listeners:
+        _table_listeners.remove(callback)
+
+
+def notify_table_changed(table_name):
+    for callback in list(_table_listeners):
+        try:
+            callback(table_name)
+        except Exception as e:
+            logger.error("Table listener failed for '%s': %s", table_name, e)
+
+
+def prepare(db: QSqlDatabase, sql: str):
+    statements = _statements()
+    key = (db.connectionName(), sql)
+    statement = statements.get(key)
+    if statement is not None:
+        statements.move_to_end(key)
+        return statement
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    if not query.prepare(sql):
+        logger.error(query.lastError().text())
+        return None
+    statement = _Statement(query)
+    statements[key] = statement
+    if len(statements) > MAX_CACHED_STATEMENTS:
+        _, evicted = statements.popitem(last=False)
+        evicted.query.finish()
+    return statement
+
+
+def bind(query: QSqlQuery, bindings):
+    if not bindings:
+        return
+    if isinstance(bindings, dict):
+        for key, value in bindings.items():
+            query.bindValue(f":{key}", value)
+    else:
+        for index, value in enumerate(bindings):
+            query.bindValue(index, value)
+
+
+def field_names(query: QSqlQuery) -> list:
+    rec = query.record()
+    return [rec.fieldName(i) for i in range(rec.count())]
+
+
+def record_to_dict(query: QSqlQuery, names=None) -> dict:
+    if names is None:
+        names = field_names(query)
+    return {name: query.value(i) for i, name in enumerate(names)}
+
+
+def exec_query(db, query):
+    sql = query.lastQuery()
+    if not query.exec():
+        logger.info("Query bound values: %s", query.boundValues())
+        logger.error(
+            "Error executing SQL query: %s\nERROR message: %s",
+            sql,
+            query.lastError().text(),
+        )
+        db.rollback()
+        return False
+    return True
+
+
+def _run(connection, sql, bindings):
+    db = database(connection)
+    statement = prepare(db, sql)
+    if statement is None:
+        return None
+    bind(statement.query, bindings)
+    if not exec_query(db, statement.query):
+        return None
+    if statement.field_names is None and statement.query.isSelect():
+        statement.field_names = field_names(statement.query)
+    return statement
+
+
+def fetch_one(connection, sql, bindings=None):
+    statement = _run(connection, sql, bindings)
+    if statement is None:
+        return None
+    query = statement.query
+    result = None
+    if query.next():
+        result = record_to_dict(query, statement.field_names)
+    query.finish()
+    return result
+
+
+def fetch_all(connection, sql, bindings=None):
+    statement = _run(connection, sql, bindings)
+    if statement is None:
+        return []
+    query = statement.query
+    names = statement.field_names
+    results = []
+    while query.next():
+        results.append(record_to_dict(query, names))
+    query.finish()
+    return results
+
+
+def fetch_value(connection, sql, bindings=None):
+    statement = _run(connection, sql, bindings)
+    if statement is None:
+        return None
+    query = statement.query
+    result = query.value(0) if query.next() else None
+    query.finish()
+    return result
+
+
+def fetch_column(connection, sql, bindings=None):
+    statement = _run(connection, sql, bindings)
+    if statement is None:
+        return []
+    query = statement.query
+    results = []
+    while query.next():
+        results.append(query.value(0))
+    query.finish()
+    return results
+
+
+def execute(connection, sql, bindings=None):
+    """Run a write statement; returns the executed query or None on failure.
+
+    The returned query is the cached statement, so read numRowsAffected() or
+    lastInsertId() from it before issuing the next call with the same SQL.
+    """
+    statement = _run(connection, sql, bindings)
+    if statement is None:
+        return None
+    return statement.query
+
+
+def execute_many(connection, sql, rows):
+    """Run one statement for every row of bindings through QSqlQuery.execBatch().
+
+    Rows are dicts keyed by placeholder name or sequences in placeholder order.
+    """
+    rows = list(rows)
+    if not rows:
+        return None
+    db = database(connection)
+    statement = prepare(db, sql)
+    if statement is None:
+        return None
+    query = statement.query
+    if isinstance(rows[0], dict):
+        for key in rows[0]:
+            query.bindValue(f":{key}", [row.get(key) for row in rows])
+    else:
+        for index in range(len(rows[0])):
+            query.bindValue(index, [row[index] for row in rows])
+    if not query.execBatch():
+        logger.error(
+            "Error executing SQL batch: %s\nERROR message: %s",
+            sql,
+            query.lastError().text(),
+        )
+        db.rollback()
+        return None
+    return query
+
+
+def is_affected(query):
+    rows_affected = query.numRowsAffected()
+    if rows_affected > 0:
+        logger.info("Updated %d record(s).", rows_affected)
+        return True
+    else:
+        sql = query.lastQuery()
+        logger.info("No records were updated. Query: %s", sql)
+        return False
+
+
+@contextmanager
+def db_transaction(db):
+    if not db.transaction():
+        logger.error("Failed to start transaction.")
+        yield False
+        return
+    try:
+        yield True
+    except Exception as e:
+        db.rollback()
+        logger.error("Transaction error: %s", e)
+        raise
+    else:
+        if not db.commit():
+            logger.error("Failed to commit transaction.")
+            db.rollback()
@@ -0,0 +1,108 @@
+# src/services/random_sampler.py
+import bisect
+import random
+import threading
+from collections import deque
+from itertools import accumulate
+
+from src.services.query_engine import add_table_listener, fetch_all
+
+
+class _Pool:
+    __slots__ = ("ids", "cum_weights")
+
+    def __init__(self, ids, weights):
+        self.ids = ids
+        self.cum_weights = list(accumulate(weights)) if weights else None
+
+
+class IdPoolSampler:
+    """Random id picks from per-key id pools kept in memory.
+
+    pool_sql selects ``id`` (and ``weight`` when weighted) filtered by the
+    ``:key`` binding. Pools load on first use and are dropped when a write to
+    table_name goes through the query engine. With no_repeat > 0 the last
+    no_repeat picks of a key are avoided while the pool has other ids; that
+    history outlives the pool reloads.
+    """
+
+    def __init__(self, connection, table_name, pool_sql, weighted=False, no_repeat=0):
+        self.connection = connection
+        self.table_name = table_name
+        self.pool_sql = pool_sql
+        self.weighted = weighted
+        self.no_repeat = no_repeat
+        self._pools = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+        add_table_listener(self._on_table_changed)
+
+    def _on_table_changed(self, table_name):
+        if table_name == self.table_name:
+            self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._pools.clear()
+
+    def set_no_repeat(self, no_repeat):
+        with self._lock:
+            self.no_repeat = no_repeat
+            self._recent = {
+                key: deque(recent, maxlen=no_repeat)
+                for key, recent in self._recent.items()
+                if no_repeat
+            }
+
+    def _pool(self, key) -> _Pool:
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        rows = fetch_all(self.connection, self.pool_sql, {"key": key})
+        ids = [row.get("id") for row in rows]
+        weights = None
+        if self.weighted:
+            weights = [max(float(row.get("weight") or 0), 0.0) for row in rows]
+            if not any(weights):
+                weights = None
+        pool = _Pool(ids, weights)
+        self._pools[key] = pool
+        recent = self._recent.get(key)
+        if recent:
+            # ids that left the pool can't be drawn and would only shrink it
+            pool_ids = set(ids)
+            self._recent[key] = deque(
+                (record_id for record_id in recent if record_id in pool_ids),
+                maxlen=self.no_repeat,
+            )
+        return pool
+
+    def _draw(self, pool):
+        if pool.cum_weights:
+            total = pool.cum_weights[-1]
+            index = bisect.bisect(pool.cum_weights, random.random() * total)
+            return pool.ids[min(index, len(pool.ids) - 1)]
+        return pool.ids[random.randrange(len(pool.ids))]
+
+    def pick(self, key):
+        with self._lock:
+            pool = self._pool(key)
+            if not pool.ids:
+                return None
+            if not self.no_repeat:
+                return self._draw(pool)
+            recent = self._recent.setdefault(key, deque(maxlen=self.no_repeat))
+            record_id = self._draw(pool)
+            if record_id in recent and len(pool.ids) > len(recent):
+                # a few cheap retries, then fall back to the non-recent ids
+                for _ in range(8):
+                    record_id = self._draw(pool)
+                    if record_id not in recent:
+                        break
+                else:
+                    recent_ids = set(recent)
+                    record_id = random.choice(
+                        [pool_id for pool_id in pool.ids if pool_id not in recent_ids]
+                    )
+            recent.append(record_id)
+            return record_id
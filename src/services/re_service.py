@@ -3,10 +3,21 @@ import logging
 import sys
 import os
 import uuid
-from contextlib import contextmanager
-from PyQt6.QtSql import QSqlQuery, QSqlDatabase
 from src import constants
 from src.services.base_service import BaseService
+from src.services.random_sampler import IdPoolSampler
+from src.services.settings_cache import PRODUCT_FOREIGN_KEYS, settings_cache
+from src.services.query_engine import (
+    database,
+    db_transaction,
+    execute,
+    fetch_all,
+    fetch_column,
+    fetch_one,
+    fetch_value,
+    is_affected,
+    notify_table_changed,
+)
 from src.utils import file_handler
 
 logger = logging.getLogger(__name__)
@@ -20,176 +31,20 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 
 
-def record_to_dict(query: QSqlQuery) -> dict:
-    rec = query.record()
-    return {rec.fieldName(i): query.value(i) for i in range(rec.count())}
-
-
-def exec_query(db, query):
-    sql = query.lastQuery()
-    if not query.exec():
-        logger.info("Query bound values: %s", query.boundValues())
-        logger.error(
-            "Error executing SQL query: %s\nERROR message: %s",
-            sql,
-            query.lastError().text(),
-        )
-        db.rollback()
-        return False
-    return True
-
-
-def fetch_single_result(db, sql, bindings):
-    query = QSqlQuery(db)
-    if not query.prepare(sql):
-        logger.error(query.lastError().text())
-        return None
-    for key, value in bindings.items():
-        query.bindValue(f":{key}", value)
-    if not exec_query(db, query):
-        return None
-    if query.next():
-        return record_to_dict(query)
-    return None
-
-
-def is_affected(query):
-    rows_affected = query.numRowsAffected()
-    if rows_affected > 0:
-        logger.info("Updated %d record(s).", rows_affected)
-        return True
-    else:
-        sql = query.lastQuery()
-        logger.info("No records were updated. Query: %s", sql)
-        return False
-
-
-@contextmanager
-def db_transaction(db):
-    if not db.transaction():
-        logger.error("Failed to start transaction.")
-        yield False
-        return
-    try:
-        yield True
-    except Exception as e:
-        db.rollback()
-        logger.error("Transaction error: %s", e)
-        raise
-    else:
-        if not db.commit():
-            logger.error("Failed to commit transaction.")
-            db.rollback()
-
-
-class REProductService:
-    @staticmethod
-    def get_columns():
-        return [
-            "id",
-            "pid",
-            "street",
-            "area",
-            "structure",
-            "function",
-            "description",
-            "price",
-            "status_id",
-            "province_id",
-            "district_id",
-            "ward_id",
-            "option_id",
-            "category_id",
-            "building_line_id",
-            "furniture_id",
-            "legal_id",
-            "created_at",
-            "updated_at",
-        ]
-
-    @staticmethod
-    def read(record_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        sql = f"""
-SELECT 
-    main.id,
-    main.pid,
-    main.street,
-    main.area,
-    main.structure,
-    main.function,
-    main.description,
-    main.price,
-    main.updated_at,
-    statuses.label_vi AS status,
-    provinces.label_vi AS province,
-    districts.label_vi AS district,
-    wards.label_vi AS ward,
-    options.label_vi AS option,
-    categories.label_vi AS category,
-    building_line_s.label_vi AS building_line,
-    furniture_s.label_vi AS furniture,
-    legal_s.label_vi AS legal,
-    main.created_at,
-    main.updated_at
-FROM {constants.TABLE_RE} main
-JOIN {constants.TABLE_RE_SETTINGS_STATUSES} statuses ON main.status_id = statuses.id
-JOIN {constants.TABLE_RE_SETTINGS_PROVINCES} provinces ON main.province_id = provinces.id
-JOIN {constants.TABLE_RE_SETTINGS_DISTRICTS} districts ON main.district_id = districts.id
-JOIN {constants.TABLE_RE_SETTINGS_WARDS} wards ON main.ward_id = wards.id
-JOIN {constants.TABLE_RE_SETTINGS_OPTIONS} options ON main.option_id = options.id
-JOIN {constants.TABLE_RE_SETTINGS_CATEGORIES} categories ON main.category_id = categories.id
-JOIN {constants.TABLE_RE_SETTINGS_BUILDING_LINES} building_line_s ON main.building_line_id = building_line_s.id
-JOIN {constants.TABLE_RE_SETTINGS_FURNITURES} furniture_s ON main.furniture_id = furniture_s.id
-JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
-WHERE main.id = :id
-"""
-        return fetch_single_result(db, sql, {"id": record_id})
-
-    @staticmethod
-    def read_by_pid(pid):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        sql = f"""
-SELECT 
-    main.id,
-    main.pid,
-    main.street,
-    main.area,
-    main.structure,
-    main.function,
-    main.description,
-    main.price,
-    main.updated_at,
-    statuses.label_vi AS status,
-    provinces.label_vi AS province,
-    districts.label_vi AS district,
-    wards.label_vi AS ward,
-    options.label_vi AS option,
-    categories.label_vi AS category,
-    building_line_s.label_vi AS building_line,
-    furniture_s.label_vi AS furniture,
-    legal_s.label_vi AS legal,
-    main.created_at,
-    main.updated_at
-FROM {constants.TABLE_RE} main
-JOIN {constants.TABLE_RE_SETTINGS_STATUSES} statuses ON main.status_id = statuses.id
-JOIN {constants.TABLE_RE_SETTINGS_PROVINCES} provinces ON main.province_id = provinces.id
-JOIN {constants.TABLE_RE_SETTINGS_DISTRICTS} districts ON main.district_id = districts.id
-JOIN {constants.TABLE_RE_SETTINGS_WARDS} wards ON main.ward_id = wards.id
-JOIN {constants.TABLE_RE_SETTINGS_OPTIONS} options ON main.option_id = options.id
-JOIN {constants.TABLE_RE_SETTINGS_CATEGORIES} categories ON main.category_id = categories.id
-JOIN {constants.TABLE_RE_SETTINGS_BUILDING_LINES} building_line_s ON main.building_line_id = building_line_s.id
-JOIN {constants.TABLE_RE_SETTINGS_FURNITURES} furniture_s ON main.furniture_id = furniture_s.id
-JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
-WHERE main.pid = :pid
-"""
-        return fetch_single_result(db, sql, {"pid": pid})
-
-    @staticmethod
-    def read_raw(record_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        sql = f"""
-SELECT 
+PRODUCT_BASE_COLUMNS = [
+    "id",
+    "pid",
+    "street",
+    "area",
+    "structure",
+    "function",
+    "description",
+    "price",
+    "updated_at",
+]
+
+PRODUCT_RAW_SELECT = f"""
+SELECT
     main.id,
     main.pid,
     main.street,
@@ -208,19 +63,12 @@ SELECT
     main.building_line_id,
     main.furniture_id,
     main.legal_id,
-    main.created_at,
-    main.updated_at
+    main.created_at
 FROM {constants.TABLE_RE} main
-WHERE main.id = :id
 """
-        return fetch_single_result(db, sql, {"id": record_id})
 
-    @staticmethod
-    def read_all():
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        sql = f"""
-SELECT 
+PRODUCT_JOINED_SELECT = f"""
+SELECT
     main.id,
     main.pid,
     main.street,
@@ -239,8 +87,7 @@ SELECT
     building_line_s.label_vi AS building_line,
     furniture_s.label_vi AS furniture,
     legal_s.label_vi AS legal,
-    main.created_at,
-    main.updated_at
+    main.created_at
 FROM {constants.TABLE_RE} main
 JOIN {constants.TABLE_RE_SETTINGS_STATUSES} statuses ON main.status_id = statuses.id
 JOIN {constants.TABLE_RE_SETTINGS_PROVINCES} provinces ON main.province_id = provinces.id
@@ -252,20 +99,117 @@ JOIN {constants.TABLE_RE_SETTINGS_BUILDING_LINES} building_line_s ON main.buildi
 JOIN {constants.TABLE_RE_SETTINGS_FURNITURES} furniture_s ON main.furniture_id = furniture_s.id
 JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
 """
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return []
-        if not exec_query(db, query):
-            return []
+
+
+class REProductService(BaseService):
+    TABLE_NAME = constants.TABLE_RE
+    CONNECTION = constants.RE_CONNECTION
+    FTS_TABLE = constants.TABLE_RE_FTS
+    # "cache": select raw table_re columns and resolve labels via settings_cache
+    # "join": resolve labels in SQL by joining the nine settings tables
+    READ_MODE = "cache"
+    SAMPLER = IdPoolSampler(
+        constants.RE_CONNECTION,
+        constants.TABLE_RE,
+        f"SELECT id FROM {constants.TABLE_RE} WHERE option_id = :key AND status_id = 1",
+        no_repeat=constants.RE_RANDOM_PRODUCT_NO_REPEAT,
+    )
+
+    @staticmethod
+    def get_columns():
+        return [
+            "id",
+            "pid",
+            "street",
+            "area",
+            "structure",
+            "function",
+            "description",
+            "price",
+            "status_id",
+            "province_id",
+            "district_id",
+            "ward_id",
+            "option_id",
+            "category_id",
+            "building_line_id",
+            "furniture_id",
+            "legal_id",
+            "created_at",
+            "updated_at",
+        ]
+
+    @staticmethod
+    def read(record_id):
+        return REProductService._read_one("main.id = :id", {"id": record_id})
+
+    @staticmethod
+    def read_by_pid(pid):
+        return REProductService._read_one("main.pid = :pid", {"pid": pid})
+
+    @staticmethod
+    def read_raw(record_id):
+        sql = f"{PRODUCT_RAW_SELECT} WHERE main.id = :id"
+        return fetch_one(constants.RE_CONNECTION, sql, {"id": record_id})
+
+    @staticmethod
+    def read_all():
+        return REProductService._read_many()
+
+    @classmethod
+    def _read_one(cls, where, bindings, suffix=""):
+        if cls.READ_MODE == "join":
+            sql = f"{PRODUCT_JOINED_SELECT} WHERE {where} {suffix}"
+            return fetch_one(constants.RE_CONNECTION, sql, bindings)
+        sql = f"{PRODUCT_RAW_SELECT} WHERE {where} {suffix}"
+        row = fetch_one(constants.RE_CONNECTION, sql, bindings)
+        return cls.resolve_labels(row) if row else None
+
+    @classmethod
+    def _read_many(cls, where=None, bindings=None):
+        sql = PRODUCT_JOINED_SELECT if cls.READ_MODE == "join" else PRODUCT_RAW_SELECT
+        if where:
+            sql = f"{sql} WHERE {where}"
+        rows = fetch_all(constants.RE_CONNECTION, sql, bindings)
+        if cls.READ_MODE == "join":
+            return rows
+        label_maps = cls._label_maps()
         results = []
-        while query.next():
-            results.append(record_to_dict(query))
+        for row in rows:
+            product = cls.resolve_labels(row, label_maps)
+            if product is not None:
+                results.append(product)
         return results
 
+    @staticmethod
+    def _label_maps():
+        return [
+            (fk_field, fk_field[: -len("_id")], settings_cache.label_map(table_name))
+            for fk_field, table_name in PRODUCT_FOREIGN_KEYS.items()
+        ]
+
+    @staticmethod
+    def resolve_labels(row, label_maps=None):
+        """Turn a raw table_re row into the labelled shape of the JOIN query.
+
+        Returns None when a foreign key has no settings record, the same rows
+        the inner JOIN drops.
+        """
+        if label_maps is None:
+            label_maps = REProductService._label_maps()
+        product = {column: row[column] for column in PRODUCT_BASE_COLUMNS}
+        for fk_field, label_key, labels in label_maps:
+            record_id = row[fk_field]
+            if record_id not in labels:
+                return None
+            product[label_key] = labels[record_id]
+        product["created_at"] = row["created_at"]
+        return product
+
     @staticmethod
     def create(payload):
         print("payload: ", payload)
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
+        db = database(constants.RE_CONNECTION)
         valid_columns = [k for k in payload if k in REProductService.get_columns()]
         if not valid_columns:
             logger.error("No valid columns provided for create.")
@@ -273,12 +217,6 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
         columns = ", ".join(valid_columns)
         placeholders = ", ".join([f":{k}" for k in valid_columns])
         sql = f"INSERT INTO {constants.TABLE_RE} ({columns}) VALUES ({placeholders})"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for key in valid_columns:
-            query.bindValue(f":{key}", payload[key])
 
         with db_transaction(db) as ok:
             if not ok:
@@ -287,20 +225,16 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
             if not img_record:
                 logger.error("Image dir path is undefined.")
                 return False
-            if not exec_query(db, query):
+            query = execute(
+                constants.RE_CONNECTION, sql, {k: payload[k] for k in valid_columns}
+            )
+            if not query:
                 return False
             is_affected(query)
 
-            current_id = None
-            current_id_query = QSqlQuery(db)
-            if current_id_query.exec("SELECT last_insert_rowid();"):
-                if current_id_query.next():
-                    current_id = current_id_query.value(0)
-            else:
-                logger.error(
-                    "Error get the ID of the latest record: %s",
-                    current_id_query.lastError().text(),
-                )
+            current_id = query.lastInsertId()
+            if current_id is None:
+                logger.error("Error get the ID of the latest record.")
                 return False
 
             image_paths = payload.get("image_paths")
@@ -308,11 +242,33 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
             if not file_handler.copy_files(image_paths, image_dir, current_id):
                 return False
 
+        notify_table_changed(constants.TABLE_RE)
         return True
 
+    @classmethod
+    def create_many(cls, payloads):
+        payloads = list(payloads)
+        img_record = None
+        if any(payload.get("image_paths") for payload in payloads):
+            img_record = REImageDirService.get_selected_img_dir()
+            if not img_record:
+                logger.error("Image dir path is undefined.")
+                return None
+        record_ids = super().create_many(payloads)
+        if not record_ids or not img_record:
+            return record_ids
+        for record_id, payload in zip(record_ids, payloads):
+            image_paths = payload.get("image_paths")
+            if not image_paths:
+                continue
+            image_dir = os.path.join(img_record.get("value"), str(record_id))
+            if not file_handler.copy_files(image_paths, image_dir, record_id):
+                logger.error("Failed to copy images for record %s.", record_id)
+        return record_ids
+
     @staticmethod
     def update(record_id, payload):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
+        db = database(constants.RE_CONNECTION)
         valid_columns = [
             k for k in REProductService.get_columns() if k != "id" and k in payload
         ]
@@ -325,34 +281,27 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
             "updated_at = (strftime('%Y-%m-%d %H:%M:%S', 'now')) "
             "WHERE id = :id"
         )
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for key in valid_columns:
-            query.bindValue(f":{key}", payload[key])
-        query.bindValue(":id", record_id)
+        bindings = {k: payload[k] for k in valid_columns}
+        bindings["id"] = record_id
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            query = execute(constants.RE_CONNECTION, sql, bindings)
+            if not query:
                 return False
             is_affected(query)
+        notify_table_changed(constants.TABLE_RE)
         return True
 
     @staticmethod
     def delete(record_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
+        db = database(constants.RE_CONNECTION)
         sql = f"DELETE FROM {constants.TABLE_RE} WHERE id = :id"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":id", record_id)
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            query = execute(constants.RE_CONNECTION, sql, {"id": record_id})
+            if not query:
                 return False
             img_record = REImageDirService.get_selected_img_dir()
             if not img_record:
@@ -362,28 +311,29 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
             image_dir = os.path.join(img_record.get("value"), str(record_id))
             file_handler.delete_dir(image_dir)
             is_affected(query)
+        notify_table_changed(constants.TABLE_RE)
         return True
 
     @staticmethod
     def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
         key, value = next(iter(condition.items()))
         sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
+        count = fetch_value(constants.RE_CONNECTION, sql, {"value": value})
+        return bool(count) and count > 0
 
     @staticmethod
     def is_pid_existed(pid):
         return REProductService.is_value_existed({"pid": pid})
 
+    @staticmethod
+    def get_existing_pids(pids):
+        pids = list(pids)
+        if not pids:
+            return set()
+        placeholders = ", ".join("?" * len(pids))
+        sql = f"SELECT pid FROM {constants.TABLE_RE} WHERE pid IN ({placeholders})"
+        return set(fetch_column(constants.RE_CONNECTION, sql, pids))
+
     @staticmethod
     def get_images(record_id):
         img_dir_service = REImageDirService()
@@ -392,44 +342,23 @@ JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
             os.path.abspath(os.path.join(img_dir_record.get("value"), str(record_id)))
         )
 
+    @classmethod
+    def search(cls, text, limit=50):
+        rows = super().search(text, limit)
+        label_maps = cls._label_maps()
+        results = []
+        for row in rows:
+            product = cls.resolve_labels(row, label_maps)
+            if product is not None:
+                results.append(product)
+        return results
+
     @staticmethod
     def get_random_product(option_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        sql = f"""
-SELECT 
-    main.id,
-    main.pid,
-    main.street,
-    main.area,
-    main.structure,
-    main.function,
-    main.description,
-    main.price,
-    main.updated_at,
-    statuses.label_vi AS status,
-    provinces.label_vi AS province,
-    districts.label_vi AS district,
-    wards.label_vi AS ward,
-    options.label_vi AS option,
-    categories.label_vi AS category,
-    building_line_s.label_vi AS building_line,
-    furniture_s.label_vi AS furniture,
-    legal_s.label_vi AS legal,
-    main.created_at,
-    main.updated_at
-FROM {constants.TABLE_RE} main
-JOIN {constants.TABLE_RE_SETTINGS_STATUSES} statuses ON main.status_id = statuses.id
-JOIN {constants.TABLE_RE_SETTINGS_PROVINCES} provinces ON main.province_id = provinces.id
-JOIN {constants.TABLE_RE_SETTINGS_DISTRICTS} districts ON main.district_id = districts.id
-JOIN {constants.TABLE_RE_SETTINGS_WARDS} wards ON main.ward_id = wards.id
-JOIN {constants.TABLE_RE_SETTINGS_OPTIONS} options ON main.option_id = options.id
-JOIN {constants.TABLE_RE_SETTINGS_CATEGORIES} categories ON main.category_id = categories.id
-JOIN {constants.TABLE_RE_SETTINGS_BUILDING_LINES} building_line_s ON main.building_line_id = building_line_s.id
-JOIN {constants.TABLE_RE_SETTINGS_FURNITURES} furniture_s ON main.furniture_id = furniture_s.id
-JOIN {constants.TABLE_RE_SETTINGS_LEGALS} legal_s ON main.legal_id = legal_s.id
-WHERE option_id = {option_id} AND status_id = 1 ORDER BY RANDOM() LIMIT 1
-"""
-        return fetch_single_result(db, sql, {"option_id": option_id})
+        record_id = REProductService.SAMPLER.pick(option_id)
+        if record_id is None:
+            return None
+        return REProductService.read(record_id)
 
 
 class REImageDirService(BaseService):
@@ -442,56 +371,34 @@ class REImageDirService(BaseService):
 
     @classmethod
     def get_selected_img_dir(cls):
-        db = QSqlDatabase.database(cls.CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT * FROM {cls.TABLE_NAME} WHERE is_selected = :is_selected"
-        if not query.prepare(sql):
-            return None
-        query.bindValue(":is_selected", 1)
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return record_to_dict(query)
-        return None
+        return fetch_one(cls.CONNECTION, sql, {"is_selected": 1})
 
     @classmethod
     def set_selected_img_dir(cls, record_id):
-        db = QSqlDatabase.database(cls.CONNECTION)
+        db = database(cls.CONNECTION)
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            query = QSqlQuery(db)
             sql_reset = f"UPDATE {cls.TABLE_NAME} SET is_selected = 0"
-            if not query.prepare(sql_reset) or not query.exec():
+            if not execute(cls.CONNECTION, sql_reset):
                 return False
             sql_set = f"UPDATE {cls.TABLE_NAME} SET is_selected = 1 WHERE id = :id"
-            if not query.prepare(sql_set):
-                return False
-            query.bindValue(":id", record_id)
-            if not exec_query(db, query):
+            if not execute(cls.CONNECTION, sql_set, {"id": record_id}):
                 return None
+        notify_table_changed(cls.TABLE_NAME)
         return True
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_IMG_DIRS} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class RETemplateTitleService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_TITLE
     CONNECTION = constants.RE_CONNECTION
+    FTS_TABLE = constants.TABLE_RE_SETTINGS_TITLE_FTS
+    SAMPLER = IdPoolSampler(
+        constants.RE_CONNECTION,
+        constants.TABLE_RE_SETTINGS_TITLE,
+        f"SELECT id FROM {constants.TABLE_RE_SETTINGS_TITLE} WHERE option_id = :key",
+    )
 
     @classmethod
     def create(cls, payload):
@@ -506,22 +413,6 @@ class RETemplateTitleService(BaseService):
     def is_tid_existed(cls, tid):
         return cls.is_value_existed({"tid": tid})
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_TITLE} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
     @classmethod
     def generate_tid(cls):
         try:
@@ -538,36 +429,27 @@ class RETemplateTitleService(BaseService):
 
     @staticmethod
     def get_random_template(option_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        sql = f"SELECT value FROM {constants.TABLE_RE_SETTINGS_TITLE} WHERE option_id = {option_id} ORDER BY RANDOM() LIMIT 1"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        if not exec_query(db, query):
+        record_id = RETemplateTitleService.SAMPLER.pick(option_id)
+        if record_id is None:
             return None
-        if query.next():
-            return query.value(0)
-        return None
+        sql = f"SELECT value FROM {constants.TABLE_RE_SETTINGS_TITLE} WHERE id = :id"
+        return fetch_value(constants.RE_CONNECTION, sql, {"id": record_id})
 
     @staticmethod
     def get_default_template():
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT value FROM {constants.TABLE_RE_SETTINGS_TITLE} WHERE id = 1"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return query.value(0)
-        return None
+        return fetch_value(constants.RE_CONNECTION, sql)
 
 
 class RETemplateDescriptionService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_DESCRIPTION
     CONNECTION = constants.RE_CONNECTION
+    FTS_TABLE = constants.TABLE_RE_SETTINGS_DESCRIPTION_FTS
+    SAMPLER = IdPoolSampler(
+        constants.RE_CONNECTION,
+        constants.TABLE_RE_SETTINGS_DESCRIPTION,
+        f"SELECT id FROM {constants.TABLE_RE_SETTINGS_DESCRIPTION} WHERE option_id = :key",
+    )
 
     @classmethod
     def create(cls, payload):
@@ -583,22 +465,6 @@ class RETemplateDescriptionService(BaseService):
     def is_tid_existed(cls, tid):
         return cls.is_value_existed({"tid": tid})
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_DESCRIPTION} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
     @classmethod
     def generate_tid(cls):
         try:
@@ -615,33 +481,18 @@ class RETemplateDescriptionService(BaseService):
 
     @staticmethod
     def get_random_template(option_id):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        sql = f"SELECT value FROM {constants.TABLE_RE_SETTINGS_DESCRIPTION} WHERE option_id = {option_id} ORDER BY RANDOM() LIMIT 1"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        if not exec_query(db, query):
+        record_id = RETemplateDescriptionService.SAMPLER.pick(option_id)
+        if record_id is None:
             return None
-        if query.next():
-            return query.value(0)
-        return None
+        sql = f"SELECT value FROM {constants.TABLE_RE_SETTINGS_DESCRIPTION} WHERE id = :id"
+        return fetch_value(constants.RE_CONNECTION, sql, {"id": record_id})
 
     @staticmethod
     def get_default_template():
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
         sql = (
             f"SELECT value FROM {constants.TABLE_RE_SETTINGS_DESCRIPTION} WHERE id = 1"
         )
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return query.value(0)
-        return None
+        return fetch_value(constants.RE_CONNECTION, sql)
 
 
 class REStatusService(BaseService):
@@ -652,22 +503,6 @@ class REStatusService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_STATUSES} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REProvinceService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_PROVINCES
@@ -677,22 +512,6 @@ class REProvinceService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_PROVINCES} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REDistrictService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_DISTRICTS
@@ -702,22 +521,6 @@ class REDistrictService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_DISTRICTS} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REWardsService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_WARDS
@@ -727,22 +530,6 @@ class REWardsService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_WARDS} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REOptionService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_OPTIONS
@@ -752,22 +539,6 @@ class REOptionService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_OPTIONS} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class RECategoryService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_CATEGORIES
@@ -777,22 +548,6 @@ class RECategoryService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_CATEGORIES} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REBuildingLinesService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_BUILDING_LINES
@@ -802,22 +557,6 @@ class REBuildingLinesService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_BUILDING_LINES} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class RELegalsService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_LEGALS
@@ -827,22 +566,6 @@ class RELegalsService(BaseService):
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
 
-    @staticmethod
-    def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_LEGALS} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
-
 
 class REFurnitureService(BaseService):
     TABLE_NAME = constants.TABLE_RE_SETTINGS_FURNITURES
@@ -851,20 +574,3 @@ class REFurnitureService(BaseService):
     @classmethod
     def get_columns(cls):
         return ["id", "label_vi", "label_en", "value", "created_at", "updated_at"]
-
-    @staticmethod
-    def is_value_existed(condition):
-
-        db = QSqlDatabase.database(constants.RE_CONNECTION)
-        query = QSqlQuery(db)
-        key, value = next(iter(condition.items()))
-        sql = f"SELECT COUNT(*) FROM {constants.TABLE_RE_SETTINGS_FURNITURES} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
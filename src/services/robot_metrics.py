@@ -0,0 +1,115 @@
+# src/services/robot_metrics.py
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src import constants
+from src.my_types import TaskInfo
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+# report order; anything else an action times is listed after these
+PHASES = (
+    "proxy_fetch",
+    "driver_start",
+    "context_launch",
+    "navigation",
+    "form_fill",
+    "upload",
+    "publish",
+)
+
+
+class RobotMetrics(QObject):
+    """Per-attempt phase timings of a robot run.
+
+    Every finished attempt becomes one JSON line in path (None: keep the
+    figures in memory only) and is emitted as task_recorded.
+    """
+
+    phase_recorded = pyqtSignal(str, float)  # phase, seconds
+    task_recorded = pyqtSignal(dict)
+
+    def __init__(self, path=constants.ROBOT_METRICS_PATH, parent=None):
+        super(RobotMetrics, self).__init__(parent)
+        self.path = path
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._attempts = {}
+        # phase -> [count, total seconds]
+        self.phase_totals = {}
+
+    def task_started(self, key, task_info: TaskInfo, retry: int):
+        self._attempts[key] = {
+            "run_id": self.run_id,
+            "user_id": task_info.browser_info.user_id,
+            "action": task_info.action.action_name,
+            "priority": task_info.priority,
+            "retry": retry,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "phases": {},
+            "_started": time.monotonic(),
+        }
+
+    def add_phase(self, key, phase: str, seconds: float):
+        attempt = self._attempts.get(key)
+        if attempt is not None:
+            phases = attempt["phases"]
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        totals = self.phase_totals.setdefault(phase, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        self.phase_recorded.emit(phase, seconds)
+
+    def task_failed(self, key, message: str):
+        attempt = self._attempts.get(key)
+        if attempt is not None:
+            attempt["error"] = message
+
+    def task_finished(self, key):
+        attempt = self._attempts.pop(key, None)
+        if attempt is None:
+            return None
+        attempt["duration"] = time.monotonic() - attempt.pop("_started")
+        attempt["outcome"] = "error" if attempt.get("error") else "ok"
+        self._write(attempt)
+        self.task_recorded.emit(attempt)
+        return attempt
+
+    def _write(self, attempt):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as metrics_file:
+                metrics_file.write(json.dumps(attempt, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to write robot metrics: {e}")
+
+    def phase_rows(self):
+        """[(phase, count, average seconds, total seconds)] in PHASES order."""
+        order = {phase: index for index, phase in enumerate(PHASES)}
+        return [
+            (phase, count, total / count, total)
+            for phase, (count, total) in sorted(
+                self.phase_totals.items(),
+                key=lambda item: (order.get(item[0], len(PHASES)), item[0]),
+            )
+        ]
+
+    def format_phase_table(self):
+        lines = [f"  {'phase':<16}{'count':>7}{'avg s':>10}{'total s':>11}"]
+        for phase, count, average, total in self.phase_rows():
+            lines.append(f"  {phase:<16}{count:>7}{average:>10.2f}{total:>11.1f}")
+        return "\n".join(lines)
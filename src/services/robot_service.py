@@ -1,53 +1,191 @@
 # src/services/robot_service.py
+import math
 import time
-from collections import deque
 from typing import Tuple
-from PyQt6.QtCore import QThreadPool, QObject, pyqtSignal, pyqtSlot, Qt
+from PyQt6.QtCore import QThreadPool, QObject, QTimer, pyqtSignal, pyqtSlot, Qt
 
-from src.services.user_service import UserProxyService
+from src import constants
+from src.services.user_service import (
+    GroupCatalogService,
+    PostHistoryService,
+    RobotJobService,
+    UserProxyHealthService,
+)
+from src.services.proxy_pool import proxy_pool
+from src.services.task_scheduler import TaskScheduler
+from src.services.robot_metrics import RobotMetrics
 from src.robot.browser_worker import BrowserWorker
+from src.robot.browser_session import browser_sessions
+from src.robot.async_engine import AsyncBrowserJob, async_engine
+from src.robot.process_engine import ProcessBrowserJob, process_engine
 from src.my_types import TaskInfo
+from src.utils.resource_handler import browser_budget
 
 
 class RobotService(QObject):
-    def __init__(self, thread_num=1, max_retries=2):
+    # summary(), once every task has succeeded or failed for good
+    done = pyqtSignal(dict)
+    # status(): queue depth, active workers, counts, throughput
+    status_updated = pyqtSignal(dict)
+
+    def __init__(self, thread_num=1, max_retries=2, engine=None, durable=None):
         super(RobotService, self).__init__()
-        self.available_proxies = deque(UserProxyService.get_proxies())
-        self.pending_task = deque()
+        self.engine = engine or constants.ROBOT_ENGINE
+        # tasks are saved to RobotJobService and can be resumed after a restart
+        self.durable = constants.ROBOT_DURABLE_JOBS if durable is None else durable
+        # healthy, fastest proxies first; each serves up to max_sessions tasks
+        ranked_proxies = UserProxyHealthService.get_ranked_proxies()
+        self.ranked_proxies = [row.get("value") for row in ranked_proxies]
+        self.proxy_capacity = {
+            row.get("value"): max(int(row.get("max_sessions") or 1), 1)
+            for row in ranked_proxies
+        }
+        self.proxy_sessions = {proxy: 0 for proxy in self.ranked_proxies}
+        self.user_proxy = {}
+        # fetch and check a proxy per endpoint before the first task asks
+        proxy_pool.prewarm(self.ranked_proxies)
+        # one task per account at a time, by priority and fair share
+        self.scheduler = TaskScheduler()
         self.task_in_progress = {}
+        # delay tasks and retry backoffs never take a worker: the scheduler
+        # holds the account's next task and this single-shot timer wakes us
+        self.delay_timer = QTimer(self)
+        self.delay_timer.setSingleShot(True)
+        self.delay_timer.timeout.connect(self.release_due_tasks)
         self.max_retries = max_retries
         self.total_tasks_initial = 0
         self.tasks_succeeded_count = 0
         self.task_failed_perm_count = 0
+        self.task_retry_count = 0
+        # attempts that reported an error; their finished signal isn't a success
+        self.failed_attempts = set()
+        self.started_at = None
+        self.is_done = False
+        # phase timings per attempt, keyed by the worker's signals object
+        self.metrics = RobotMetrics(parent=self)
+        # running task by its worker's signals, for the group slots
+        self.worker_tasks = {}
 
+        # bounded by what the machine can run, not by the number of proxies
+        self.max_concurrency = max(min(thread_num, browser_budget()), 1)
+        # browsers kept open between an account's actions count as well
+        browser_sessions.max_sessions = self.max_concurrency
+        async_engine.max_sessions = self.max_concurrency
         self.threadpool = QThreadPool.globalInstance()
-        max_thread_num = self.threadpool.maxThreadCount()
-        if max_thread_num < thread_num:
-            self.threadpool
-        thread_num = min(
-            thread_num, self.threadpool.maxThreadCount(), len(self.available_proxies)
-        )
-        self.threadpool.setMaxThreadCount(thread_num)
-        print(f"JobManager initialized. Max threads: {thread_num}")
+        if (
+            self.engine == "thread"
+            and self.threadpool.maxThreadCount() < self.max_concurrency
+        ):
+            self.threadpool.setMaxThreadCount(self.max_concurrency)
+        print(f"JobManager initialized. Max threads: {self.max_concurrency}")
 
     @pyqtSlot(list)
     def add_tasks(self, tasks: list[TaskInfo]):
-        for task in tasks:
-            self.pending_task.append((task, 0))
-        self.total_tasks_initial += len(tasks)
-        # TODO emit_status_update
+        if self.durable:
+            saved_tasks = RobotJobService.enqueue(tasks)
+            if saved_tasks is None:
+                print("Failed to save the robot jobs: they won't be resumable.")
+            else:
+                if len(saved_tasks) < len(tasks):
+                    print(
+                        f"Already queued or published: skipped "
+                        f"{len(tasks) - len(saved_tasks)} tasks."
+                    )
+                tasks = saved_tasks
+        self._queue_tasks([(task, 0) for task in tasks])
+
+    @pyqtSlot()
+    def resume_tasks(self):
+        """Queue the saved jobs a previous run left unfinished; returns how many."""
+        recovered = RobotJobService.recover()
+        print(f"Resuming {len(recovered)} unfinished robot jobs.")
+        self._queue_tasks(recovered)
+        return len(recovered)
+
+    def _queue_tasks(self, tasks_with_retry):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        self.is_done = False
+        for task, retry in tasks_with_retry:
+            self.scheduler.push(task, retry)
+        self.total_tasks_initial += len(tasks_with_retry)
         # TODO emit message
         self.try_start_tasks()
+        # a batch of delay tasks only can finish right here
+        self.check_if_done()
+
+    def _save_job_state(self, task_info: TaskInfo, mark, *args):
+        if self.durable and task_info.job_id is not None:
+            mark(task_info.job_id, *args)
+
+    @staticmethod
+    def is_delay_task(task_info: TaskInfo):
+        return task_info.action.action_name == constants.ROBOT_DELAY_ACTION
+
+    @staticmethod
+    def needs_proxy(task_info: TaskInfo):
+        return task_info.action.action_name not in constants.ROBOT_PROXYLESS_ACTIONS
+
+    def _take_proxy(self, user_id=None):
+        # the endpoint the user had last keeps its open browser session usable
+        last_proxy = self.user_proxy.get(user_id)
+        candidates = [last_proxy] if last_proxy in self.proxy_sessions else []
+        for proxy in candidates + self.ranked_proxies:
+            if self.proxy_sessions[proxy] < self.proxy_capacity[proxy]:
+                self.proxy_sessions[proxy] += 1
+                self.user_proxy[user_id] = proxy
+                return proxy
+        return None
+
+    def _proxy_available(self):
+        return any(
+            self.proxy_sessions[proxy] < self.proxy_capacity[proxy]
+            for proxy in self.ranked_proxies
+        )
+
+    def _can_start(self, task_info: TaskInfo):
+        # proxy-less tasks never wait for a proxy
+        return not self.needs_proxy(task_info) or self._proxy_available()
+
+    def _return_proxy(self, proxy):
+        if self.proxy_sessions.get(proxy):
+            self.proxy_sessions[proxy] -= 1
 
     @pyqtSlot()
     def try_start_tasks(self):
-        while self.pending_task and self.available_proxies:
-            proxy = self.available_proxies.popleft()
-            task_with_retry = self.pending_task.popleft()
+        while len(self.task_in_progress) < self.max_concurrency:
+            task_with_retry = self.scheduler.pop(self._can_start)
+            if task_with_retry is None:
+                break
             task_info: TaskInfo = task_with_retry[0]
             retry: int = task_with_retry[1]
+            user_id = task_info.browser_info.user_id
+            if self.is_delay_task(task_info):
+                # holds the account's next task; runs after its previous one ended
+                self.scheduler.delay_account(user_id, constants.ROBOT_DELAY_SECONDS)
+                self.scheduler.release(user_id)
+                self._save_job_state(task_info, RobotJobService.mark_done)
+                self.tasks_succeeded_count += 1
+                continue
+            if task_info.action.action_name in constants.ROBOT_GROUP_POST_ACTIONS:
+                # None makes the action scrape the groups sidebar again
+                task_info.action.group_urls = GroupCatalogService.get_group_urls(
+                    user_id
+                )
+                task_info.action.skip_group_urls = (
+                    PostHistoryService.skipped_group_urls(user_id, task_info.action.pid)
+                )
+            proxy = ""
+            if self.needs_proxy(task_info):
+                proxy = self._take_proxy(user_id)
 
-            worker = BrowserWorker(
+            if self.engine == "async":
+                worker_class = AsyncBrowserJob
+            elif self.engine == "process":
+                worker_class = ProcessBrowserJob
+            else:
+                worker_class = BrowserWorker
+            worker = worker_class(
                 task_info=task_info,
                 retry_count=retry,
                 proxy_raw=proxy,
@@ -56,11 +194,39 @@ class RobotService(QObject):
             worker.signals.finished.connect(self.on_worker_finished)
             worker.signals.log_message.connect(self.on_log_message)
             worker.signals.error.connect(self.on_worker_error)
+            worker.signals.phase.connect(self.on_worker_phase)
+            worker.signals.published.connect(self.on_worker_published)
+            worker.signals.groups_found.connect(self.on_worker_groups_found)
+            worker.signals.group_checked.connect(self.on_worker_group_checked)
+            self.metrics.task_started(id(worker.signals), task_info, retry)
+            self.worker_tasks[id(worker.signals)] = task_info
+
+            self.task_in_progress[id(task_info)] = (task_with_retry, worker)
+            self._save_job_state(task_info, RobotJobService.mark_running)
 
-            self.task_in_progress[proxy] = (task_with_retry, worker)
+            if self.engine == "async":
+                async_engine.start(worker)
+            elif self.engine == "process":
+                process_engine.start(worker)
+            else:
+                self.threadpool.start(worker)
+        self._schedule_delay_timer()
+        self._emit_status_update()
 
-            self.threadpool.start(worker)
-            # self._emit_status_update()
+    def _schedule_delay_timer(self):
+        ready_at = self.scheduler.next_ready_at()
+        if ready_at is None:
+            self.delay_timer.stop()
+            return
+        wait_ms = (ready_at - time.monotonic()) * 1000
+        # round up: firing a hair early finds nothing due and re-arms at 0 ms
+        self.delay_timer.start(max(math.ceil(wait_ms), 0))
+
+    @pyqtSlot()
+    def release_due_tasks(self):
+        """Start tasks whose delay or retry backoff has passed."""
+        self.try_start_tasks()
+        self.check_if_done()
 
     @pyqtSlot(TaskInfo, int, str)
     def on_worker_finished(self, task: TaskInfo, retry: int, proxy: str):
@@ -68,13 +234,20 @@ class RobotService(QObject):
         # retry: int = retry
         # TODO emit to controller
         print(f"[{task.browser_info.user_id}] Finished.")
-        if proxy in self.task_in_progress:
-            del self.task_in_progress[proxy]
-        self.available_proxies.append(proxy)
-        # TODO emit to controller
-        self.tasks_succeeded_count += 1
-        # TODO emit to controller
-        # self._emit_status_update()
+        self.task_in_progress.pop(id(task), None)
+        self.metrics.task_finished(id(self.sender()))
+        self.worker_tasks.pop(id(self.sender()), None)
+        self.scheduler.release(task.browser_info.user_id)
+        if proxy:
+            self._return_proxy(proxy)
+        if (id(task), retry) in self.failed_attempts:
+            # already retried or counted as failed by on_worker_error
+            self.failed_attempts.discard((id(task), retry))
+        else:
+            # TODO emit to controller
+            self._save_job_state(task, RobotJobService.mark_done)
+            self.tasks_succeeded_count += 1
+        self._emit_status_update()
         if self.check_if_done():
             return True
         self.try_start_tasks()
@@ -83,29 +256,84 @@ class RobotService(QObject):
     def on_log_message(self, str):
         print(str)
 
+    @pyqtSlot(str, float)
+    def on_worker_phase(self, phase: str, seconds: float):
+        self.metrics.add_phase(id(self.sender()), phase, seconds)
+
+    @pyqtSlot(str)
+    def on_worker_published(self, group_url: str):
+        task_info = self.worker_tasks.get(id(self.sender()))
+        if task_info is not None:
+            user_id = task_info.browser_info.user_id
+            PostHistoryService.record(user_id, group_url, task_info.action.pid)
+            GroupCatalogService.mark_success(user_id, group_url)
+
+    @pyqtSlot(list)
+    def on_worker_groups_found(self, group_urls: list):
+        task_info = self.worker_tasks.get(id(self.sender()))
+        if task_info is not None:
+            GroupCatalogService.replace_groups(
+                task_info.browser_info.user_id, group_urls
+            )
+
+    @pyqtSlot(str, bool)
+    def on_worker_group_checked(self, group_url: str, is_buy_sell: bool):
+        task_info = self.worker_tasks.get(id(self.sender()))
+        if task_info is not None:
+            GroupCatalogService.mark_buy_sell(
+                task_info.browser_info.user_id, group_url, is_buy_sell
+            )
+
     @pyqtSlot(TaskInfo, int, str)
     def on_worker_error(self, task_info: TaskInfo, retry: int, message: str):
         print(f"[on_worker_error] {message}")
+        self.metrics.task_failed(id(self.sender()), message)
+        self.failed_attempts.add((id(task_info), retry))
         if retry < self.max_retries:
-            new_task_retry = (task_info, retry + 1)
-            self.pending_task.append(new_task_retry)
+            self.task_retry_count += 1
+            self._save_job_state(task_info, RobotJobService.mark_retry, message)
+            backoff = self.scheduler.push_retry(task_info, retry + 1)
             # TODO emit to controller
-            print(f"[{task_info.browser_info.user_id}] Retry  time ({retry}).")
+            print(
+                f"[{task_info.browser_info.user_id}] Retry  time ({retry}) "
+                f"in {backoff:.0f}s."
+            )
             # call
         else:
             self.task_failed_perm_count += 1
+            self._save_job_state(task_info, RobotJobService.mark_failed, message)
             # TODO emit to controller
             print(f"Failed permanently after {retry} time.")
 
     def _emit_status_update(self):
-        # TODO emit to controller
-        print("_emi_status_update")
-        pass
+        self.status_updated.emit(self.status())
+
+    def status(self):
+        status = self.summary()
+        status["queued"] = len(self.scheduler)
+        status["active"] = len(self.task_in_progress)
+        status["tasks_per_hour"] = status["tasks_per_minute"] * 60
+        return status
 
     def check_if_done(self):
         if (
             self.tasks_succeeded_count + self.task_failed_perm_count
             == self.total_tasks_initial
         ):
-            if not self.pending_task and not self.task_in_progress:
+            if not self.scheduler and not self.task_in_progress:
+                if not self.is_done:
+                    self.is_done = True
+                    self.done.emit(self.summary())
                 return True
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        finished = self.tasks_succeeded_count + self.task_failed_perm_count
+        return {
+            "total": self.total_tasks_initial,
+            "succeeded": self.tasks_succeeded_count,
+            "failed": self.task_failed_perm_count,
+            "retries": self.task_retry_count,
+            "elapsed": elapsed,
+            "tasks_per_minute": finished * 60 / elapsed if elapsed else 0.0,
+        }
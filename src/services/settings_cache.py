@@ -0,0 +1,130 @@
+# src/services/settings_cache.py
+import threading
+
+from src import constants
+from src.services.query_engine import add_table_listener, fetch_all
+
+SETTINGS_TABLES = [
+    constants.TABLE_RE_SETTINGS_STATUSES,
+    constants.TABLE_RE_SETTINGS_PROVINCES,
+    constants.TABLE_RE_SETTINGS_DISTRICTS,
+    constants.TABLE_RE_SETTINGS_WARDS,
+    constants.TABLE_RE_SETTINGS_OPTIONS,
+    constants.TABLE_RE_SETTINGS_CATEGORIES,
+    constants.TABLE_RE_SETTINGS_BUILDING_LINES,
+    constants.TABLE_RE_SETTINGS_FURNITURES,
+    constants.TABLE_RE_SETTINGS_LEGALS,
+]
+
+# table_re column -> settings table it references
+PRODUCT_FOREIGN_KEYS = {
+    "status_id": constants.TABLE_RE_SETTINGS_STATUSES,
+    "province_id": constants.TABLE_RE_SETTINGS_PROVINCES,
+    "district_id": constants.TABLE_RE_SETTINGS_DISTRICTS,
+    "ward_id": constants.TABLE_RE_SETTINGS_WARDS,
+    "option_id": constants.TABLE_RE_SETTINGS_OPTIONS,
+    "category_id": constants.TABLE_RE_SETTINGS_CATEGORIES,
+    "building_line_id": constants.TABLE_RE_SETTINGS_BUILDING_LINES,
+    "furniture_id": constants.TABLE_RE_SETTINGS_FURNITURES,
+    "legal_id": constants.TABLE_RE_SETTINGS_LEGALS,
+}
+
+
+class _TableEntry:
+    __slots__ = ("records", "by_id", "labels_vi", "value_to_id", "key_to_id")
+
+    def __init__(self, records):
+        self.records = records
+        self.by_id = {record.get("id"): record for record in records}
+        self.labels_vi = {
+            record.get("id"): record.get("label_vi") for record in records
+        }
+        self.value_to_id = {record.get("value"): record.get("id") for record in records}
+        self.key_to_id = {}
+        for record in records:
+            for key in ("value", "label_vi", "label_en"):
+                if record.get(key):
+                    self.key_to_id.setdefault(
+                        str(record.get(key)).lower(), record.get("id")
+                    )
+
+
+def _record_id(record_id):
+    # ids coming from widgets/CSV may be strings; SQLite compared them loosely
+    if isinstance(record_id, str) and record_id.strip().isdigit():
+        return int(record_id)
+    return record_id
+
+
+class SettingsCache:
+    """Lazily loaded id/value lookups for the RE settings tables.
+
+    Each table is read once and dropped again whenever a write to that table
+    goes through the query engine (see notify_table_changed).
+    """
+
+    def __init__(self, connection=constants.RE_CONNECTION, tables=None):
+        self.connection = connection
+        self.tables = set(tables or SETTINGS_TABLES)
+        self._entries = {}
+        # bumped by invalidate(); a load that overlapped one is not cached
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def is_cached_table(self, table_name):
+        return table_name in self.tables
+
+    def _entry(self, table_name) -> _TableEntry:
+        entry = self._entries.get(table_name)
+        if entry is not None:
+            return entry
+        if table_name not in self.tables:
+            raise KeyError(f"'{table_name}' is not a cached settings table.")
+        with self._lock:
+            generation = self._generations.get(table_name, 0)
+        records = fetch_all(self.connection, f"SELECT * FROM {table_name}")
+        entry = _TableEntry(records)
+        with self._lock:
+            if self._generations.get(table_name, 0) == generation:
+                self._entries[table_name] = entry
+        return entry
+
+    def records(self, table_name):
+        return list(self._entry(table_name).records)
+
+    def get(self, table_name, record_id):
+        return self._entry(table_name).by_id.get(_record_id(record_id))
+
+    def exists(self, table_name, record_id):
+        return _record_id(record_id) in self._entry(table_name).by_id
+
+    def label_vi(self, table_name, record_id):
+        record = self.get(table_name, record_id)
+        return record.get("label_vi") if record else None
+
+    def label_map(self, table_name):
+        """{id: label_vi} for the table; callers must not mutate it."""
+        return self._entry(table_name).labels_vi
+
+    def id_for_value(self, table_name, value):
+        return self._entry(table_name).value_to_id.get(value)
+
+    def find_id(self, table_name, key):
+        """Case-insensitive match on value, label_vi or label_en."""
+        if key is None:
+            return None
+        return self._entry(table_name).key_to_id.get(str(key).lower())
+
+    def invalidate(self, table_name=None):
+        with self._lock:
+            if table_name is None:
+                self._entries.clear()
+                for name in self.tables:
+                    self._generations[name] = self._generations.get(name, 0) + 1
+            elif table_name in self.tables:
+                self._entries.pop(table_name, None)
+                self._generations[table_name] = self._generations.get(table_name, 0) + 1
+
+
+settings_cache = SettingsCache()
+add_table_listener(settings_cache.invalidate)
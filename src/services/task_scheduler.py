@@ -0,0 +1,131 @@
+# src/services/task_scheduler.py
+import itertools
+import time
+from collections import deque
+
+from src import constants
+from src.my_types import TaskInfo
+
+
+class _Account:
+    __slots__ = ("user_id", "group", "queue", "running", "ready_at", "served")
+
+    def __init__(self, user_id, group):
+        self.user_id = user_id
+        self.group = group
+        # (task_info, retry, not_before, seq), in the account's action order
+        self.queue = deque()
+        self.running = False
+        self.ready_at = 0.0
+        self.served = 0
+
+
+class TaskScheduler:
+    """Picks the next robot task to start.
+
+    - An account runs one task at a time, so two browsers never open the
+      same user_data_dir.
+    - Each account's tasks start in the order they were added. A retry goes
+      back to the front of its account's queue, after a backoff.
+    - Across accounts, the lowest TaskInfo.priority goes first. Ties go to
+      the user group, then the account, that has started the fewest tasks,
+      then to the earliest added.
+    """
+
+    def __init__(
+        self,
+        retry_backoff=constants.ROBOT_RETRY_BACKOFF,
+        retry_backoff_max=constants.ROBOT_RETRY_BACKOFF_MAX,
+    ):
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._accounts = {}
+        self._group_served = {}
+        self._seq = itertools.count()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _account(self, task_info: TaskInfo):
+        user_id = task_info.browser_info.user_id
+        account = self._accounts.get(user_id)
+        if account is None:
+            account = _Account(user_id, task_info.user_group or "")
+            self._accounts[user_id] = account
+            self._group_served.setdefault(account.group, 0)
+        return account
+
+    def push(self, task_info: TaskInfo, retry=0):
+        self._account(task_info).queue.append((task_info, retry, 0.0, next(self._seq)))
+        self._size += 1
+
+    def push_retry(self, task_info: TaskInfo, retry):
+        """Requeue a failed task ahead of its account's other tasks, after a backoff."""
+        backoff = min(
+            self.retry_backoff * 2 ** max(retry - 1, 0), self.retry_backoff_max
+        )
+        not_before = time.monotonic() + backoff
+        self._account(task_info).queue.appendleft(
+            (task_info, retry, not_before, next(self._seq))
+        )
+        self._size += 1
+        return backoff
+
+    def delay_account(self, user_id, seconds):
+        """Hold the account's next task for seconds, on top of any current hold."""
+        account = self._accounts[user_id]
+        now = time.monotonic()
+        account.ready_at = max(account.ready_at, now) + seconds
+
+    def pop(self, can_start=None):
+        """The next (task_info, retry) to start, or None; marks its account busy.
+
+        can_start(task_info) can veto a candidate, e.g. while no proxy is free.
+        """
+        now = time.monotonic()
+        best = None
+        best_key = None
+        for account in self._accounts.values():
+            if account.running or not account.queue or account.ready_at > now:
+                continue
+            task_info, retry, not_before, seq = account.queue[0]
+            if not_before > now:
+                continue
+            key = (
+                task_info.priority,
+                self._group_served[account.group],
+                account.served,
+                seq,
+            )
+            if best_key is not None and key >= best_key:
+                continue
+            if can_start is not None and not can_start(task_info):
+                continue
+            best, best_key = account, key
+        if best is None:
+            return None
+        task_info, retry, _, _ = best.queue.popleft()
+        self._size -= 1
+        best.running = True
+        best.served += 1
+        self._group_served[best.group] += 1
+        return task_info, retry
+
+    def release(self, user_id):
+        """The account's task is over; its next task may start."""
+        account = self._accounts.get(user_id)
+        if account is not None:
+            account.running = False
+
+    def next_ready_at(self):
+        """Earliest monotonic time a waiting task becomes startable, if any waits."""
+        now = time.monotonic()
+        times = []
+        for account in self._accounts.values():
+            if account.running or not account.queue:
+                continue
+            ready_at = max(account.ready_at, account.queue[0][2])
+            if ready_at > now:
+                times.append(ready_at)
+        return min(times, default=None)
@@ -1,14 +1,29 @@
 # src/services/user_service.py
+import hashlib
+import json
 import logging
 import sys
 import os
+import random
+from dataclasses import asdict
 
-from contextlib import contextmanager
 from fake_useragent import UserAgent
-from PyQt6.QtSql import QSqlQuery, QSqlDatabase
 from src import constants
+from src.my_types import ActionInfo, BrowserInfo, ProxyCheckResult, TaskInfo
 from src.utils import file_handler
+from src.utils.robot_handler import check_proxies, fetch_proxies, proxy_to_url
 from src.services.base_service import BaseService
+from src.services.query_engine import (
+    database,
+    db_transaction,
+    execute,
+    execute_many,
+    fetch_all,
+    fetch_column,
+    fetch_one,
+    fetch_value,
+    notify_table_changed,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
@@ -21,69 +36,10 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
 
 
-def record_to_dict(query: QSqlQuery) -> dict:
-    rec = query.record()
-    return {rec.fieldName(i): query.value(i) for i in range(rec.count())}
-
+class UserService(BaseService):
+    TABLE_NAME = constants.TABLE_USER
+    CONNECTION = constants.USER_CONNECTION
 
-def exec_query(db, query):
-    sql = query.lastQuery()
-    if not query.exec():
-        logger.info("Query bound values: %s", query.boundValues())
-        logger.error(
-            "Error executing SQL query: %s\nERROR message: %s",
-            sql,
-            query.lastError().text(),
-        )
-        db.rollback()
-        return False
-    return True
-
-
-def fetch_single_result(db, sql, bindings):
-    query = QSqlQuery(db)
-    if not query.prepare(sql):
-        logger.error(query.lastError().text())
-        return None
-    for key, value in bindings.items():
-        query.bindValue(f":{key}", value)
-    if not exec_query(db, query):
-        return None
-    if query.next():
-        return record_to_dict(query)
-    return None
-
-
-def is_affected(query):
-    rows_affected = query.numRowsAffected()
-    if rows_affected > 0:
-        logger.info("Updated %d record(s).", rows_affected)
-        return True
-    else:
-        sql = query.lastQuery()
-        logger.info("No records were updated. Query: %s", sql)
-        return False
-
-
-@contextmanager
-def db_transaction(db):
-    if not db.transaction():
-        logger.error("Failed to start transaction.")
-        yield False
-        return
-    try:
-        yield True
-    except Exception as e:
-        db.rollback()
-        logger.error("Transaction error: %s", e)
-        raise
-    else:
-        if not db.commit():
-            logger.error("Failed to commit transaction.")
-            db.rollback()
-
-
-class UserService:
     @staticmethod
     def get_columns():
         return [
@@ -107,33 +63,13 @@ class UserService:
 
     @staticmethod
     def read(record_id):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT * FROM {constants.TABLE_USER} WHERE id = :id"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        query.bindValue(":id", record_id)
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return record_to_dict(query)
-        return None
+        return fetch_one(constants.USER_CONNECTION, sql, {"id": record_id})
 
     @staticmethod
     def read_all():
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT * FROM {constants.TABLE_USER}"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return []
-        if not exec_query(db, query):
-            return []
-        results = []
-        while query.next():
-            results.append(record_to_dict(query))
-        return results
+        return fetch_all(constants.USER_CONNECTION, sql)
 
     @staticmethod
     def create(payload):
@@ -145,7 +81,7 @@ class UserService:
         )
         payload["mobile_ua"] = ua_mobile_controller.random
         payload["desktop_ua"] = ua_desktop_controller.random
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
+        db = database(constants.USER_CONNECTION)
         valid_columns = [col for col in UserService.get_columns() if col in payload]
         if not valid_columns:
             logger.error("No valid columns provided for create.")
@@ -153,22 +89,40 @@ class UserService:
         columns = ", ".join(valid_columns)
         placeholders = ", ".join([f":{col}" for col in valid_columns])
         sql = f"INSERT INTO {constants.TABLE_USER} ({columns}) VALUES ({placeholders})"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for col in valid_columns:
-            query.bindValue(f":{col}", payload[col])
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            if not execute(
+                constants.USER_CONNECTION,
+                sql,
+                {col: payload[col] for col in valid_columns},
+            ):
                 return False
+        notify_table_changed(constants.TABLE_USER)
         return True
 
+    @classmethod
+    def create_many(cls, payloads):
+        ua_desktop_controller = UserAgent(
+            os="Mac OS X",
+        )
+        ua_mobile_controller = UserAgent(
+            os="iOS",
+        )
+        payloads = list(payloads)
+        # UserAgent.random filters its whole dataset on every call, so draw a
+        # small pool once per batch and pick from it per row.
+        pool_size = min(len(payloads), 50)
+        mobile_uas = [ua_mobile_controller.random for _ in range(pool_size)]
+        desktop_uas = [ua_desktop_controller.random for _ in range(pool_size)]
+        for payload in payloads:
+            payload.setdefault("mobile_ua", random.choice(mobile_uas))
+            payload.setdefault("desktop_ua", random.choice(desktop_uas))
+        return super().create_many(payloads)
+
     @staticmethod
     def update(record_id, payload):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
+        db = database(constants.USER_CONNECTION)
         valid_columns = [
             col for col in UserService.get_columns() if col != "id" and col in payload
         ]
@@ -181,71 +135,44 @@ class UserService:
             "updated_at = (strftime('%Y-%m-%d %H:%M:%S', 'now')) "
             "WHERE id = :id"
         )
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        for col in valid_columns:
-            query.bindValue(f":{col}", payload[col])
-        query.bindValue(":id", record_id)
+        bindings = {col: payload[col] for col in valid_columns}
+        bindings["id"] = record_id
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            if not execute(constants.USER_CONNECTION, sql, bindings):
                 return False
+        notify_table_changed(constants.TABLE_USER)
         return True
 
     @staticmethod
     def delete(record_id):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
+        db = database(constants.USER_CONNECTION)
         sql = f"DELETE FROM {constants.TABLE_USER} WHERE id = :id"
-        query = QSqlQuery(db)
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":id", record_id)
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            if not exec_query(db, query):
+            if not execute(constants.USER_CONNECTION, sql, {"id": record_id}):
                 return False
+        notify_table_changed(constants.TABLE_USER)
         udd_container_dir = UserUDDService.get_selected_udd()
         file_handler.delete_dir(os.path.join(udd_container_dir, str(record_id)))
         return True
 
     @staticmethod
     def is_value_existed(condition):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
-        query = QSqlQuery(db)
         key, value = next(iter(condition.items()))
         sql = f"SELECT COUNT(*) FROM {constants.TABLE_USER} WHERE {key} = :value"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return False
-        query.bindValue(":value", value)
-        if not exec_query(db, query):
-            return False
-        if query.next():
-            return query.value(0) > 0
-        return False
+        count = fetch_value(constants.USER_CONNECTION, sql, {"value": value})
+        return bool(count) and count > 0
 
     @staticmethod
     def get_ua(record_id, is_mobile=False):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
-        query = QSqlQuery(db)
         if is_mobile:
             sql = f"SELECT mobile_ua FROM {constants.TABLE_USER} WHERE id = :id"
         else:
             sql = f"SELECT desktop_ua FROM {constants.TABLE_USER} WHERE id = :id"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return None
-        query.bindValue(":id", record_id)
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return query.value(0)
-        return None
+        return fetch_value(constants.USER_CONNECTION, sql, {"id": record_id})
 
     @staticmethod
     def get_udd(record_id):
@@ -271,34 +198,22 @@ class UserUDDService(BaseService):
 
     @classmethod
     def get_selected_udd(cls):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT value FROM {cls.TABLE_NAME} WHERE is_selected = :is_selected"
-        if not query.prepare(sql):
-            return None
-        query.bindValue(":is_selected", 1)
-        if not exec_query(db, query):
-            return None
-        if query.next():
-            return query.value(0)
-        return None
+        return fetch_value(cls.CONNECTION, sql, {"is_selected": 1})
 
     @classmethod
     def set_selected_udd(cls, record_id):
-        db = QSqlDatabase.database(constants.USER_CONNECTION)
+        db = database(cls.CONNECTION)
         with db_transaction(db) as ok:
             if not ok:
                 return False
-            query = QSqlQuery(db)
             sql_reset = f"UPDATE {cls.TABLE_NAME} SET is_selected = 0"
-            if not query.prepare(sql_reset) or not query.exec():
+            if not execute(cls.CONNECTION, sql_reset):
                 return False
             sql_set = f"UPDATE {cls.TABLE_NAME} SET is_selected = 1 WHERE id = :id"
-            if not query.prepare(sql_set):
-                return False
-            query.bindValue(":id", record_id)
-            if not exec_query(db, query):
+            if not execute(cls.CONNECTION, sql_set, {"id": record_id}):
                 return None
+        notify_table_changed(cls.TABLE_NAME)
         return True
 
 
@@ -311,21 +226,455 @@ class UserProxyService(BaseService):
         return [
             "id",
             "value",
+            "max_sessions",
             "updated_at",
             "created_at",
         ]
 
     @classmethod
     def get_proxies(cls):
-        proxies = []
-        db = QSqlDatabase.database(cls.CONNECTION)
-        query = QSqlQuery(db)
         sql = f"SELECT value FROM {cls.TABLE_NAME}"
-        if not query.prepare(sql):
-            logger.error(query.lastError().text())
-            return proxies
-        if not exec_query(db, query):
-            return proxies
-        while query.next():
-            proxies.append(query.value(0))
-        return proxies
+        return fetch_column(cls.CONNECTION, sql)
+
+
+class UserProxyHealthService(BaseService):
+    TABLE_NAME = constants.TABLE_USER_SETTINGS_PROXY_HEALTH
+    CONNECTION = constants.USER_CONNECTION
+    # weight of the newest sample in avg_latency_ms
+    LATENCY_SMOOTHING = 0.3
+
+    @classmethod
+    def get_columns(cls):
+        return [
+            "proxy_id",
+            "checks_total",
+            "checks_ok",
+            "last_ok",
+            "last_latency_ms",
+            "avg_latency_ms",
+            "last_ip",
+            "last_error",
+            "last_checked_at",
+        ]
+
+    @classmethod
+    def record_checks(cls, results):
+        """results: {proxy value: ProxyCheckResult}; unknown values are ignored."""
+        alpha = cls.LATENCY_SMOOTHING
+        sql = f"""
+INSERT INTO {cls.TABLE_NAME} (
+    proxy_id, checks_total, checks_ok, last_ok, last_latency_ms, avg_latency_ms,
+    last_ip, last_error
+)
+SELECT id, 1, :is_ok, :is_ok, :latency_ms, :latency_ms, :ip, :error
+FROM {UserProxyService.TABLE_NAME} WHERE value = :value
+ON CONFLICT (proxy_id) DO UPDATE SET
+    checks_total = checks_total + 1,
+    checks_ok = checks_ok + excluded.last_ok,
+    last_ok = excluded.last_ok,
+    last_latency_ms = excluded.last_latency_ms,
+    avg_latency_ms = CASE
+        WHEN excluded.last_ok = 0 THEN avg_latency_ms
+        WHEN avg_latency_ms IS NULL THEN excluded.last_latency_ms
+        ELSE avg_latency_ms * {1 - alpha} + excluded.last_latency_ms * {alpha}
+    END,
+    last_ip = coalesce(excluded.last_ip, last_ip),
+    last_error = excluded.last_error,
+    last_checked_at = strftime('%Y-%m-%d %H:%M:%S', 'now')
+"""
+        rows = [
+            {
+                "value": value,
+                "is_ok": 1 if result.is_ok else 0,
+                "latency_ms": result.latency_ms,
+                "ip": result.ip,
+                "error": result.error,
+            }
+            for value, result in results.items()
+        ]
+        if not rows:
+            return True
+        if not execute_many(cls.CONNECTION, sql, rows):
+            logger.error("Error recording proxy health checks.")
+            return False
+        notify_table_changed(cls.TABLE_NAME)
+        return True
+
+    @classmethod
+    def get_ranked_proxies(cls):
+        """{value, max_sessions} rows: healthy and fastest first, then
+        unchecked, then failing."""
+        sql = f"""
+SELECT p.value, p.max_sessions
+FROM {UserProxyService.TABLE_NAME} p
+LEFT JOIN {cls.TABLE_NAME} h ON h.proxy_id = p.id
+ORDER BY
+    CASE WHEN h.proxy_id IS NULL THEN 1 WHEN h.last_ok = 1 THEN 0 ELSE 2 END,
+    CAST(h.checks_ok AS REAL) / h.checks_total DESC,
+    h.avg_latency_ms,
+    p.id
+"""
+        return fetch_all(cls.CONNECTION, sql)
+
+    @classmethod
+    def check_all(cls, check_url=None):
+        """Fetch a proxy from every rotation endpoint and health-check it now."""
+        proxy_raws = UserProxyService.get_proxies()
+        proxies = fetch_proxies(proxy_raws)
+        proxy_urls = {
+            proxy_raw: proxy_to_url(proxy)
+            for proxy_raw, proxy in proxies.items()
+            if proxy
+        }
+        checks = check_proxies(list(proxy_urls.values()), check_url=check_url)
+        results = {
+            proxy_raw: (
+                checks[proxy_urls[proxy_raw]]
+                if proxy_raw in proxy_urls
+                else ProxyCheckResult(False, error="No proxy from rotation endpoint")
+            )
+            for proxy_raw in proxy_raws
+        }
+        cls.record_checks(results)
+        return results
+
+
+class RobotJobService(BaseService):
+    """RobotService's tasks, persisted so a run can resume after a restart.
+
+    state: pending -> running -> done, or back to pending for a retry, or
+    failed once retries run out. attempts counts the starts.
+    """
+
+    TABLE_NAME = constants.TABLE_USER_ROBOT_JOBS
+    CONNECTION = constants.USER_CONNECTION
+
+    @classmethod
+    def get_columns(cls):
+        return [
+            "id",
+            "user_id",
+            "idempotency_key",
+            "payload",
+            "priority",
+            "state",
+            "attempts",
+            "last_error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+
+    @staticmethod
+    def idempotency_key(task_info: TaskInfo):
+        """user:action:listing; None for actions that post nothing (delays)."""
+        action = task_info.action
+        listing = action.pid
+        if not listing and (action.title or action.description):
+            content = f"{action.title or ''}\n{action.description or ''}"
+            listing = hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+        if not listing:
+            return None
+        return f"{task_info.browser_info.user_id}:{action.action_name}:{listing}"
+
+    @staticmethod
+    def to_payload(task_info: TaskInfo):
+        payload = asdict(task_info)
+        payload.pop("job_id", None)
+        return json.dumps(payload, ensure_ascii=False)
+
+    @staticmethod
+    def from_payload(payload, job_id=None):
+        data = json.loads(payload)
+        return TaskInfo(
+            browser_info=BrowserInfo(**data["browser_info"]),
+            action=ActionInfo(**data["action"]),
+            priority=data.get("priority", constants.ROBOT_PRIORITY_NORMAL),
+            user_group=data.get("user_group"),
+            job_id=job_id,
+        )
+
+    @classmethod
+    def _blocked_keys(cls):
+        sql = f"""
+SELECT idempotency_key FROM {cls.TABLE_NAME}
+WHERE idempotency_key IS NOT NULL
+    AND (
+        state IN ('pending', 'running')
+        OR (state = 'done' AND finished_at >= datetime('now', :window))
+    )
+"""
+        window = f"-{constants.ROBOT_JOB_DEDUP_HOURS} hours"
+        return set(fetch_column(cls.CONNECTION, sql, {"window": window}))
+
+    @classmethod
+    def enqueue(cls, tasks):
+        """Persist tasks and set their job_id; returns the ones accepted.
+
+        A task whose idempotency key is already queued, running or done within
+        ROBOT_JOB_DEDUP_HOURS is dropped, so a listing isn't posted twice.
+        Returns None if the tasks could not be saved.
+        """
+        blocked = cls._blocked_keys()
+        accepted = []
+        payloads = []
+        for task_info in tasks:
+            key = cls.idempotency_key(task_info)
+            if key is not None:
+                if key in blocked:
+                    continue
+                blocked.add(key)
+            accepted.append(task_info)
+            payloads.append(
+                {
+                    "user_id": task_info.browser_info.user_id,
+                    "idempotency_key": key,
+                    "payload": cls.to_payload(task_info),
+                    "priority": task_info.priority,
+                }
+            )
+        job_ids = cls.create_many(payloads)
+        if job_ids is None:
+            logger.error("Error saving robot jobs.")
+            return None
+        for task_info, job_id in zip(accepted, job_ids):
+            task_info.job_id = job_id
+        return accepted
+
+    @classmethod
+    def _set_state(cls, job_id, state, error=None, started=False):
+        finished = state in ("done", "failed")
+        sql = f"""
+UPDATE {cls.TABLE_NAME} SET
+    state = :state,
+    attempts = attempts + :started,
+    last_error = coalesce(:error, last_error),
+    updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now'),
+    finished_at = CASE WHEN :finished THEN strftime('%Y-%m-%d %H:%M:%S', 'now') END
+WHERE id = :id
+"""
+        bindings = {
+            "state": state,
+            "started": 1 if started else 0,
+            "error": error,
+            "finished": 1 if finished else 0,
+            "id": job_id,
+        }
+        if not execute(cls.CONNECTION, sql, bindings):
+            logger.error(f"Error setting robot job {job_id} to {state}.")
+            return False
+        return True
+
+    @classmethod
+    def mark_running(cls, job_id):
+        return cls._set_state(job_id, "running", started=True)
+
+    @classmethod
+    def mark_done(cls, job_id):
+        return cls._set_state(job_id, "done")
+
+    @classmethod
+    def mark_retry(cls, job_id, error):
+        return cls._set_state(job_id, "pending", error=error)
+
+    @classmethod
+    def mark_failed(cls, job_id, error):
+        return cls._set_state(job_id, "failed", error=error)
+
+    @classmethod
+    def count_unfinished(cls):
+        sql = (
+            f"SELECT COUNT(*) FROM {cls.TABLE_NAME} "
+            f"WHERE state IN ('pending', 'running')"
+        )
+        return fetch_value(cls.CONNECTION, sql) or 0
+
+    @classmethod
+    def recover(cls):
+        """Jobs left running by a crash or a closed app: [(TaskInfo, retry)].
+
+        They go back to pending; a job that was running counts that start as
+        a failed attempt.
+        """
+        sql = (
+            f"UPDATE {cls.TABLE_NAME} SET state = 'pending', "
+            f"updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now') "
+            f"WHERE state = 'running'"
+        )
+        if not execute(cls.CONNECTION, sql):
+            logger.error("Error recovering robot jobs.")
+            return []
+        sql = (
+            f"SELECT id, payload, attempts FROM {cls.TABLE_NAME} "
+            f"WHERE state = 'pending' ORDER BY id"
+        )
+        return [
+            (cls.from_payload(row.get("payload"), row.get("id")), row.get("attempts"))
+            for row in fetch_all(cls.CONNECTION, sql)
+        ]
+
+
+class PostHistoryService(BaseService):
+    """Where each account has posted which listing, for skipping groups."""
+
+    TABLE_NAME = constants.TABLE_USER_POST_HISTORY
+    CONNECTION = constants.USER_CONNECTION
+
+    @classmethod
+    def get_columns(cls):
+        return ["id", "user_id", "group_url", "pid", "posted_at"]
+
+    @classmethod
+    def record(cls, user_id, group_url, pid=None):
+        return cls.create({"user_id": user_id, "group_url": group_url, "pid": pid})
+
+    @classmethod
+    def skipped_group_urls(cls, user_id, pid=None):
+        """Groups the account posted to within ROBOT_GROUP_COOLDOWN_HOURS, or
+        where it posted pid within ROBOT_REPOST_AFTER_DAYS."""
+        bindings = {"user_id": user_id}
+        conditions = []
+        if constants.ROBOT_GROUP_COOLDOWN_HOURS:
+            bindings["cooldown"] = f"-{constants.ROBOT_GROUP_COOLDOWN_HOURS} hours"
+            conditions.append("posted_at >= datetime('now', :cooldown)")
+        if pid:
+            bindings["pid"] = pid
+            if constants.ROBOT_REPOST_AFTER_DAYS is None:
+                conditions.append("pid = :pid")
+            else:
+                bindings["repost"] = f"-{constants.ROBOT_REPOST_AFTER_DAYS} days"
+                conditions.append(
+                    "(pid = :pid AND posted_at >= datetime('now', :repost))"
+                )
+        if not conditions:
+            return []
+        sql = f"""
+SELECT DISTINCT group_url FROM {cls.TABLE_NAME}
+WHERE user_id = :user_id AND ({" OR ".join(conditions)})
+"""
+        return fetch_column(cls.CONNECTION, sql, bindings)
+
+
+class GroupCatalogService(BaseService):
+    """The groups each account has joined, so posting skips the sidebar scrape.
+
+    is_buy_sell: the group has a buy_sell_discussion tab (NULL: not visited
+    yet). The catalog is stale after ROBOT_GROUP_CATALOG_MAX_AGE_HOURS or
+    once invalidate() is called, and the next posting task scrapes it again.
+    """
+
+    TABLE_NAME = constants.TABLE_USER_GROUPS
+    CONNECTION = constants.USER_CONNECTION
+
+    @classmethod
+    def get_columns(cls):
+        return [
+            "id",
+            "user_id",
+            "group_url",
+            "is_buy_sell",
+            "last_success_at",
+            "refreshed_at",
+        ]
+
+    @classmethod
+    def is_stale(cls, user_id):
+        sql = f"""
+SELECT
+    COUNT(*) AS total,
+    SUM(refreshed_at IS NULL OR refreshed_at < datetime('now', :max_age)) AS stale
+FROM {cls.TABLE_NAME}
+WHERE user_id = :user_id
+"""
+        bindings = {
+            "user_id": user_id,
+            "max_age": f"-{constants.ROBOT_GROUP_CATALOG_MAX_AGE_HOURS} hours",
+        }
+        row = fetch_one(cls.CONNECTION, sql, bindings)
+        return not row or not row.get("total") or bool(row.get("stale"))
+
+    @classmethod
+    def get_group_urls(cls, user_id):
+        """The account's groups to post to, or None when the catalog needs a refresh.
+
+        Also None when every cached group is buy/sell: the sidebar may have
+        new ones since.
+        """
+        if cls.is_stale(user_id):
+            return None
+        sql = f"""
+SELECT group_url FROM {cls.TABLE_NAME}
+WHERE user_id = :user_id AND coalesce(is_buy_sell, 0) = 0
+ORDER BY id
+"""
+        return fetch_column(cls.CONNECTION, sql, {"user_id": user_id}) or None
+
+    @classmethod
+    def replace_groups(cls, user_id, group_urls):
+        """Store a fresh sidebar scrape; groups the account has left are dropped."""
+        rows = [
+            {"user_id": user_id, "group_url": group_url} for group_url in group_urls
+        ]
+        db = database(cls.CONNECTION)
+        with db_transaction(db) as ok:
+            if not ok:
+                return False
+            if rows:
+                sql = f"""
+INSERT INTO {cls.TABLE_NAME} (user_id, group_url) VALUES (:user_id, :group_url)
+ON CONFLICT (user_id, group_url) DO UPDATE SET
+    refreshed_at = strftime('%Y-%m-%d %H:%M:%S', 'now')
+"""
+                if not execute_many(cls.CONNECTION, sql, rows):
+                    logger.error(f"Error saving the groups of user {user_id}.")
+                    return False
+            sql = (
+                f"DELETE FROM {cls.TABLE_NAME} WHERE user_id = :user_id "
+                f"AND group_url NOT IN (SELECT value FROM json_each(:group_urls))"
+            )
+            bindings = {"user_id": user_id, "group_urls": json.dumps(list(group_urls))}
+            if not execute(cls.CONNECTION, sql, bindings):
+                db.rollback()
+                logger.error(f"Error dropping the old groups of user {user_id}.")
+                return False
+        notify_table_changed(cls.TABLE_NAME)
+        return True
+
+    @classmethod
+    def mark_buy_sell(cls, user_id, group_url, is_buy_sell):
+        sql = (
+            f"UPDATE {cls.TABLE_NAME} SET is_buy_sell = :is_buy_sell "
+            f"WHERE user_id = :user_id AND group_url = :group_url"
+        )
+        bindings = {
+            "user_id": user_id,
+            "group_url": group_url,
+            "is_buy_sell": 1 if is_buy_sell else 0,
+        }
+        return bool(execute(cls.CONNECTION, sql, bindings))
+
+    @classmethod
+    def mark_success(cls, user_id, group_url):
+        sql = (
+            f"UPDATE {cls.TABLE_NAME} "
+            f"SET last_success_at = strftime('%Y-%m-%d %H:%M:%S', 'now') "
+            f"WHERE user_id = :user_id AND group_url = :group_url"
+        )
+        bindings = {"user_id": user_id, "group_url": group_url}
+        return bool(execute(cls.CONNECTION, sql, bindings))
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """Have the accounts' next posting task scrape their groups again."""
+        sql = (
+            f"UPDATE {cls.TABLE_NAME} SET refreshed_at = NULL "
+            f"WHERE user_id = :user_id"
+        )
+        rows = [{"user_id": user_id} for user_id in user_ids]
+        if not rows:
+            return True
+        if not execute_many(cls.CONNECTION, sql, rows):
+            logger.error("Error invalidating group catalogs.")
+            return False
+        notify_table_changed(cls.TABLE_NAME)
+        return True
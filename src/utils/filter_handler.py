@@ -0,0 +1,115 @@
+# src/utils/filter_handler.py
+import re
+
+from PyQt6.QtCore import QMetaType, QObject, QTimer, pyqtSignal
+from PyQt6.QtSql import QSqlDatabase, QSqlField
+
+CONTAINS = "contains"
+PREFIX = "prefix"
+EQUALS = "equals"
+
+DEFAULT_DEBOUNCE_MS = 150
+# values that mean "no filter" (combobox placeholders)
+EMPTY_VALUES = (None, "", "Tất cả")
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def compile_filters(filters, operators):
+    """Build one parameterised WHERE body from {column: value}.
+
+    Returns (where, bindings); where is "" when no filter is active.
+    PREFIX filters can use a COLLATE NOCASE index, CONTAINS cannot.
+    """
+    conditions = []
+    bindings = {}
+    for column, value in filters.items():
+        operator = operators.get(column, CONTAINS)
+        key = f"filter_{column}"
+        if operator == EQUALS:
+            conditions.append(f"{column} = :{key}")
+            bindings[key] = value
+        elif operator == PREFIX:
+            conditions.append(f"{column} LIKE :{key} ESCAPE '\\'")
+            bindings[key] = f"{escape_like(str(value))}%"
+        else:
+            conditions.append(f"{column} LIKE :{key} ESCAPE '\\'")
+            bindings[key] = f"%{escape_like(str(value))}%"
+    return " AND ".join(conditions), bindings
+
+
+def inline_bindings(where, bindings, db: QSqlDatabase):
+    """Substitute bindings as driver-escaped literals.
+
+    QSqlTableModel.setFilter() only accepts a finished SQL string, so the
+    values are quoted by the driver rather than concatenated by hand.
+    """
+    driver = db.driver()
+    literals = {}
+    for key, value in bindings.items():
+        if isinstance(value, int):
+            meta_type = QMetaType.Type.LongLong
+        elif isinstance(value, float):
+            meta_type = QMetaType.Type.Double
+        else:
+            meta_type = QMetaType.Type.QString
+            value = str(value)
+        field = QSqlField(key, QMetaType(meta_type.value))
+        field.setValue(value)
+        literals[key] = driver.formatValue(field)
+    # one pass, so placeholder-like text inside a value is never substituted
+    return re.sub(
+        r":(\w+)",
+        lambda match: literals.get(match.group(1), match.group(0)),
+        where,
+    )
+
+
+class FilterEngine(QObject):
+    """Collects per-column filter values and emits them combined, debounced.
+
+    Every set_value() restarts the timer; filter_ready(where, bindings) fires
+    once typing pauses for debounce_ms, with all active filters ANDed.
+    """
+
+    filter_ready = pyqtSignal(str, dict)
+
+    def __init__(self, operators=None, debounce_ms=DEFAULT_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.operators = operators or {}
+        self.filters = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def set_value(self, column, value):
+        if isinstance(value, str):
+            value = value.strip()
+        if value in EMPTY_VALUES:
+            self.filters.pop(column, None)
+        else:
+            self.filters[column] = value
+        self._timer.start()
+
+    def clear(self):
+        self.filters.clear()
+        self._timer.start()
+
+    def compile(self):
+        return compile_filters(self.filters, self.operators)
+
+    def flush(self):
+        self._timer.stop()
+        where, bindings = self.compile()
+        self.filter_ready.emit(where, bindings)
+
+    def bind_table_model(self, model):
+        """Apply every compiled filter to a QSqlTableModel via setFilter()."""
+        self.filter_ready.connect(
+            lambda where, bindings: model.setFilter(
+                inline_bindings(where, bindings, model.database())
+            )
+        )
@@ -0,0 +1,249 @@
+# src/utils/import_handler.py
+import csv
+import json
+import os
+import sys
+import time
+import uuid
+import logging
+from dataclasses import dataclass, field
+from itertools import islice
+
+from src import constants
+from src.services.re_service import REProductService
+from src.services.settings_cache import PRODUCT_FOREIGN_KEYS, settings_cache
+from src.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+formatter = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+handler = logging.StreamHandler(sys.stderr)
+handler.setFormatter(formatter)
+if not logger.hasHandlers():
+    logger.addHandler(handler)
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_ERROR_SAMPLES = 20
+
+PRODUCT_TEXT_FIELDS = ["street", "function", "description"]
+PRODUCT_NUMBER_FIELDS = ["area", "structure", "price"]
+PID_OPTION_CODES = {"sell": "s", "rent": "r", "assignment": "a"}
+
+USER_FIELD_ALIASES = {"group": "user_group"}
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_skipped: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.rows_read / self.elapsed
+
+    def add_error(self, line_number, message):
+        self.rows_skipped += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append(f"row {line_number}: {message}")
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"Unsupported import file type '{extension}'.")
+
+
+def iter_rows(path, file_format=None):
+    """Yield (line_number, row_dict) one at a time without loading the file.
+
+    A JSONL line that doesn't parse is yielded as the ValueError for it, so
+    the import can report the line and go on.
+    """
+    file_format = file_format or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        elif file_format == "jsonl":
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = ValueError(f"invalid JSON: {e}")
+                yield line_number, row
+        else:
+            raise ValueError(f"Unsupported import format '{file_format}'.")
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value if value != "" else None
+    return value
+
+
+def _split_paths(value):
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [path for path in value if path]
+    return [
+        path.strip() for path in str(value).replace(";", ",").split(",") if path.strip()
+    ]
+
+
+def prepare_product_row(row, cache=settings_cache):
+    payload = {}
+    for fk_field, table_name in PRODUCT_FOREIGN_KEYS.items():
+        raw_id = _clean(row.get(fk_field))
+        raw_name = _clean(row.get(fk_field[: -len("_id")]))
+        record_id = None
+        if raw_id is not None:
+            try:
+                record_id = int(raw_id)
+            except (TypeError, ValueError):
+                raise ValueError(f"{fk_field} must be an integer, got '{raw_id}'")
+            if not cache.exists(table_name, record_id):
+                raise ValueError(f"unknown {fk_field} '{raw_id}'")
+        elif raw_name is not None:
+            record_id = cache.find_id(table_name, raw_name)
+            if record_id is None:
+                raise ValueError(f"unknown {fk_field[: -len('_id')]} '{raw_name}'")
+        else:
+            raise ValueError(f"missing {fk_field}")
+        payload[fk_field] = record_id
+
+    for number_field in PRODUCT_NUMBER_FIELDS:
+        value = _clean(row.get(number_field))
+        try:
+            payload[number_field] = float(value) if value is not None else 0.0
+        except (TypeError, ValueError):
+            raise ValueError(f"{number_field} must be a number, got '{value}'")
+    for text_field in PRODUCT_TEXT_FIELDS:
+        payload[text_field] = _clean(row.get(text_field)) or ""
+
+    pid = _clean(row.get("pid"))
+    if not pid:
+        option = cache.get(constants.TABLE_RE_SETTINGS_OPTIONS, payload["option_id"])
+        option_value = option.get("value") if option else None
+        if option_value not in PID_OPTION_CODES:
+            raise ValueError("missing pid and option has no pid code")
+        pid = f"re.{PID_OPTION_CODES[option_value]}.{uuid.uuid4().hex[:8]}"
+    payload["pid"] = pid.lower()
+    payload["image_paths"] = _split_paths(row.get("image_paths"))
+    return payload
+
+
+def prepare_user_row(row):
+    payload = {}
+    columns = UserService.get_columns()
+    for key, value in row.items():
+        if key is None:
+            continue
+        column = USER_FIELD_ALIASES.get(key.strip(), key.strip())
+        if column in ("id", "created_at", "updated_at") or column not in columns:
+            continue
+        payload[column] = _clean(value)
+    if not payload.get("uid") and not payload.get("username"):
+        raise ValueError("missing uid or username")
+    return payload
+
+
+def _run_import(path, prepare_row, write_chunk, chunk_size, file_format, on_progress):
+    report = ImportReport()
+    started_at = time.perf_counter()
+    for chunk in iter_chunks(iter_rows(path, file_format), chunk_size):
+        report.rows_read += len(chunk)
+        payloads = []
+        for line_number, row in chunk:
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                if not isinstance(row, dict):
+                    raise ValueError(f"expected an object, got {type(row).__name__}")
+                payloads.append((line_number, prepare_row(row)))
+            except (TypeError, ValueError) as e:
+                report.add_error(line_number, str(e))
+        if payloads:
+            write_chunk(payloads, report)
+        report.chunks += 1
+        report.elapsed = time.perf_counter() - started_at
+        if on_progress:
+            on_progress(report)
+    report.elapsed = time.perf_counter() - started_at
+    return report
+
+
+def import_products(
+    path, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None, on_progress=None
+):
+    def write_chunk(payloads, report):
+        existing_pids = REProductService.get_existing_pids(
+            payload["pid"] for _, payload in payloads
+        )
+        new_payloads = []
+        for line_number, payload in payloads:
+            if payload["pid"] in existing_pids:
+                report.add_error(line_number, f"pid '{payload['pid']}' already exists")
+                continue
+            existing_pids.add(payload["pid"])
+            new_payloads.append((line_number, payload))
+        if not new_payloads:
+            return
+        record_ids = REProductService.create_many(
+            payload for _, payload in new_payloads
+        )
+        if record_ids is None:
+            for line_number, _ in new_payloads:
+                report.add_error(line_number, "chunk insert failed")
+            return
+        report.rows_inserted += len(record_ids)
+
+    return _run_import(
+        path,
+        prepare_product_row,
+        write_chunk,
+        chunk_size,
+        file_format,
+        on_progress,
+    )
+
+
+def import_users(
+    path, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None, on_progress=None
+):
+    def write_chunk(payloads, report):
+        record_ids = UserService.create_many(payload for _, payload in payloads)
+        if record_ids is None:
+            for line_number, _ in payloads:
+                report.add_error(line_number, "chunk insert failed")
+            return
+        report.rows_inserted += len(record_ids)
+
+    return _run_import(
+        path, prepare_user_row, write_chunk, chunk_size, file_format, on_progress
+    )
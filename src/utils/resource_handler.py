@@ -0,0 +1,32 @@
+import os
+
+from src import constants
+
+
+def available_memory_mb():
+    """Memory free for new processes in MiB, or None when it can't be read."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        # total physical memory on macOS and other POSIX systems
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024**2)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def browser_budget(
+    cpu_per_browser=constants.ROBOT_CPU_PER_BROWSER,
+    ram_per_browser_mb=constants.ROBOT_RAM_PER_BROWSER_MB,
+    ram_reserve_mb=constants.ROBOT_RAM_RESERVE_MB,
+):
+    """How many browsers this machine can run at once (at least 1)."""
+    budget = max(int((os.cpu_count() or 1) / cpu_per_browser), 1)
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        budget = min(budget, (memory_mb - ram_reserve_mb) // ram_per_browser_mb)
+    return max(budget, 1)
@@ -1,8 +1,16 @@
 # src/views/re/page_re.py
 
-from PyQt6.QtGui import QAction, QPixmap
-from PyQt6.QtCore import Qt, QPoint, QSortFilterProxyModel, pyqtSignal
-from PyQt6.QtWidgets import QMessageBox, QWidget, QMenu, QDialog
+from PyQt6.QtGui import QAction, QFont, QPixmap
+from PyQt6.QtCore import Qt, QPoint, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QMessageBox,
+    QWidget,
+    QMenu,
+    QDialog,
+    QLabel,
+    QLineEdit,
+    QVBoxLayout,
+)
 
 from src import constants
 from src.utils.re_product_handler import (
@@ -29,14 +37,13 @@ class PageRE(QWidget, Ui_PageRE):
         self.setWindowTitle("Real Estate Product")
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self.source_model = REProductModel()
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.source_model)
         self.product_controller = re_controller.REProductController(self.source_model)
         self.img_paths = None
 
         self.setup_ui()
         self.setup_events()
         self.setup_filters()
+        self.setup_search()
 
     def setup_ui(self):
         self._set_comboboxes()
@@ -53,98 +60,68 @@ class PageRE(QWidget, Ui_PageRE):
         self.action_random_btn.clicked.connect(self.handle_set_random_template)
         self.image_label.mousePressEvent = self.image_label_click_event
 
-    def setup_filters(self):
-        self.pid_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.pid_input.text(), 1)
-        )
-        self.street_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.street_input.text(), 5)
-        )
-        self.price_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.price_input.text(), 8)
-        )
-        self.function_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.function_input.text(), 13)
-        )
-        self.structure_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.structure_input.text(), 12)
-        )
-        self.area_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.area_input.text(), 7)
+    def setup_search(self):
+        self.search_container_w = QWidget(parent=self.search_container)
+        search_layout = QVBoxLayout(self.search_container_w)
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        search_layout.setSpacing(0)
+        font = QFont()
+        font.setFamily("Courier New")
+        font.setPointSize(10)
+        self.search_label = QLabel("Tìm kiếm", parent=self.search_container_w)
+        self.search_label.setFont(font)
+        self.search_label.setStyleSheet("margin: 0;")
+        self.search_input = QLineEdit(parent=self.search_container_w)
+        self.search_input.setStyleSheet("margin: 0;\n" "padding-left: 4px;")
+        self.search_input.setPlaceholderText("PID, tên đường, chức năng, mô tả...")
+        self.search_input.setClearButtonEnabled(True)
+        search_layout.addWidget(self.search_label)
+        search_layout.addWidget(self.search_input)
+        self.gridLayout.addWidget(
+            self.search_container_w, 2, 0, 1, self.gridLayout.columnCount()
         )
 
-        self.wards_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.REWardsController.get_label_vi_staticmethod(
-                        self.wards_combobox.currentData()
-                    )
-                    if self.wards_combobox.currentData()
-                    else None
-                ),
-                4,
-            )
-        )
-        self.categories_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.RECategoryController.get_label_vi_staticmethod(
-                        self.categories_combobox.currentData()
-                    )
-                    if self.categories_combobox.currentData()
-                    else None
-                ),
-                6,
-            )
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(
+            lambda: self.source_model.set_search(self.search_input.text())
         )
-        self.options_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.REOptionController.get_label_vi_staticmethod(
-                        self.options_combobox.currentData()
-                    )
-                    if self.options_combobox.currentData()
-                    else None
-                ),
-                3,
-            )
-        )
-        self.building_line_s_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.REBuildingLineController.get_label_vi_staticmethod(
-                        self.building_line_s_combobox
-                    )
-                    if self.building_line_s_combobox.currentData()
-                    else None
-                ),
-                14,
-            )
-        )
-        self.furniture_s_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.REFurnitureController.get_label_vi_staticmethod(
-                        self.furniture_s_combobox
-                    )
-                    if self.furniture_s_combobox.currentData()
-                    else None
-                ),
-                15,
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+    def setup_filters(self):
+        text_filters = {
+            self.pid_input: "pid",
+            self.street_input: "street",
+            self.price_input: "price",
+            self.function_input: "function",
+            self.structure_input: "structure",
+            self.area_input: "area",
+        }
+        # typed filters wait for a pause like the search box; comboboxes apply at once
+        self.pending_filters = {}
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(self.apply_pending_filters)
+        for widget, column in text_filters.items():
+            widget.textChanged.connect(
+                lambda text, column=column: self.queue_column_filter(text, column)
             )
-        )
-        self.legal_s_combobox.currentIndexChanged.connect(
-            lambda: self.apply_column_filter(
-                (
-                    re_controller.RELegalController.get_label_vi_staticmethod(
-                        self.legal_s_combobox
-                    )
-                    if self.legal_s_combobox.currentData()
-                    else None
-                ),
-                9,
+        combobox_filters = {
+            self.wards_combobox: "ward_id",
+            self.categories_combobox: "category_id",
+            self.options_combobox: "option_id",
+            self.building_line_s_combobox: "building_line_id",
+            self.furniture_s_combobox: "furniture_id",
+            self.legal_s_combobox: "legal_id",
+        }
+        for widget, column in combobox_filters.items():
+            widget.currentIndexChanged.connect(
+                lambda _, widget=widget, column=column: self.apply_column_filter(
+                    widget.currentData(), column
+                )
             )
-        )
 
     def _set_comboboxes(self):
         filter_comboboxes = {
@@ -171,7 +148,7 @@ class PageRE(QWidget, Ui_PageRE):
                 combobox_widget.setCurrentIndex(combobox_widget.count() - 1)
 
     def set_table(self):
-        self.products_table.setModel(self.proxy_model)
+        self.products_table.setModel(self.source_model)
         self.products_table.setSortingEnabled(True)
         self.products_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.products_table.customContextMenuRequested.connect(self.show_context_menu)
@@ -179,12 +156,20 @@ class PageRE(QWidget, Ui_PageRE):
             self.products_table.SelectionBehavior.SelectRows
         )
 
-    def apply_column_filter(self, filter_text, column_index):
-        if filter_text == "Tất cả" or not filter_text:
-            self.proxy_model.setFilterFixedString("")
+    def queue_column_filter(self, filter_value, column_name):
+        self.pending_filters[column_name] = filter_value
+        self.filter_timer.start()
+
+    def apply_pending_filters(self):
+        pending, self.pending_filters = self.pending_filters, {}
+        for column_name, filter_value in pending.items():
+            self.apply_column_filter(filter_value, column_name)
+
+    def apply_column_filter(self, filter_value, column_name):
+        if filter_value == "Tất cả" or filter_value in (None, "", -1):
+            self.source_model.set_filter(column_name, None)
         else:
-            self.proxy_model.setFilterFixedString(filter_text)
-            self.proxy_model.setFilterKeyColumn(column_index)
+            self.source_model.set_filter(column_name, filter_value)
 
     def show_context_menu(self, pos: QPoint):
         global_pos = self.products_table.mapToGlobal(pos)
@@ -202,18 +187,9 @@ class PageRE(QWidget, Ui_PageRE):
 
     def get_selected_ids(self):
         selected_rows = self.products_table.selectionModel().selectedRows()
-        selected_ids = []
-        id_column_index = self.source_model.fieldIndex("id")
-
-        for proxy_index in selected_rows:
-            source_index = self.proxy_model.mapToSource(proxy_index)
-            if source_index.isValid():
-                id_data = self.source_model.data(
-                    source_index.siblingAtColumn(id_column_index),
-                    Qt.ItemDataRole.DisplayRole,
-                )
-                selected_ids.append(id_data)
-        return selected_ids
+        return self.source_model.get_record_ids(
+            [index.row() for index in selected_rows]
+        )
 
     def handle_create(self):
         new_product = constants.RE_PRODUCT_INIT_VALUE
@@ -1,7 +1,19 @@
-from PyQt6.QtWidgets import QMessageBox, QWidget, QDialog
-from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt, QSortFilterProxyModel
-from src.models.user_model import UserModel
+from PyQt6.QtWidgets import (
+    QMessageBox,
+    QWidget,
+    QDialog,
+    QGroupBox,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QHeaderView,
+)
+from PyQt6.QtGui import QAction, QFont
+from PyQt6.QtCore import Qt, QTimer
+from src.models.user_model import UserModel, USER_FILTER_OPERATORS
+from src.utils.filter_handler import FilterEngine
 from src.models.re_model import REProductModel
 from src.controllers.user_controller import UserController
 from src.controllers.robot_controller import RobotController
@@ -21,15 +33,15 @@ class PageRobot(QWidget, Ui_PageRobot):
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
         self.source_model = UserModel()
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.source_model)
+        self.filter_engine = FilterEngine(USER_FILTER_OPERATORS, parent=self)
+        self.filter_engine.bind_table_model(self.source_model)
         self.user_controller = UserController(self.source_model)
 
         self.headers = [
-            self.proxy_model.headerData(
+            self.source_model.headerData(
                 col, Qt.Orientation.Horizontal, Qt.ItemDataRole.DisplayRole
             )
-            for col in range(self.proxy_model.columnCount())
+            for col in range(self.source_model.columnCount())
         ]
 
         self.re_controller = REProductController(REProductModel())
@@ -40,11 +52,14 @@ class PageRobot(QWidget, Ui_PageRobot):
 
         self.setup_ui()
         self.setup_events()
+        # ask once the page is shown, not while it's being built
+        QTimer.singleShot(0, self.check_unfinished_jobs)
 
     def setup_events(self):
         self.tabWidget.tabBarDoubleClicked.connect(self.on_add_new_action)
         self.run_actions_btn.clicked.connect(self.on_run_bot)
         self.save_actions_btn.clicked.connect(self.on_save_actions)
+        self.refresh_groups_btn.clicked.connect(self.on_refresh_groups)
 
         self.username_input.textChanged.connect(
             lambda: self.apply_filter(self.username_input.text(), "username")
@@ -61,9 +76,51 @@ class PageRobot(QWidget, Ui_PageRobot):
 
     def setup_ui(self):
         self.set_table_ui()
+        self.setup_dashboard()
+
+    def setup_dashboard(self):
+        self.dashboard_box = QGroupBox("Run status", parent=self.actions_container)
+        dashboard_layout = QVBoxLayout(self.dashboard_box)
+        font = QFont()
+        font.setFamily("Courier New")
+        font.setPointSize(10)
+        self.run_status_label = QLabel("Not running.", parent=self.dashboard_box)
+        self.run_status_label.setFont(font)
+        self.run_status_label.setWordWrap(True)
+        self.phase_table = QTableWidget(0, 4, parent=self.dashboard_box)
+        self.phase_table.setHorizontalHeaderLabels(
+            ["phase", "count", "avg s", "total s"]
+        )
+        self.phase_table.verticalHeader().setVisible(False)
+        self.phase_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+        self.phase_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        dashboard_layout.addWidget(self.run_status_label)
+        dashboard_layout.addWidget(self.phase_table)
+        self.refresh_groups_btn = QPushButton(
+            "Refresh groups of selected users", parent=self.dashboard_box
+        )
+        dashboard_layout.addWidget(self.refresh_groups_btn)
+        self.actions_container_layout.addWidget(self.dashboard_box)
+
+    def on_run_status(self, status: dict):
+        self.run_status_label.setText(
+            f"queued {status['queued']} - active {status['active']} - "
+            f"succeeded {status['succeeded']}/{status['total']} - "
+            f"failed {status['failed']} - retries {status['retries']} - "
+            f"{status['tasks_per_hour']:.0f} tasks/h"
+        )
+        rows = self.robot_controller.robot_service.metrics.phase_rows()
+        self.phase_table.setRowCount(len(rows))
+        for row, (phase, count, average, total) in enumerate(rows):
+            for column, value in enumerate(
+                (phase, str(count), f"{average:.2f}", f"{total:.1f}")
+            ):
+                self.phase_table.setItem(row, column, QTableWidgetItem(value))
 
     def set_table_ui(self):
-        self.users_table.setModel(self.proxy_model)
+        self.users_table.setModel(self.source_model)
         self.users_table.setSortingEnabled(True)
         self.users_table.setSelectionBehavior(
             self.users_table.SelectionBehavior.SelectRows
@@ -86,12 +143,7 @@ class PageRobot(QWidget, Ui_PageRobot):
                 self.users_table.hideColumn(column_index)
 
     def apply_filter(self, filter_text: str, column_name):
-        if filter_text == "Tất cả" or not filter_text.strip():
-            self.proxy_model.setFilterFixedString("")
-        else:
-            self.proxy_model.setFilterFixedString(filter_text)
-            if column_name in self.headers:
-                self.proxy_model.setFilterKeyColumn(self.headers.index(column_name))
+        self.filter_engine.set_value(column_name, filter_text)
 
     def on_add_new_action(self, index):
         clicked_tab = self.tabWidget.tabText(index)
@@ -118,6 +170,17 @@ class PageRobot(QWidget, Ui_PageRobot):
             self.task_data[user_task.get("user_id")] = user_task
         QMessageBox.information(self, "Saved", "")
 
+    def on_refresh_groups(self):
+        user_ids = self.get_selected_ids()
+        if not user_ids:
+            return
+        self.robot_controller.refresh_groups(user_ids)
+        QMessageBox.information(
+            self,
+            "Groups",
+            f"The next run scrapes the groups of {len(user_ids)} users again.",
+        )
+
     def on_run_bot(self):
         self.dialog_run = DialogRobotRun(self)
         self.dialog_run.setWindowTitle("RE Settings")
@@ -130,6 +193,29 @@ class PageRobot(QWidget, Ui_PageRobot):
                 is_mobile=False,
                 headless=False,
                 thread_num=self.dialog_run.thread_num,
+                on_status_updated=self.on_run_status,
+            )
+
+    def check_unfinished_jobs(self):
+        unfinished = self.robot_controller.count_unfinished_jobs()
+        if not unfinished:
+            return
+        answer = QMessageBox.question(
+            self,
+            "Unfinished jobs",
+            f"The last run left {unfinished} jobs unfinished. Resume them?",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        self.dialog_run = DialogRobotRun(self)
+        self.dialog_run.setWindowTitle("RE Settings")
+        self.dialog_run.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.dialog_run.setFixedSize(self.dialog_run.size())
+
+        if self.dialog_run.exec() == QDialog.DialogCode.Accepted:
+            self.robot_controller.resume_tasks(
+                thread_num=self.dialog_run.thread_num,
+                on_status_updated=self.on_run_status,
             )
 
     def get_selected_ids(self):
@@ -137,8 +223,7 @@ class PageRobot(QWidget, Ui_PageRobot):
         selected_ids = []
         id_column_index = self.source_model.fieldIndex("id")
 
-        for proxy_index in selected_rows:
-            source_index = self.proxy_model.mapToSource(proxy_index)
+        for source_index in selected_rows:
             if source_index.isValid():
                 id_data = self.source_model.data(
                     source_index.siblingAtColumn(id_column_index),
@@ -158,8 +243,7 @@ class PageRobot(QWidget, Ui_PageRobot):
             for col in range(column_count)
         ]
 
-        for proxy_index in selected_rows:
-            source_index = self.proxy_model.mapToSource(proxy_index)
+        for source_index in selected_rows:
             if source_index.isValid():
                 row_data = {}
                 for col in range(column_count):
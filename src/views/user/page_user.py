@@ -1,10 +1,11 @@
 # src/views/user/page_user.py
 
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt, QPoint, QSortFilterProxyModel
+from PyQt6.QtCore import Qt, QPoint
 from PyQt6.QtWidgets import QMessageBox, QWidget, QMenu, QDialog
 
-from src.models.user_model import UserModel
+from src.models.user_model import UserModel, USER_FILTER_OPERATORS
+from src.utils.filter_handler import FilterEngine
 from src.controllers.user_controller import UserController
 from src.controllers.robot_controller import RobotController
 from src.views.user.dialog_user_create import DialogUserCreate
@@ -23,8 +24,6 @@ class PageUser(QWidget, Ui_User):
         # self.setFixedSize(self.size())
 
         self.source_model = UserModel()
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.source_model)
         self.user_controller = UserController(self.source_model)
         self.user_automation_controller = RobotController()
 
@@ -41,46 +40,30 @@ class PageUser(QWidget, Ui_User):
         self.set_filter()
 
     def set_filter(self):
-        self.uid_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.uid_input.text(), 2)
-        )
-        self.username_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.username_input.text(), 3)
-        )
-        self.password_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.password_input.text(), 4)
-        )
-        self.two_fa_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.two_fa_input.text(), 5)
-        )
-        self.email_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.email_input.text(), 6)
-        )
-        self.email_password_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.email_password_input.text(), 7)
-        )
-        self.phone_number_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.phone_number_input.text(), 8)
-        )
-        self.note_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.note_input.text(), 9)
-        )
-        self.type_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.type_input.text(), 10)
-        )
-        self.group_input.textChanged.connect(
-            lambda: self.apply_column_filter(self.group_input.text(), 11)
-        )
+        self.filter_engine = FilterEngine(USER_FILTER_OPERATORS, parent=self)
+        self.filter_engine.bind_table_model(self.source_model)
+        filter_inputs = {
+            self.uid_input: "uid",
+            self.username_input: "username",
+            self.password_input: "password",
+            self.two_fa_input: "two_fa",
+            self.email_input: "email",
+            self.email_password_input: "email_password",
+            self.phone_number_input: "phone_number",
+            self.note_input: "note",
+            self.type_input: "type",
+            self.group_input: "user_group",
+        }
+        for widget, column in filter_inputs.items():
+            widget.textChanged.connect(
+                lambda text, column=column: self.apply_column_filter(text, column)
+            )
 
-    def apply_column_filter(self, filter_text, column_index):
-        if filter_text == "Tất cả" or not filter_text:
-            self.proxy_model.setFilterFixedString("")
-        else:
-            self.proxy_model.setFilterFixedString(filter_text)
-            self.proxy_model.setFilterKeyColumn(column_index)
+    def apply_column_filter(self, filter_text, column_name):
+        self.filter_engine.set_value(column_name, filter_text)
 
     def set_table(self):
-        self.users_table.setModel(self.proxy_model)
+        self.users_table.setModel(self.source_model)
         self.users_table.setSortingEnabled(True)
         self.users_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.users_table.customContextMenuRequested.connect(self.show_context_menu)
@@ -169,8 +152,7 @@ class PageUser(QWidget, Ui_User):
         selected_ids = []
         id_column_index = self.source_model.fieldIndex("id")
 
-        for proxy_index in selected_rows:
-            source_index = self.proxy_model.mapToSource(proxy_index)
+        for source_index in selected_rows:
             if source_index.isValid():
                 id_data = self.source_model.data(
                     source_index.siblingAtColumn(id_column_index),
@@ -190,8 +172,7 @@ class PageUser(QWidget, Ui_User):
             for col in range(column_count)
         ]
 
-        for proxy_index in selected_rows:
-            source_index = self.proxy_model.mapToSource(proxy_index)
+        for source_index in selected_rows:
             if source_index.isValid():
                 row_data = {}
                 for col in range(column_count):